@@ -8,194 +8,128 @@ import re
 import time
 import psutil
 import threading
+from functools import partial
+from contextlib import closing
 from pathlib import Path
 from datetime import datetime
 import requests
 if platform.system() == "Windows":
     import winreg
 import shutil
+from intent_matcher import IntentMatcher
+from command_parser import parse_command, FOLDER_MARKERS
+from command_planner import might_be_compound, plan_steps, run_steps
+from app_catalog import AppCatalog
+from launcher_cache import LauncherCache
+from app_indexer import AppIndexer
+from file_index import FileIndex
+import cache_cleaner
+import copy_engine
+from trash import Trash
+from dir_listing import DirectoryCache
+import duplicate_finder
+import storage_scan
+from file_search import AGE_UNITS, FileQuery, find_files, format_match, parse_file_query
+import tree_walker
+from task_context import TaskCancelled, current_task, running
+from session import Session
+from history_log import HistoryLog
+
+# Intent keywords in routing priority order (ties in hit count go to the earlier intent)
+INTENT_KEYWORDS = {
+    'app': ['open', 'launch', 'start', 'run'],
+    'system_control': ['shutdown', 'restart', 'sleep', 'lock'],
+    'file': ['file', 'files', 'folder', 'folders', 'directory', 'directories',
+             'create', 'delete', 'copy', 'move', 'locate', 'pdfs', 'modified', 'bigger', 'larger', 'smaller',
+             'duplicate', 'duplicates', 'space', 'cache', 'caches', 'temp', 'junk'],
+    'system_info': ['battery', 'memory', 'disk', 'system', 'process', 'processes', 'network'],
+    'volume': ['volume', 'sound', 'mute', 'unmute'],
+    'web': ['search', 'google', 'website', 'browse'],
+    'time_date': ['time', 'date', 'clock'],
+    'weather': ['weather'],
+    'screenshot': ['screenshot', 'screen shot'],
+}
+
+# The file keywords that name files or file operations (the rest only describe a search)
+FILE_WORDS = ('file', 'files', 'folder', 'folders', 'directory', 'directories', 'create', 'delete', 'copy', 'move',
+              'locate', 'pdfs', 'modified', 'duplicate', 'duplicates')
+
+# Conversational phrases matched by _handle_conversation
+GREETINGS = ('hello', 'hi', 'hey', 'good morning', 'good afternoon', 'good evening')
+THANKS = ('thank you', 'thanks', 'appreciate')
+GOODBYES = ('bye', 'goodbye', 'see you', 'exit', 'quit')
+
+# Shutdown and restart only run after a "yes" (Session.await_confirmation)
+POWER_OFFER = "👉 Say **yes** to confirm."
+
+# Minimum classifier confidence before its intent is trusted over keyword routing
+CLASSIFIER_CONFIDENCE = 0.5
+
+# Folders in the home directory that can be named without a path ("what is using space in downloads")
+HOME_FOLDERS = ('desktop', 'documents', 'downloads', 'music', 'pictures', 'videos')
+
+# Cache cleaning: words that ask for a delete rather than a dry run, and "older than 3 days" style age filters
+CLEAN_WORDS = ('clear', 'clean', 'delete', 'empty', 'remove', 'purge', 'wipe')
+DRY_RUN_WORDS = ('how', 'much', 'scan', 'check', 'estimate', 'preview', 'measure')
+CLEAN_OFFER = "👉 Say **yes** to delete these files."
+
+# Replies that confirm (or turn down) an action parked with Session.await_confirmation
+CONFIRM_WORDS = ('yes', 'yeah', 'yep', 'confirm', 'confirmed', 'sure', 'ok', 'okay', 'proceed')
+DECLINE_WORDS = ('no', 'nope', 'cancel', 'stop', 'dont', "don't", 'not')
+CACHE_AGE_RE = re.compile(r'\b(?:older than|more than|not used (?:in|for))\s+(\d+)\s+(day|week|month|year)s?\b')
+
+# Entries per list_files page, and how each sort order is named in the reply
+LIST_PAGE_SIZE = 50
+SORT_LABELS = {'name': 'name', 'size': 'size', 'mtime': 'date modified'}
+
+# Fuzzy app matches at or above this similarity are launched; weaker ones are only suggested
+FUZZY_LAUNCH_SCORE = 0.75
+
+# Set TEJAS_BACKGROUND=0 to skip the background app/file indexing and trash purging (tests, one-off scripts)
+BACKGROUND = os.getenv('TEJAS_BACKGROUND', '1') != '0'
 
 class AICore:
-    def __init__(self):
+    def __init__(self, intent_mode='keyword', history_log=None, background=None):
         self.system = platform.system()
-        self.conversations_history = []
-        self.app_database = self._build_app_database()
+        # Shared, read-mostly resources; per-client state lives in Session objects
+        self.history_log = history_log or HistoryLog()
+        self.default_session = Session('default', self.history_log)
+        self.app_catalog = AppCatalog(self.system)
+        self.app_database = self.app_catalog.apps
+        self.launchers = LauncherCache()
+        self.app_index = AppIndexer(self.system)
+        self.file_index = FileIndex()
+        self.dir_cache = DirectoryCache()
+        self.trash = Trash()
+        if BACKGROUND if background is None else background:
+            self.app_index.start()
+            self.file_index.start()
+            self.trash.start()
         self.common_tasks = self._load_common_tasks()
-        
-    def _build_app_database(self):
-        """Build a database of common applications and their download URLs"""
-        return {
-            # Development Tools
-            'vscode': {
-                'names': ['visual studio code', 'vs code', 'vscode', 'code'],
-                'executable': 'Code.exe' if self.system == 'Windows' else 'code',
-                'download_url': 'https://code.visualstudio.com/download',
-                'description': 'Code Editor'
-            },
-            'pycharm': {
-                'names': ['pycharm', 'py charm'],
-                'executable': 'pycharm64.exe' if self.system == 'Windows' else 'pycharm',
-                'download_url': 'https://www.jetbrains.com/pycharm/download/',
-                'description': 'Python IDE'
-            },
-            'sublime': {
-                'names': ['sublime text', 'sublime'],
-                'executable': 'sublime_text.exe' if self.system == 'Windows' else 'subl',
-                'download_url': 'https://www.sublimetext.com/download',
-                'description': 'Text Editor'
-            },
-            'atom': {
-                'names': ['atom', 'atom editor'],
-                'executable': 'atom.exe' if self.system == 'Windows' else 'atom',
-                'download_url': 'https://github.com/atom/atom/releases',
-                'description': 'Text Editor'
-            },
-            'git': {
-                'names': ['git', 'git bash'],
-                'executable': 'git.exe' if self.system == 'Windows' else 'git',
-                'download_url': 'https://git-scm.com/downloads',
-                'description': 'Version Control'
-            },
-            
-            # Browsers
-            'chrome': {
-                'names': ['chrome', 'google chrome'],
-                'executable': 'chrome.exe' if self.system == 'Windows' else 'google-chrome',
-                'download_url': 'https://www.google.com/chrome/',
-                'description': 'Web Browser'
-            },
-            'firefox': {
-                'names': ['firefox', 'mozilla firefox'],
-                'executable': 'firefox.exe' if self.system == 'Windows' else 'firefox',
-                'download_url': 'https://www.mozilla.org/firefox/download/',
-                'description': 'Web Browser'
-            },
-            'edge': {
-                'names': ['edge', 'microsoft edge'],
-                'executable': 'msedge.exe' if self.system == 'Windows' else 'microsoft-edge',
-                'download_url': 'https://www.microsoft.com/edge/download',
-                'description': 'Web Browser'
-            },
-            
-            # Media & Design
-            'vlc': {
-                'names': ['vlc', 'vlc player', 'vlc media player'],
-                'executable': 'vlc.exe' if self.system == 'Windows' else 'vlc',
-                'download_url': 'https://www.videolan.org/vlc/download-windows.html',
-                'description': 'Media Player'
-            },
-            'photoshop': {
-                'names': ['photoshop', 'adobe photoshop', 'ps'],
-                'executable': 'Photoshop.exe' if self.system == 'Windows' else 'photoshop',
-                'download_url': 'https://www.adobe.com/products/photoshop.html',
-                'description': 'Photo Editor'
-            },
-            'gimp': {
-                'names': ['gimp'],
-                'executable': 'gimp.exe' if self.system == 'Windows' else 'gimp',
-                'download_url': 'https://www.gimp.org/downloads/',
-                'description': 'Photo Editor'
-            },
-            'obs': {
-                'names': ['obs', 'obs studio'],
-                'executable': 'obs64.exe' if self.system == 'Windows' else 'obs',
-                'download_url': 'https://obsproject.com/download',
-                'description': 'Screen Recorder'
-            },
-            
-            # Communication
-            'discord': {
-                'names': ['discord'],
-                'executable': 'Discord.exe' if self.system == 'Windows' else 'discord',
-                'download_url': 'https://discord.com/download',
-                'description': 'Communication'
-            },
-            'slack': {
-                'names': ['slack'],
-                'executable': 'slack.exe' if self.system == 'Windows' else 'slack',
-                'download_url': 'https://slack.com/downloads',
-                'description': 'Team Communication'
-            },
-            'zoom': {
-                'names': ['zoom'],
-                'executable': 'Zoom.exe' if self.system == 'Windows' else 'zoom',
-                'download_url': 'https://zoom.us/download',
-                'description': 'Video Conferencing'
-            },
-            'whatsapp': {
-                'names': ['whatsapp', 'whatsapp desktop'],
-                'executable': 'WhatsApp.exe' if self.system == 'Windows' else 'whatsapp-desktop',
-                'download_url': 'https://www.whatsapp.com/download',
-                'description': 'Messaging'
-            },
-            
-            # Office & Productivity
-            'word': {
-                'names': ['word', 'microsoft word', 'ms word'],
-                'executable': 'WINWORD.EXE' if self.system == 'Windows' else 'libreoffice',
-                'download_url': 'https://www.microsoft.com/microsoft-365',
-                'description': 'Word Processor'
-            },
-            'excel': {
-                'names': ['excel', 'microsoft excel', 'ms excel'],
-                'executable': 'EXCEL.EXE' if self.system == 'Windows' else 'libreoffice',
-                'download_url': 'https://www.microsoft.com/microsoft-365',
-                'description': 'Spreadsheet'
-            },
-            'powerpoint': {
-                'names': ['powerpoint', 'microsoft powerpoint', 'ppt'],
-                'executable': 'POWERPNT.EXE' if self.system == 'Windows' else 'libreoffice',
-                'download_url': 'https://www.microsoft.com/microsoft-365',
-                'description': 'Presentation'
-            },
-            'notion': {
-                'names': ['notion'],
-                'executable': 'Notion.exe' if self.system == 'Windows' else 'notion-app',
-                'download_url': 'https://www.notion.so/desktop',
-                'description': 'Note Taking'
-            },
-            
-            # System Tools
-            'cmd': {
-                'names': ['command prompt', 'cmd', 'terminal'],
-                'executable': 'cmd.exe' if self.system == 'Windows' else 'gnome-terminal',
-                'download_url': None,  # Built-in
-                'description': 'Command Line'
-            },
-            'powershell': {
-                'names': ['powershell', 'windows powershell'],
-                'executable': 'powershell.exe' if self.system == 'Windows' else None,
-                'download_url': 'https://github.com/PowerShell/PowerShell/releases',
-                'description': 'Command Line'
-            },
-            'notepad': {
-                'names': ['notepad'],
-                'executable': 'notepad.exe' if self.system == 'Windows' else 'gedit',
-                'download_url': None,  # Built-in
-                'description': 'Text Editor'
-            },
-            'calculator': {
-                'names': ['calculator', 'calc'],
-                'executable': 'calc.exe' if self.system == 'Windows' else 'gnome-calculator',
-                'download_url': None,  # Built-in
-                'description': 'Calculator'
-            },
-            
-            # Gaming
-            'steam': {
-                'names': ['steam'],
-                'executable': 'steam.exe' if self.system == 'Windows' else 'steam',
-                'download_url': 'https://store.steampowered.com/about/',
-                'description': 'Gaming Platform'
-            },
-            'epicgames': {
-                'names': ['epic games', 'epic games launcher'],
-                'executable': 'EpicGamesLauncher.exe' if self.system == 'Windows' else 'epic-games-launcher',
-                'download_url': 'https://www.epicgames.com/store/download',
-                'description': 'Gaming Platform'
-            }
+        self.intent_matcher = IntentMatcher(INTENT_KEYWORDS)
+        self.intent_handlers = {
+            'app': self._handle_app_request,
+            'system_control': self._handle_system_control,
+            'file': self._handle_file_operations,
+            'system_info': self._handle_system_info,
+            'volume': self._handle_volume_control,
+            'web': self._handle_web_tasks,
+            'time_date': self._handle_time_date,
+            'weather': self._handle_weather,
+            'screenshot': lambda command: self.take_screenshot(),
+            'conversation': self._handle_conversation,
         }
-
+        self.intent_classifier = self._load_intent_classifier() if intent_mode == 'classifier' else None
+    
+    def _load_intent_classifier(self):
+        """Load the optional learned intent model, or None to stay on keyword routing"""
+        try:
+            from intent_classifier import IntentClassifier
+            return IntentClassifier.load()
+        except Exception as e:
+            print(f"⚠️ Intent classifier unavailable, using keyword routing: {e}")
+            return None
+        
     def _bytes_to_readable(self, bytes_value):
         """Convert bytes to human readable format"""
         for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
@@ -215,61 +149,43 @@ class AICore:
         except Exception as e:
             return f"❌ Unable to get weather information: {str(e)}"
 
-    def _extract_folder_name(self, user_input):
+    def _extract_folder_name(self, command):
         """Extract folder name from user input"""
-        words = user_input.split()
-        # Find words after 'folder' or 'directory'
-        try:
-            if 'folder' in words:
-                idx = words.index('folder')
-                if idx + 1 < len(words):
-                    return ' '.join(words[idx + 1:])
-            elif 'directory' in words:
-                idx = words.index('directory')
-                if idx + 1 < len(words):
-                    return ' '.join(words[idx + 1:])
-        except:
-            pass
-        return "new_folder"
+        return command.words_after(FOLDER_MARKERS) or "new_folder"
 
-    def _extract_search_query(self, user_input):
+    def _extract_search_query(self, command):
         """Extract search query from user input"""
-        words_to_remove = ['google', 'search', 'for', 'please', 'can', 'you']
-        words = user_input.split()
-        filtered_words = [word for word in words if word not in words_to_remove]
-        return ' '.join(filtered_words) if filtered_words else "search query"
+        return command.query or "search query"
 
-    def _extract_url(self, user_input):
+    def _extract_url(self, command):
         """Extract URL from user input"""
-        words = user_input.split()
-        # Look for words that might be URLs
-        for word in words:
-            if '.' in word and not word.startswith('.'):
-                return word
-        # If no URL found, return a default
-        return "google.com"
+        # Fall back to a default when no URL-like word was found
+        return command.url or "google.com"
 
     # File Management Methods
-    def list_files(self, path=None):
-        """List files in directory"""
+    def list_files(self, path=None, sort='name', page=1, page_size=LIST_PAGE_SIZE, reverse=None):
+        """List one page of a directory, folders first, sorted by 'name', 'size' or 'mtime'"""
         try:
             if path is None:
                 path = os.getcwd()
+            if reverse is None:
+                # Biggest / newest first; names A-Z
+                reverse = sort != 'name'
             
-            files = os.listdir(path)
-            result = f"📁 **Files in {path}:**\n"
-            
-            folders = [f for f in files if os.path.isdir(os.path.join(path, f))]
-            files_only = [f for f in files if os.path.isfile(os.path.join(path, f))]
-            
-            for folder in sorted(folders):
-                result += f"📂 {folder}/\n"
-            
-            for file in sorted(files_only):
-                size = os.path.getsize(os.path.join(path, file))
-                result += f"📄 {file} ({self._bytes_to_readable(size)})\n"
-            
-            return result
+            entries = self.dir_cache.listing(path, sort, reverse)
+            pages = max(1, -(-len(entries) // page_size))
+            page = min(max(1, page), pages)
+            folders = sum(1 for entry in entries if entry.is_dir)
+            lines = [f"📁 **Files in {path}** ({folders} folders, {len(entries) - folders} files, "
+                     f"by {SORT_LABELS[sort]}, page {page} of {pages}):"]
+            for entry in entries[(page - 1) * page_size:page * page_size]:
+                if entry.is_dir:
+                    lines.append(f"📂 {entry.name}/")
+                else:
+                    lines.append(f"📄 {entry.name} ({self._bytes_to_readable(entry.size)})")
+            if page < pages:
+                lines.append(f"... say 'list files page {page + 1}' for more")
+            return "\n".join(lines) + "\n"
         except Exception as e:
             return f"❌ Unable to list files: {str(e)}"
     
@@ -285,65 +201,180 @@ class AICore:
             return f"❌ Unable to create folder: {str(e)}"
     
     def delete_file(self, file_path):
-        """Delete a file or folder"""
+        """Delete a file or folder (moved to the trash instantly; 'undo last delete' restores it)"""
         try:
-            if os.path.isfile(file_path):
-                os.remove(file_path)
-                return f"✅ File '{file_path}' deleted successfully"
-            elif os.path.isdir(file_path):
-                shutil.rmtree(file_path)
-                return f"✅ Folder '{file_path}' deleted successfully"
+            if os.path.isfile(file_path) or os.path.isdir(file_path):
+                kind = 'Folder' if os.path.isdir(file_path) else 'File'
+                if self.trash.stage(file_path):
+                    return f"✅ {kind} '{file_path}' deleted successfully (say 'undo last delete' to restore it)"
+                # No trash folder on that drive: delete in place
+                if kind == 'Folder':
+                    shutil.rmtree(file_path)
+                else:
+                    os.remove(file_path)
+                return f"✅ {kind} '{file_path}' deleted successfully"
             else:
                 return f"❌ File or folder '{file_path}' not found"
         except Exception as e:
             return f"❌ Unable to delete: {str(e)}"
     
+    def undo_delete(self):
+        """Restore the most recently deleted file or folder from the trash"""
+        try:
+            entry = self.trash.undo()
+            if entry is None:
+                return "🤔 There is nothing to undo - the trash is empty"
+            return f"↩️ Restored '{entry.original}'"
+        except Exception as e:
+            return f"❌ Unable to undo delete: {str(e)}"
+    
     def copy_file(self, source, destination):
-        """Copy a file"""
+        """Copy a file or folder (progress and ETA are reported while it runs)"""
         try:
             if os.path.isfile(source):
-                shutil.copy2(source, destination)
-                return f"✅ File copied from '{source}' to '{destination}'"
+                result = copy_engine.copy(source, destination)
+                return f"✅ File copied from '{source}' to '{destination}' {self._copy_stats(result)}"
             elif os.path.isdir(source):
-                shutil.copytree(source, destination)
-                return f"✅ Folder copied from '{source}' to '{destination}'"
+                result = copy_engine.copy(source, destination)
+                return f"✅ Folder copied from '{source}' to '{destination}' {self._copy_stats(result)}"
             else:
                 return f"❌ Source '{source}' not found"
         except Exception as e:
             return f"❌ Unable to copy: {str(e)}"
     
     def move_file(self, source, destination):
-        """Move a file"""
+        """Move a file or folder (a rename, or a copy + delete across drives)"""
         try:
-            shutil.move(source, destination)
-            return f"✅ Moved '{source}' to '{destination}'"
+            result = copy_engine.move(source, destination)
+            if result is None:
+                return f"✅ Moved '{source}' to '{destination}'"
+            return f"✅ Moved '{source}' to '{destination}' {self._copy_stats(result)}"
         except Exception as e:
             return f"❌ Unable to move: {str(e)}"
     
-    def search_files(self, pattern, path=None):
-        """Search for files matching pattern"""
+    def _copy_stats(self, result):
+        rate = result.bytes / result.seconds if result.seconds else 0
+        files = f"{result.files:,} files, " if result.files != 1 else ""
+        return f"({files}{self._bytes_to_readable(result.bytes)} in {result.seconds:.1f}s, {self._bytes_to_readable(rate)}/s)"
+    
+    def search_files(self, pattern, path=None, limit=20):
+        """Search for files matching pattern (a name, glob or FileQuery), from the filename index when path is indexed"""
         try:
             if path is None:
                 path = os.getcwd()
+            query = pattern if isinstance(pattern, FileQuery) else FileQuery.from_pattern(pattern)
+            label = query.describe()
+            task = current_task()
             
-            matches = []
-            for root, dirs, files in os.walk(path):
-                for file in files:
-                    if pattern.lower() in file.lower():
-                        matches.append(os.path.join(root, file))
-            
-            if matches:
-                result = f"🔍 **Found {len(matches)} files matching '{pattern}':**\n"
-                for match in matches[:20]:  # Limit to 20 results
-                    result += f"📄 {match}\n"
-                if len(matches) > 20:
-                    result += f"... and {len(matches) - 20} more files\n"
-                return result
+            root = self.file_index.indexed_root(path)
+            if root:
+                self.file_index.refresh_if_stale(root)
+                total, found = self.file_index.search(query, path, limit=limit)
+                more = False
             else:
-                return f"❌ No files found matching '{pattern}'"
+                # Not indexed (yet) - walk the tree, streaming hits to the chat as they turn up,
+                # and stop at the first hit past the limit rather than walking on just to count
+                total, found, more = 0, [], False
+                with closing(find_files(query, path)) as hits:
+                    for hit in hits:
+                        if len(found) == limit:
+                            more = True
+                            break
+                        found.append(hit)
+                        total += 1
+                        if task.streaming:
+                            header = f"🔍 **Files matching {label}:**<br>" if total == 1 else ""
+                            task.emit(header + format_match(*hit))
+                if task.streaming and found:
+                    count = f"{total}+" if more else f"{total}"
+                    shown = f" (first {limit} shown above)" if more else " (shown above)"
+                    return f"🔍 **Found {count} files matching {label}**{shown}"
+            
+            if not total:
+                return f"❌ No files found matching {label}"
+            lines = [f"🔍 **Found {total}{'+' if more else ''} files matching {label}:**"]
+            lines.extend(format_match(*hit) for hit in found)
+            if more:
+                lines.append(f"... stopped after the first {limit}")
+            elif total > limit:
+                lines.append(f"... and {total - limit} more files")
+            return "\n".join(lines) + "\n"
         except Exception as e:
             return f"❌ Unable to search files: {str(e)}"
     
+    def find_duplicates(self, path=None, limit=10):
+        """Find files with identical content under path and report the space they waste"""
+        try:
+            if path is None:
+                path = os.getcwd()
+            groups, stats = duplicate_finder.find_duplicates(path)
+            if not groups:
+                return f"✅ No duplicate files in {path} ({stats.files:,} files checked)"
+            wasted = sum(group.reclaimable for group in groups)
+            copies = sum(len(group.paths) for group in groups)
+            lines = [f"🧬 **{len(groups)} sets of duplicates in {path}** ({copies:,} files, "
+                     f"{self._bytes_to_readable(wasted)} reclaimable):"]
+            for group in groups[:limit]:
+                lines.append(f"📄 {len(group.paths)} × {self._bytes_to_readable(group.size)} "
+                             f"({self._bytes_to_readable(group.reclaimable)} reclaimable)")
+                lines.extend(f"    {duplicate}" for duplicate in group.paths[:5])
+                if len(group.paths) > 5:
+                    lines.append(f"    ... and {len(group.paths) - 5} more copies")
+            if len(groups) > limit:
+                lines.append(f"... and {len(groups) - limit} more sets")
+            lines.append(f"({stats.files:,} files checked, {stats.candidates:,} shared a size, "
+                         f"{stats.full_hashed:,} needed a full read)")
+            return "\n".join(lines) + "\n"
+        except Exception as e:
+            return f"❌ Unable to find duplicates: {str(e)}"
+    
+    def storage_breakdown(self, path=None, limit=8):
+        """What is using space under path: bytes by file type, extension and age"""
+        try:
+            if path is None:
+                path = os.getcwd()
+            if not os.path.isdir(path):
+                return f"❌ Folder not found: {path}"
+            result = storage_scan.breakdown(path)
+            if not result.files:
+                return f"📂 {path} has no files"
+            total = result.bytes or 1
+            lines = [f"📊 **{self._bytes_to_readable(result.bytes)} in {result.files:,} files under {path}**", "",
+                     "**By type:**"]
+            lines.extend(f"• {share.label}: {self._bytes_to_readable(share.bytes)} ({share.bytes / total:.0%}, "
+                         f"{share.files:,} files)" for share in result.categories)
+            lines.append("**Biggest extensions:** " + ", ".join(
+                f"{share.label} {self._bytes_to_readable(share.bytes)}" for share in result.extensions[:limit]))
+            lines.append("**Last modified:** " + ", ".join(
+                f"{share.label.lower()} {self._bytes_to_readable(share.bytes)}" for share in result.modified if share.files))
+            return "\n".join(lines) + "\n"
+        except Exception as e:
+            return f"❌ Unable to analyze storage: {str(e)}"
+    
+    def clear_cache(self, min_age_days=None, dry_run=False, offer=False):
+        """Clean temp, user, browser and bytecode caches (or only measure them with dry_run).
+
+        With offer, a dry run that found something ends with CLEAN_OFFER.
+        """
+        try:
+            if min_age_days is None:
+                min_age_days = cache_cleaner.DEFAULT_MIN_AGE_DAYS
+            if dry_run:
+                reports = cache_cleaner.scan(min_age_days=min_age_days)
+            else:
+                reports = cache_cleaner.clean(min_age_days=min_age_days)
+            response = (cache_cleaner.format_report(reports, dry_run)
+                        + f"\n(files used in the last {min_age_days:g} days are kept)\n")
+            if dry_run and offer and any(report.files for report in reports):
+                response += CLEAN_OFFER + "\n"
+            return response
+        except Exception as e:
+            return f"❌ Unable to clear cache: {str(e)}"
+    
+    def scan_cache(self, min_age_days=None):
+        """How much clear_cache would free, per location"""
+        return self.clear_cache(min_age_days, dry_run=True)
+    
     def take_screenshot(self):
         """Take a screenshot"""
         try:
@@ -434,9 +465,14 @@ class AICore:
             'list_files': self.list_files,
             'create_folder': self.create_folder,
             'delete_file': self.delete_file,
+            'undo_delete': self.undo_delete,
             'copy_file': self.copy_file,
             'move_file': self.move_file,
             'search_files': self.search_files,
+            'find_duplicates': self.find_duplicates,
+            'storage_breakdown': self.storage_breakdown,
+            'clear_cache': self.clear_cache,
+            'scan_cache': self.scan_cache,
             'get_weather': self.get_weather,
             'get_time': self.get_current_time,
             'get_date': self.get_current_date,
@@ -444,79 +480,135 @@ class AICore:
             'google_search': self.google_search
         }
     
-    def process_command(self, user_input):
-        """Main method to process user commands"""
+    def process_command(self, user_input, context=None, session=None):
+        """Main method to process user commands.
+
+        Safe to call from several threads at once: per-client state lives in
+        session (a Session, the default one if omitted) and context (a
+        TaskContext) receives progress and cancellation for this command only.
+        """
+        return self.dispatch(user_input, context, session)[1]
+    
+    def dispatch(self, user_input, context=None, session=None):
+        """Like process_command, but return (intent, response) naming the handler that answered"""
+        with running(context or current_task()):
+            return self._process(user_input, session or self.default_session)
+    
+    def _process(self, user_input, session):
+        entry = None
         try:
-            user_input = user_input.lower().strip()
+            command = parse_command(user_input)
             
             # Store conversation
-            self.conversations_history.append({
-                'user': user_input,
-                'timestamp': datetime.now().isoformat(),
-                'response': None
-            })
-            
-            response = ""
-            
-            # Check for application opening requests
-            if any(keyword in user_input for keyword in ['open', 'launch', 'start', 'run']):
-                response = self._handle_app_request(user_input)
-            
-            # Check for system tasks
-            elif any(keyword in user_input for keyword in ['shutdown', 'restart', 'sleep', 'lock']):
-                response = self._handle_system_control(user_input)
-            
-            # Check for file operations
-            elif any(keyword in user_input for keyword in ['file', 'folder', 'directory', 'create', 'delete', 'copy', 'move']):
-                response = self._handle_file_operations(user_input)
-            
-            # Check for system information
-            elif any(keyword in user_input for keyword in ['battery', 'memory', 'disk', 'system', 'process', 'network']):
-                response = self._handle_system_info(user_input)
-            
-            # Check for volume control
-            elif any(keyword in user_input for keyword in ['volume', 'sound', 'mute', 'unmute']):
-                response = self._handle_volume_control(user_input)
-            
-            # Check for web-related tasks
-            elif any(keyword in user_input for keyword in ['search', 'google', 'website', 'browse']):
-                response = self._handle_web_tasks(user_input)
-            
-            # Check for time/date requests
-            elif any(keyword in user_input for keyword in ['time', 'date', 'clock']):
-                response = self._handle_time_date(user_input)
-            
-            # Check for weather requests
-            elif 'weather' in user_input:
-                response = self._handle_weather(user_input)
-            
-            # Check for screenshot
-            elif 'screenshot' in user_input:
-                response = self.take_screenshot()
+            entry = session.record(command.text)
             
-            # Basic conversational responses
+            current_task().check()
+            pending = session.take_pending()
+            steps = plan_steps(command.raw, self.predict_intent) if might_be_compound(command) else ()
+            if pending and command.has_token(*CONFIRM_WORDS) and not command.has_token(*DECLINE_WORDS):
+                intent, response = 'confirm', pending()
+            elif pending and command.has_token(*DECLINE_WORDS) and len(command.tokens) <= 3:
+                intent, response = 'confirm', "👍 Okay, cancelled."
+            elif len(steps) > 1:
+                intent, response = 'multi', self._run_steps(steps, session)
             else:
-                response = self._handle_conversation(user_input)
-            
-            # Store response
-            self.conversations_history[-1]['response'] = response
-            return response
-            
+                intent, response = self._route(command)
+                self._park_offer(session, command, intent, response)
+        except TaskCancelled:
+            intent, response = 'cancelled', "🛑 Command cancelled."
         except Exception as e:
-            return f"Sorry, I encountered an error: {str(e)}"
+            intent, response = 'error', f"Sorry, I encountered an error: {str(e)}"
+        
+        # Store response on this command's own entry
+        if entry is not None:
+            session.finish(entry, response)
+        return intent, response
+    
+    def new_session(self, session_id=None):
+        """Create (or, for a known id, resume) a conversation session sharing this core's resources"""
+        return Session(session_id, self.history_log)
+    
+    @property
+    def conversations_history(self):
+        """History of the default session"""
+        return self.default_session.history
+    
+    def _park_offer(self, session, command, intent, response):
+        """Remember the action a reply offered (a cache clean, a shutdown), so the next "yes" can run it"""
+        if not isinstance(response, str):
+            return
+        if intent == 'file' and response.endswith(CLEAN_OFFER + "\n"):
+            session.await_confirmation(partial(self.clear_cache, self._extract_min_age_days(command)))
+        elif intent == 'system_control' and response.endswith(POWER_OFFER + "\n"):
+            session.await_confirmation(self.shutdown_system if 'shutdown' in command else self.restart_system)
+    
+    def _run_steps(self, steps, session):
+        """Run the steps of a compound command, independent ones concurrently, and join their replies"""
+        context = current_task()
+        
+        def run_step(step):
+            with running(context):
+                try:
+                    command = parse_command(step.text)
+                    intent, response = self._route(command)
+                    self._park_offer(session, command, intent, response)
+                    return response
+                except Exception as e:
+                    return f"❌ {str(e)}"
+        
+        responses = run_steps(steps, run_step)
+        return "\n\n".join(f"**{step.index + 1}. {step.text}**\n{response}"
+                             for step, response in zip(steps, responses))
+    
+    def predict_intent(self, user_input):
+        """Intent that _route would try first for user_input, without running any handler"""
+        command = parse_command(user_input)
+        intent = self._classified_intent(command)
+        if intent:
+            return intent
+        intents = self._ranked_intents(command)
+        return intents[0] if intents else 'conversation'
+    
+    def _classified_intent(self, command):
+        """The classifier's intent when it is confident (and not system control for a named app), else None"""
+        if self.intent_classifier:
+            intent, confidence = self.intent_classifier.classify(command.text)
+            if confidence >= CLASSIFIER_CONFIDENCE and intent in self.intent_handlers:
+                if intent != 'system_control' or not self._names_app(command):
+                    return intent
+        return None
     
-    def _handle_app_request(self, user_input):
+    def _ranked_intents(self, command):
+        """Keyword-ranked intents; a named app outranks system control ("restart chrome" restarts the app)"""
+        intents = [candidate.intent for candidate in self.intent_matcher.match(command.tokens)]
+        if 'system_control' in intents and self._names_app(command):
+            intents = ['app'] + [intent for intent in intents if intent not in ('app', 'system_control')]
+        return intents
+    
+    def _names_app(self, command):
+        return self.app_catalog.lookup(command.tokens) is not None or self.app_index.lookup(command) is not None
+    
+    def _route(self, command):
+        """Dispatch to the best-ranked intent handler, falling through on empty replies"""
+        intent = self._classified_intent(command)
+        if intent:
+            response = self.intent_handlers[intent](command)
+            if response:
+                return intent, response
+        for intent in self._ranked_intents(command):
+            response = self.intent_handlers[intent](command)
+            if response:
+                return intent, response
+        return 'conversation', self._handle_conversation(command)
+    
+    def _handle_app_request(self, command):
         """Handle application opening requests"""
         # Extract app name from user input
-        app_name = self._extract_app_name(user_input)
+        app_name = self._extract_app_name(command)
         
         if app_name:
-            # Check if app exists in our database
-            app_info = None
-            for app_key, app_data in self.app_database.items():
-                if any(name in user_input for name in app_data['names']):
-                    app_info = app_data
-                    break
+            # Check if app exists in our catalog (longest whole-word alias wins)
+            app_info = self.app_catalog.lookup(command.tokens)
             
             if app_info:
                 # Try to open the application
@@ -528,18 +620,58 @@ class AICore:
                         return f"❌ {app_info['description']} not found on your system. Opening download page..."
                     else:
                         return f"❌ {app_info['description']} not found on your system."
-            else:
-                return f"🤔 I'm not familiar with '{app_name}'. Can you be more specific?"
+            
+            # Not in the catalog - fall back to anything the background indexer found installed
+            installed = self.app_index.lookup(command)
+            if installed and self._launch_installed(installed):
+                return f"✅ Opening {installed['name']}..."
+            # Typos and mishearings ("fire fox", "crome") - try the fuzzy alias index
+            return self._handle_fuzzy_app(app_name)
         else:
             return "🤔 Which application would you like me to open?"
     
-    def _extract_app_name(self, user_input):
+    def _handle_fuzzy_app(self, app_name):
+        """Launch a near-certain fuzzy match for app_name, otherwise suggest the closest apps"""
+        words = app_name.split()
+        matches = [(match, match.alias.title(), self._open_application)
+                   for match in self.app_catalog.suggest(words)]
+        matches += [(match, match.payload['name'], self._launch_installed)
+                    for match in self.app_index.suggest(words)]
+        if not matches:
+            return f"🤔 I'm not familiar with '{app_name}'. Can you be more specific?"
+        matches.sort(key=lambda item: -item[0].score)
+        best, name, launch = matches[0]
+        if best.score >= FUZZY_LAUNCH_SCORE and launch(best.payload):
+            return f"✅ Opening {name} (I heard '{app_name}')..."
+        suggestions = []
+        for _, name, _ in matches:
+            if name not in suggestions:
+                suggestions.append(name)
+        return f"🤔 I'm not familiar with '{app_name}'. Did you mean {' or '.join(suggestions[:3])}?"
+    
+    def _extract_app_name(self, command):
         """Extract application name from user input"""
-        # Remove common command words
-        words_to_remove = ['open', 'launch', 'start', 'run', 'please', 'can', 'you', 'the', 'app', 'application']
-        words = user_input.split()
-        filtered_words = [word for word in words if word not in words_to_remove]
-        return ' '.join(filtered_words) if filtered_words else None
+        return command.app
+    
+    def _launch_installed(self, installed):
+        """Start an application discovered by the AppIndexer"""
+        try:
+            if self.system == "Windows":
+                os.startfile(installed['exec'])
+            else:
+                subprocess.Popen(self.app_index.launch_argv(installed))
+            return True
+        except Exception as e:
+            print(f"Error opening application: {e}")
+            return False
+    
+    def _find_installed(self, app_info):
+        """Indexed installed app matching any of the catalog entry's names, or None"""
+        for name in app_info['names']:
+            installed = self.app_index.find(name)
+            if installed:
+                return installed
+        return None
     
     def _open_application(self, app_info):
         """Try to open an application"""
@@ -557,6 +689,42 @@ class AICore:
     def _open_windows_app(self, app_info):
         """Open application on Windows"""
         executable = app_info['executable']
+        if not executable:
+            return False
+        key = app_info.get('key') or executable
+        
+        # Known location from a previous launch: one stat, one spawn
+        cached = self.launchers.get(key)
+        if cached:
+            subprocess.Popen(cached)
+            return True
+        
+        # Start Menu shortcut found by the background indexer
+        installed = self._find_installed(app_info)
+        if installed:
+            return self._launch_installed(installed)
+        
+        exe_path = self._locate_windows_executable(app_info)
+        if exe_path:
+            self.launchers.put(key, exe_path)
+            subprocess.Popen(exe_path)
+            return True
+        
+        # Not resolvable to a file (e.g. App Paths alias) - let the shell try
+        try:
+            subprocess.Popen(executable)
+            return True
+        except:
+            return False
+    
+    def _locate_windows_executable(self, app_info):
+        """Resolve an executable path from PATH, common folders, registry, then a disk search"""
+        executable = app_info['executable']
+        
+        # Try PATH first
+        found = shutil.which(executable)
+        if found:
+            return found
         
         # Try common installation paths
         common_paths = [
@@ -566,33 +734,25 @@ class AICore:
             f"C:\\Windows\\System32\\{executable}",
             f"C:\\Windows\\{executable}"
         ]
-        
-        # Try to run from PATH first
-        try:
-            subprocess.Popen(executable)
-            return True
-        except:
-            pass
-        
-        # Try common paths
         for path in common_paths:
             if os.path.exists(path):
-                subprocess.Popen(path)
-                return True
+                return path
         
         # Search in registry for installed programs
         try:
-            return self._find_and_run_from_registry(app_info)
+            found = self._find_in_registry(app_info)
+            if found:
+                return found
         except:
             pass
         
         # Search entire system (last resort)
-        return self._search_and_run_executable(executable)
+        return self._search_executable(executable)
     
-    def _find_and_run_from_registry(self, app_info):
-        """Find application from Windows registry"""
+    def _find_in_registry(self, app_info):
+        """Find application path from Windows registry"""
         if self.system != "Windows":
-            return False
+            return None
             
         import winreg
         
@@ -613,17 +773,16 @@ class AICore:
                             install_location = winreg.QueryValueEx(subkey, "InstallLocation")[0]
                             exe_path = os.path.join(install_location, app_info['executable'])
                             if os.path.exists(exe_path):
-                                subprocess.Popen(exe_path)
-                                return True
+                                return exe_path
                     except:
                         continue
                     finally:
                         winreg.CloseKey(subkey)
             except:
                 continue
-        return False
+        return None
     
-    def _search_and_run_executable(self, executable):
+    def _search_executable(self, executable):
         """Search for executable in common directories"""
         search_paths = [
             "C:\\Program Files",
@@ -635,13 +794,8 @@ class AICore:
         for search_path in search_paths:
             for root, dirs, files in os.walk(search_path):
                 if executable in files:
-                    full_path = os.path.join(root, executable)
-                    try:
-                        subprocess.Popen(full_path)
-                        return True
-                    except:
-                        continue
-        return False
+                    return os.path.join(root, executable)
+        return None
     
     def _open_mac_app(self, app_info):
         """Open application on macOS"""
@@ -653,95 +807,160 @@ class AICore:
     
     def _open_linux_app(self, app_info):
         """Open application on Linux"""
+        exe_path = self.launchers.resolve_unix(app_info, self.app_index)
+        if not exe_path:
+            return False
         try:
-            subprocess.Popen([app_info['executable']])
+            subprocess.Popen([exe_path])
             return True
-        except:
+        except OSError:
+            self.launchers.forget(app_info.get('key') or app_info['executable'])
             return False
     
-    def _handle_system_control(self, user_input):
-        """Handle system control commands"""
-        if 'shutdown' in user_input:
-            return self.shutdown_system()
-        elif 'restart' in user_input:
-            return self.restart_system()
-        elif 'sleep' in user_input:
+    def _handle_system_control(self, command):
+        """Handle system control commands (shutdown and restart wait for a "yes", see _park_offer)"""
+        if 'shutdown' in command:
+            return f"⚠️ This will shut down the computer. {POWER_OFFER}\n"
+        elif 'restart' in command:
+            return f"⚠️ This will restart the computer. {POWER_OFFER}\n"
+        elif 'sleep' in command:
             return self.sleep_system()
-        elif 'lock' in user_input:
+        elif 'lock' in command:
             return self.lock_system()
     
-    def _handle_file_operations(self, user_input):
+    def _handle_file_operations(self, command):
         """Handle file operation commands"""
-        if 'create folder' in user_input or 'create directory' in user_input:
-            folder_name = self._extract_folder_name(user_input)
+        if 'create folder' in command or 'create directory' in command:
+            folder_name = self._extract_folder_name(command)
             return self.create_folder(folder_name)
-        elif 'list files' in user_input:
-            return self.list_files()
+        elif command.has_token('undo', 'restore') and command.has_token('delete', 'deleted', 'deletion'):
+            return self.undo_delete()
+        elif 'list files' in command:
+            return self.list_files(self._extract_search_path(command), **self._extract_listing_options(command))
+        elif command.has_token('duplicate', 'duplicates', 'duplicated'):
+            return self.find_duplicates(self._extract_search_path(command))
+        elif command.has_token('cache', 'caches', 'temp', 'temporary', 'junk'):
+            # Never deletes straight away (a misheard voice command must not empty caches):
+            # "clear the cache" measures first and offers to delete, see _process
+            return self.clear_cache(self._extract_min_age_days(command), dry_run=True,
+                                    offer=self._asks_to_clean_cache(command))
+        elif command.has_token('space'):
+            if command.has_token('free', 'left', 'available', 'remaining'):
+                return self.get_disk_usage()
+            return self.storage_breakdown(self._extract_search_path(command) or self._extract_home_folder(command))
+        elif command.has_token('find', 'search', 'locate'):
+            query = parse_file_query(command)
+            if query:
+                return self.search_files(query, self._extract_search_path(command))
+            return "🤔 Which file should I look for?"
+        elif not command.has_token(*FILE_WORDS):
+            # Routed here only by a size/date word ("which is bigger?"): let the next intent answer
+            return None
         # Add more file operations as needed
         return "I can help with file operations. What specifically would you like to do?"
     
-    def _handle_system_info(self, user_input):
+    def _extract_listing_options(self, command):
+        """list_files options from 'list files by size page 2' / 'list files oldest first'"""
+        options = {'sort': 'name'}
+        if command.has_token('size', 'biggest', 'largest', 'smallest'):
+            options['sort'] = 'size'
+        elif command.has_token('date', 'modified', 'recent', 'newest', 'oldest', 'latest', 'time'):
+            options['sort'] = 'mtime'
+        if command.has_token('smallest', 'oldest'):
+            options['reverse'] = False
+        page = command.words_after(frozenset(['page']))
+        if page and page.split()[0].isdigit():
+            options['page'] = int(page.split()[0])
+        return options
+    
+    def _extract_search_path(self, command):
+        """Folder to search: a path in the command (original casing) or the working directory"""
+        if not command.path:
+            return None
+        start = command.raw.lower().find(command.path)
+        path = os.path.expanduser(command.raw[start:start + len(command.path)] if start >= 0 else command.path)
+        # A regex or glob can look like a path; only a real folder counts
+        return path if os.path.isdir(path) else None
+    
+    def _asks_to_clean_cache(self, command):
+        """'clear the cache', as opposed to 'how much cache can I clear'"""
+        return (command.has_token('cache', 'caches', 'temp', 'temporary', 'junk')
+                and command.has_token(*CLEAN_WORDS) and not command.has_token(*DRY_RUN_WORDS))
+    
+    def _extract_min_age_days(self, command):
+        """Days from 'older than 2 weeks' / 'not used in 3 days', or None"""
+        match = CACHE_AGE_RE.search(command.text)
+        if not match:
+            return None
+        return int(match.group(1)) * AGE_UNITS[match.group(2)] / AGE_UNITS['day']
+    
+    def _extract_home_folder(self, command):
+        """~/Downloads etc. when the command names one of HOME_FOLDERS, or None"""
+        for token in command.tokens:
+            if token in HOME_FOLDERS:
+                return os.path.join(os.path.expanduser('~'), token.capitalize())
+        if command.has_token('home'):
+            return os.path.expanduser('~')
+        return None
+    
+    def _handle_system_info(self, command):
         """Handle system information requests"""
-        if 'battery' in user_input:
+        if 'battery' in command:
             return self.get_battery_status()
-        elif 'memory' in user_input:
+        elif 'memory' in command:
             return self.get_memory_usage()
-        elif 'disk' in user_input:
+        elif 'disk' in command:
             return self.get_disk_usage()
-        elif 'system' in user_input:
+        elif 'system' in command:
             return self.get_system_info()
-        elif 'process' in user_input:
+        elif 'process' in command:
             return self.get_running_processes()
-        elif 'network' in user_input:
+        elif 'network' in command:
             return self.get_network_info()
     
-    def _handle_volume_control(self, user_input):
+    def _handle_volume_control(self, command):
         """Handle volume control commands"""
-        if 'volume up' in user_input or 'increase volume' in user_input:
+        if 'volume up' in command or 'increase volume' in command:
             return self.volume_up()
-        elif 'volume down' in user_input or 'decrease volume' in user_input:
+        elif 'volume down' in command or 'decrease volume' in command:
             return self.volume_down()
-        elif 'mute' in user_input and 'unmute' not in user_input:
+        elif 'mute' in command and 'unmute' not in command:
             return self.mute_volume()
-        elif 'unmute' in user_input:
+        elif 'unmute' in command:
             return self.unmute_volume()
     
-    def _handle_web_tasks(self, user_input):
+    def _handle_web_tasks(self, command):
         """Handle web-related tasks"""
-        if 'google' in user_input and 'search' in user_input:
-            query = self._extract_search_query(user_input)
+        if 'google' in command and 'search' in command:
+            query = self._extract_search_query(command)
             return self.google_search(query)
-        elif 'website' in user_input or 'browse' in user_input:
-            url = self._extract_url(user_input)
+        elif 'website' in command or 'browse' in command:
+            url = self._extract_url(command)
             return self.open_website(url)
     
-    def _handle_time_date(self, user_input):
+    def _handle_time_date(self, command):
         """Handle time and date requests"""
-        if 'time' in user_input:
+        if 'time' in command:
             return self.get_current_time()
-        elif 'date' in user_input:
+        elif 'date' in command:
             return self.get_current_date()
     
-    def _handle_weather(self, user_input):
+    def _handle_weather(self, command):
         """Handle weather requests"""
         return self.get_weather()
     
-    def _handle_conversation(self, user_input):
+    def _handle_conversation(self, command):
         """Handle basic conversation"""
-        greetings = ['hello', 'hi', 'hey', 'good morning', 'good afternoon', 'good evening']
-        thanks = ['thank you', 'thanks', 'appreciate']
-        goodbyes = ['bye', 'goodbye', 'see you', 'exit', 'quit']
-        
-        if any(greeting in user_input for greeting in greetings):
+        if any(greeting in command for greeting in GREETINGS):
             return "Hello! I'm your AI assistant. I can help you with computer tasks like opening applications, managing files, controlling system settings, and much more. What would you like me to do?"
         
-        elif any(thank in user_input for thank in thanks):
+        elif any(thank in command for thank in THANKS):
             return "You're welcome! Is there anything else I can help you with?"
         
-        elif any(goodbye in user_input for goodbye in goodbyes):
+        elif any(goodbye in command for goodbye in GOODBYES):
             return "Goodbye! Feel free to ask for help anytime."
         
-        elif 'help' in user_input:
+        elif 'help' in command:
             return self._get_help_message()
         
         else:
@@ -966,15 +1185,25 @@ Just tell me what you'd like to do in plain English!
 import speech_recognition as sr
 import pyttsx3
 
-# Create a global AI core instance
-_ai_core_instance = AICore()
+# The shared AI core, built on first use so importing this module starts no indexing
+_ai_core_instance = None
+_ai_core_lock = threading.Lock()
+
+def shared_core():
+    """The AICore behind handle_task and friends, created (and its background indexing started) on first call"""
+    global _ai_core_instance
+    if _ai_core_instance is None:
+        with _ai_core_lock:
+            if _ai_core_instance is None:
+                _ai_core_instance = AICore(intent_mode=os.getenv('TEJAS_INTENT_MODE', 'keyword'))
+    return _ai_core_instance
 
-def handle_task(user_input, llm_fallback_func=None):
+def handle_task(user_input, llm_fallback_func=None, context=None, session=None):
     """
     Main function to handle user tasks - wrapper around AICore.process_command
     """
     try:
-        return _ai_core_instance.process_command(user_input)
+        return shared_core().process_command(user_input, context, session)
     except Exception as e:
         if llm_fallback_func:
             try:
@@ -983,6 +1212,22 @@ def handle_task(user_input, llm_fallback_func=None):
                 return f"Sorry, I encountered an error: {str(e)}"
         return f"Sorry, I encountered an error: {str(e)}"
 
+def dispatch_task(user_input, context=None, session=None):
+    """Run a command and return (intent, response) - the handler-aware form of handle_task"""
+    return shared_core().dispatch(user_input, context, session)
+
+def predict_intent(user_input):
+    """Intent a command would be routed to first, without running it"""
+    return shared_core().predict_intent(user_input)
+
+def new_session(session_id=None):
+    """Session on the shared AICore; pass it to handle_task to keep a separate history"""
+    return shared_core().new_session(session_id)
+
+def search_history(text, session_id=None, limit=50):
+    """Logged conversation turns mentioning text, newest first"""
+    return shared_core().history_log.search(text, session_id=session_id, limit=limit)
+
 def llm_fallback(user_input):
     """
     Fallback function when main AI processing fails
@@ -1040,11 +1285,11 @@ def get_network_info():
     """
     Get network information - wrapper around AICore method
     """
-    return _ai_core_instance.get_network_info()
+    return shared_core().get_network_info()
 
 # Additional utility function that might be helpful
 def get_weather(city=None):
     """
     Get weather information - wrapper around AICore method
     """
-    return _ai_core_instance.get_weather()
\ No newline at end of file
+    return shared_core().get_weather()
\ No newline at end of file
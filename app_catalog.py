@@ -0,0 +1,122 @@
+# app_catalog.py - Declarative application catalog compiled into an alias trie
+"""
+Applications known to AICore live in data/apps.json. Users can add or
+override entries in ~/.tejas/apps.json (same format). Both files are
+compiled into a token trie of aliases; the compiled form is pickled into
+the cache directory and reused until either source file changes.
+"""
+import json
+import os
+import pickle
+import platform
+
+from fuzzy_match import FuzzyMatcher
+from command_parser import command_tokens
+from intent_matcher import PhraseIndex
+from user_paths import data_path, user_path, cache_path, write_atomic
+
+BUILTIN_CATALOG = data_path('apps.json')
+CACHE_VERSION = 2  # 2: aliases tokenized like commands
+
+
+def user_catalog_path():
+    """Location of the user's catalog extension file"""
+    return user_path('apps.json')
+
+
+class AppCatalog:
+    """Application metadata plus a longest-match alias index.
+
+    ``apps`` maps an app key to its info dict (``names``, ``executable``,
+    ``download_url``, ``description``) with ``executable`` already resolved
+    for the current platform.
+    """
+
+    def __init__(self, system=None, sources=None, cache_file=None):
+        self.system = system or platform.system()
+        self.sources = sources if sources is not None else [BUILTIN_CATALOG, user_catalog_path()]
+        self.cache_file = cache_file or cache_path(f'app_catalog_{self.system.lower()}.pickle')
+        self.apps = {}
+        self.index = PhraseIndex()
+        self._fuzzy = None
+        self.load()
+
+    def _source_stamp(self):
+        stamp = []
+        for path in self.sources:
+            try:
+                st = os.stat(path)
+                stamp.append((path, st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamp.append((path, None, None))
+        return stamp
+
+    def load(self):
+        """Load the compiled catalog from cache, recompiling if any source changed"""
+        stamp = self._source_stamp()
+        try:
+            with open(self.cache_file, 'rb') as f:
+                cached = pickle.load(f)
+            if cached['version'] == CACHE_VERSION and cached['stamp'] == stamp:
+                self.apps, self.index = cached['apps'], cached['index']
+                return
+        except Exception:
+            pass
+        self.apps, self.index = self._compile()
+        try:
+            payload = {'version': CACHE_VERSION, 'stamp': stamp, 'apps': self.apps, 'index': self.index}
+            write_atomic(self.cache_file, pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+        except OSError as e:
+            print(f"⚠️ Unable to cache app catalog: {e}")
+
+    def _compile(self):
+        apps = {}
+        for path in self.sources:
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entries = json.load(f).get('apps', {})
+            except Exception as e:
+                print(f"⚠️ Skipping app catalog {path}: {e}")
+                continue
+            for key, entry in entries.items():
+                apps[key] = self._resolve(key, entry)
+        index = PhraseIndex()
+        for key, info in apps.items():
+            for name in info['names']:
+                index.add(command_tokens(name), key)
+        return apps, index
+
+    def _resolve(self, key, entry):
+        executable = entry.get('executable')
+        if isinstance(executable, dict):
+            executable = executable.get(self.system, executable.get('default'))
+        return {
+            'key': key,
+            'names': [name.lower() for name in entry.get('names', [key])],
+            'executable': executable,
+            'download_url': entry.get('download_url'),
+            'description': entry.get('description', key),
+            'category': entry.get('category'),
+        }
+
+    def lookup(self, tokens):
+        """Return the app info whose alias is the longest whole-word match in tokens, or None"""
+        best = None
+        for start, end, keys in self.index.longest_matches(tokens):
+            if best is None or end - start > best[1] - best[0]:
+                best = (start, end, keys[-1])
+        return self.apps[best[2]] if best else None
+
+    def suggest(self, words, limit=3):
+        """Closest catalog apps to misspelled/misheard words as FuzzyMatch(alias, info, distance, score)"""
+        if self._fuzzy is None:
+            self._fuzzy = FuzzyMatcher((name, info) for info in self.apps.values() for name in info['names'])
+        return self._fuzzy.search_phrases(words, limit)
+
+    def __len__(self):
+        return len(self.apps)
+
+    def __iter__(self):
+        return iter(self.apps.items())
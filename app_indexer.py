@@ -0,0 +1,305 @@
+# app_indexer.py - Background discovery of installed applications
+"""
+Builds an index of installed applications on a daemon thread so the app
+launcher never has to walk the disk or the registry while the user waits.
+
+Sources:
+  * Linux: programs on PATH and .desktop entries in the XDG application dirs
+  * Windows: shortcuts in the Start Menu folders
+  * macOS: .app bundles in /Applications and ~/Applications
+
+Every scanned directory is stored with its mtime; later runs only re-read
+directories whose mtime changed. The index is persisted to the cache dir,
+so lookups work immediately at startup while the refresh runs.
+"""
+import json
+import os
+import platform
+import shlex
+import stat
+import threading
+
+from fuzzy_match import FuzzyMatcher
+from command_parser import command_tokens
+from intent_matcher import PhraseIndex
+from user_paths import cache_path, write_atomic
+
+INDEX_VERSION = 1
+
+DESKTOP_DIRS = [
+    '/usr/share/applications',
+    '/usr/local/share/applications',
+    os.path.expanduser('~/.local/share/applications'),
+    '/var/lib/flatpak/exports/share/applications',
+    '/var/lib/snapd/desktop/applications',
+]
+
+
+def parse_desktop_file(path):
+    """Return {'name', 'exec', 'icon', 'hidden'} from a .desktop file's [Desktop Entry], or None"""
+    info = {}
+    in_entry = False
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith('['):
+                    in_entry = line == '[Desktop Entry]'
+                    continue
+                if not in_entry or '=' not in line:
+                    continue
+                key, value = line.split('=', 1)
+                key = key.strip()
+                if key in ('Name', 'Exec', 'Icon', 'NoDisplay', 'Hidden', 'Type') and key not in info:
+                    info[key] = value.strip()
+    except OSError:
+        return None
+    if info.get('Type', 'Application') != 'Application' or 'Exec' not in info:
+        return None
+    if info.get('Hidden', '').lower() == 'true':
+        return None
+    return {
+        'name': info.get('Name', os.path.splitext(os.path.basename(path))[0]),
+        'exec': info['Exec'],
+        'icon': info.get('Icon'),
+        'hidden': info.get('NoDisplay', '').lower() == 'true',
+    }
+
+
+def exec_argv(exec_line):
+    """Split a desktop Exec line into argv with field codes (%U, %f, ...) removed"""
+    try:
+        parts = shlex.split(exec_line)
+    except ValueError:
+        parts = exec_line.split()
+    parts = [p for p in parts if not (len(p) == 2 and p.startswith('%'))]
+    if parts and parts[0] == 'env':
+        parts = parts[1:]
+        while parts and '=' in parts[0]:
+            parts = parts[1:]
+    return parts
+
+
+def exec_program(exec_line):
+    """Program (first word) of a desktop Exec line"""
+    argv = exec_argv(exec_line)
+    return argv[0] if argv else None
+
+
+def _scan_path_dir(directory):
+    apps = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            if stat.S_ISREG(st.st_mode) and st.st_mode & 0o111:
+                apps.append({'name': entry.name, 'exec': entry.path, 'path': entry.path})
+    return apps
+
+
+def _scan_desktop_dir(directory):
+    apps = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith('.desktop') and entry.is_file():
+                info = parse_desktop_file(entry.path)
+                if info:
+                    info['id'] = entry.name[:-len('.desktop')]
+                    info['path'] = entry.path
+                    apps.append(info)
+    return apps
+
+
+def _scan_shortcut_dir(directory):
+    apps = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.lower().endswith(('.lnk', '.url')) and entry.is_file():
+                name = os.path.splitext(entry.name)[0]
+                if 'uninstall' not in name.lower():
+                    apps.append({'name': name, 'exec': entry.path, 'path': entry.path})
+    return apps
+
+
+def _scan_bundle_dir(directory):
+    apps = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith('.app'):
+                apps.append({'name': entry.name[:-len('.app')], 'exec': entry.path, 'path': entry.path})
+    return apps
+
+
+SCANNERS = {
+    'path': _scan_path_dir,
+    'desktop': _scan_desktop_dir,
+    'shortcuts': _scan_shortcut_dir,
+    'bundles': _scan_bundle_dir,
+}
+
+
+def default_sources(system=None):
+    """(directory, kind, recursive) tuples to scan on this platform"""
+    system = system or platform.system()
+    if system == 'Windows':
+        roots = [os.path.join(os.getenv('ProgramData', 'C:\\ProgramData'), 'Microsoft', 'Windows', 'Start Menu', 'Programs'),
+                 os.path.join(os.getenv('APPDATA', ''), 'Microsoft', 'Windows', 'Start Menu', 'Programs')]
+        return [(root, 'shortcuts', True) for root in roots]
+    if system == 'Darwin':
+        return [('/Applications', 'bundles', False), (os.path.expanduser('~/Applications'), 'bundles', False),
+                ('/System/Applications', 'bundles', False)]
+    sources = [(d, 'path', False) for d in os.getenv('PATH', '').split(os.pathsep) if d]
+    sources += [(d, 'desktop', False) for d in DESKTOP_DIRS]
+    return sources
+
+
+class AppIndexer:
+    """Index of installed applications, refreshed incrementally on a background thread"""
+
+    def __init__(self, system=None, sources=None, index_file=None):
+        self.system = system or platform.system()
+        self.sources = sources if sources is not None else default_sources(self.system)
+        self.index_file = index_file or cache_path(f'installed_apps_{self.system.lower()}.json')
+        self.ready = threading.Event()
+        self._thread = None
+        self._dirs = {}
+        self._load()
+
+    # ----------------------------
+    # Persistence
+    # ----------------------------
+    def _load(self):
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                self._dirs = data.get('dirs', {})
+        except (OSError, ValueError):
+            self._dirs = {}
+        self._publish(self._dirs)
+
+    def _save(self, dirs):
+        try:
+            payload = json.dumps({'version': INDEX_VERSION, 'dirs': dirs}, separators=(',', ':'))
+            write_atomic(self.index_file, payload.encode('utf-8'))
+        except OSError as e:
+            print(f"⚠️ Unable to save installed app index: {e}")
+
+    # ----------------------------
+    # Scanning
+    # ----------------------------
+    def start(self):
+        """Refresh the index on a daemon thread; returns immediately"""
+        if self._thread and self._thread.is_alive():
+            return
+        self.ready.clear()
+        self._thread = threading.Thread(target=self.refresh, name='AppIndexer', daemon=True)
+        self._thread.start()
+
+    def refresh(self):
+        """Rescan directories whose mtime changed and publish the new index"""
+        try:
+            old = self._dirs
+            dirs = {}
+            changed = False
+            for directory, kind, recursive in self.sources:
+                for path in self._expand(directory, recursive):
+                    try:
+                        mtime_ns = os.stat(path).st_mtime_ns
+                    except OSError:
+                        continue
+                    previous = old.get(path)
+                    if previous and previous['mtime_ns'] == mtime_ns and previous['kind'] == kind:
+                        dirs[path] = previous
+                        continue
+                    try:
+                        apps = SCANNERS[kind](path)
+                    except OSError:
+                        continue
+                    dirs[path] = {'kind': kind, 'mtime_ns': mtime_ns, 'apps': apps}
+                    changed = True
+            if changed or set(dirs) != set(old):
+                self._publish(dirs)
+                self._save(dirs)
+        finally:
+            self.ready.set()
+
+    def _expand(self, directory, recursive):
+        if not os.path.isdir(directory):
+            return []
+        if not recursive:
+            return [directory]
+        found = []
+        for root, subdirs, _ in os.walk(directory):
+            found.append(root)
+        return found
+
+    def _publish(self, dirs):
+        """Build lookup structures from the scanned dirs and swap them in atomically"""
+        by_name = {}
+        executables = {}
+        phrases = PhraseIndex()
+        fuzzy = FuzzyMatcher()
+        # Order matters: earlier sources (first PATH entry) win on name clashes
+        for path, record in dirs.items():
+            kind = record['kind']
+            for app in record['apps']:
+                entry = dict(app, kind=kind)
+                if kind == 'path':
+                    # PATH programs resolve executables but are not offered as "open X" targets,
+                    # otherwise "open file" would start /usr/bin/file
+                    executables.setdefault(app['name'], app['path'])
+                    continue
+                if app.get('hidden'):
+                    continue
+                aliases = {app['name'].lower()}
+                if app.get('id'):
+                    aliases.add(app['id'].lower().replace('-', ' ').replace('.', ' '))
+                for alias in aliases:
+                    by_name[alias] = entry
+                    phrases.add(command_tokens(alias), entry)
+                    fuzzy.add(alias, entry)
+        self._dirs = dirs
+        self._lookup = (by_name, executables, phrases, fuzzy)
+
+    # ----------------------------
+    # Queries
+    # ----------------------------
+    def __len__(self):
+        return sum(len(record['apps']) for record in self._dirs.values())
+
+    def executable(self, program):
+        """Full path of a program found on PATH, or None"""
+        return self._lookup[1].get(program)
+
+    def find(self, name):
+        """Launchable app whose name or desktop id equals name (case-insensitive), or None"""
+        return self._lookup[0].get(name.lower()) if name else None
+
+    def lookup(self, command):
+        """Installed app for a ParsedCommand: exact app name first, then longest desktop-name match"""
+        by_name, _, phrases, _ = self._lookup
+        if command.app and command.app in by_name:
+            return by_name[command.app]
+        best = None
+        for start, end, entries in phrases.longest_matches(command.tokens):
+            if best is None or end - start > best[0]:
+                best = (end - start, entries[0])
+        return best[1] if best else None
+
+    def suggest(self, words, limit=3):
+        """Closest installed apps to misspelled/misheard words as FuzzyMatch(alias, app, distance, score)"""
+        return self._lookup[3].search_phrases(words, limit)
+
+    def launch_argv(self, app):
+        """argv that starts an indexed app on Linux/macOS"""
+        if app['kind'] == 'desktop':
+            argv = exec_argv(app['exec'])
+            if argv and not os.path.isabs(argv[0]):
+                argv[0] = self.executable(argv[0]) or argv[0]
+            return argv
+        if app['kind'] == 'bundles':
+            return ['open', '-a', app['exec']]
+        return [app['exec']]
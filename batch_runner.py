@@ -0,0 +1,128 @@
+# batch_runner.py - Run a file (or stdin) of commands non-interactively with a JSONL report
+"""
+Usage:
+  python batch_runner.py commands.txt [-o report.jsonl] [--workers 8]
+  cat commands.txt | python batch_runner.py -
+  python batch_runner.py commands.txt --plan     # show lanes, run nothing
+  python batch_runner.py commands.txt --repeat 50 -o /dev/null   # load test
+
+One command per line; blank lines and lines starting with '#' are skipped.
+Read-only intents (system info, time, weather, web, conversation) run on a
+worker pool. Everything else (files, apps, volume, system control) runs on
+a single serial lane in file order, so "create folder x" still happens
+before "move x ...". Replies to a confirmation ("yes", "no") also go to the
+serial lane, right after the command that asked. The parallel lane uses a
+Session object of its own with the same id, so it never takes an offer made
+on the serial lane. Report lines are written in input order and hold the
+line number, command, lane, predicted intent, the handler that answered,
+latency and response.
+"""
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import ai_core
+from command_parser import parse_command
+from session import new_session_id
+
+# Intents whose handlers only read state, so their commands can run in any order
+PARALLEL_INTENTS = frozenset({'system_info', 'time_date', 'weather', 'web', 'conversation'})
+
+
+def read_commands(stream):
+    """(line number, command) for every non-blank, non-comment line"""
+    for line_no, line in enumerate(stream, 1):
+        text = line.strip()
+        if text and not text.startswith('#'):
+            yield line_no, text
+
+
+def plan(commands):
+    """(line, command, predicted intent, lane) for each command"""
+    planned = []
+    for line_no, text in commands:
+        intent = ai_core.predict_intent(text)
+        # A "yes"/"no" answers the serial command before it, so it must run in that order
+        answers = parse_command(text).has_token(*ai_core.CONFIRM_WORDS, *ai_core.DECLINE_WORDS)
+        lane = 'parallel' if intent in PARALLEL_INTENTS and not answers else 'serial'
+        planned.append((line_no, text, intent, lane))
+    return planned
+
+
+def run_batch(planned, workers=8, session=None):
+    """Execute planned commands; yields one report dict per command, in input order"""
+    session = session or ai_core.new_session(new_session_id('batch'))
+    # Same id (one logged history), but its own pending offer, which the serial lane never sees
+    sessions = {'serial': session, 'parallel': ai_core.new_session(session.id)}
+    batch_start = time.perf_counter()
+
+    def execute(line_no, text, intent, lane):
+        started = time.perf_counter()
+        handler, response = ai_core.dispatch_task(text, session=sessions[lane])
+        finished = time.perf_counter()
+        return {
+            'line': line_no,
+            'command': text,
+            'lane': lane,
+            'intent': intent,
+            'handler': handler,
+            'start_ms': round((started - batch_start) * 1000, 3),
+            'latency_ms': round((finished - started) * 1000, 3),
+            'response': response,
+        }
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='batch') as pool, \
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix='batch-serial') as serial:
+        futures = [(serial if item[3] == 'serial' else pool).submit(execute, *item) for item in planned]
+        for future in futures:
+            yield future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a file of Tejas commands and write a JSONL report")
+    parser.add_argument('input', help="command file, or '-' for stdin")
+    parser.add_argument('-o', '--output', help="report file (default: stdout)")
+    parser.add_argument('--workers', type=int, default=8, help="threads for independent commands")
+    parser.add_argument('--repeat', type=int, default=1, help="run the whole file this many times")
+    parser.add_argument('--plan', action='store_true', help="print each command's lane and intent without running")
+    args = parser.parse_args()
+
+    if args.input == '-':
+        commands = list(read_commands(sys.stdin))
+    else:
+        with open(args.input, 'r', encoding='utf-8') as f:
+            commands = list(read_commands(f))
+    planned = plan(commands) * args.repeat
+
+    if args.plan:
+        for line_no, text, intent, lane in planned[:len(commands)]:
+            print(f"{line_no:>5}  {lane:<8}  {intent:<14}  {text}")
+        return 0
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    latencies = []
+    started = time.perf_counter()
+    try:
+        for record in run_batch(planned, args.workers):
+            latencies.append(record['latency_ms'])
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - started
+
+    if latencies:
+        latencies.sort()
+        parallel = sum(1 for item in planned if item[3] == 'parallel')
+        print(f"✅ {len(latencies)} commands in {elapsed:.2f}s ({len(latencies) / elapsed:,.0f}/s; "
+              f"{parallel} parallel, {len(latencies) - parallel} serial). "
+              f"Latency p50 {latencies[len(latencies) // 2]:.2f} ms, "
+              f"p99 {latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)]:.2f} ms, "
+              f"sum {sum(latencies) / 1000:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
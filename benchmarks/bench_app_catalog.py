@@ -0,0 +1,88 @@
+# bench_app_catalog.py - App lookup cost vs catalog size, and compiled-cache load time
+"""
+Usage: python benchmarks/bench_app_catalog.py [--sizes 30,1000,5000,20000]
+
+For each catalog size a synthetic apps.json is written to a temp dir. The
+script times the cold compile, the warm load from the pickled cache, the
+legacy linear substring scan and AppCatalog.lookup().
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app_catalog import AppCatalog, BUILTIN_CATALOG  # noqa: E402
+from command_parser import parse_command  # noqa: E402
+
+SYLLABLES = ["ka", "lo", "mi", "tor", "zen", "pix", "nova", "byte", "core", "flux", "grid", "sync", "wave", "lab"]
+
+
+def synthetic_catalog(size, seed=5):
+    with open(BUILTIN_CATALOG, 'r', encoding='utf-8') as f:
+        apps = json.load(f)['apps']
+    rng = random.Random(seed)
+    while len(apps) < size:
+        name = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        apps[f"{name}{len(apps)}"] = {
+            'names': [f"{name} studio", name, f"{name} {rng.choice(SYLLABLES)}"],
+            'executable': {'default': name},
+            'download_url': None,
+            'description': name.title(),
+        }
+    return {'apps': apps}
+
+
+def legacy_lookup(apps, user_input):
+    for app_data in apps.values():
+        if any(name in user_input for name in app_data['names']):
+            return app_data
+    return None
+
+
+def per_call_us(func, args_list, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for args in args_list:
+            func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best / len(args_list) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', default='30,1000,5000,20000')
+    args = parser.parse_args()
+
+    queries = ["open visual studio code", "please launch google chrome", "start the calculator",
+               "run obs studio now", "open something unknown", "launch epic games launcher"]
+    commands = [parse_command(q) for q in queries] * 50
+
+    print(f"{'apps':>7} {'compile ms':>11} {'cache load ms':>14} {'legacy us':>10} {'trie us':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (int(s) for s in args.sizes.split(',')):
+            source = os.path.join(tmp, f'apps_{size}.json')
+            with open(source, 'w', encoding='utf-8') as f:
+                json.dump(synthetic_catalog(size), f)
+            cache_file = os.path.join(tmp, f'apps_{size}.pickle')
+
+            start = time.perf_counter()
+            catalog = AppCatalog('Linux', sources=[source], cache_file=cache_file)
+            compile_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            catalog = AppCatalog('Linux', sources=[source], cache_file=cache_file)
+            load_ms = (time.perf_counter() - start) * 1000
+
+            legacy_us = per_call_us(legacy_lookup, [(catalog.apps, c.text) for c in commands])
+            trie_us = per_call_us(catalog.lookup, [(c.tokens,) for c in commands])
+            print(f"{len(catalog):>7} {compile_ms:>11.1f} {load_ms:>14.1f} {legacy_us:>10.1f} {trie_us:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# bench_breakdown.py - Type/age storage breakdown: NumPy chunks vs per-file dict updates
+"""
+Usage: python benchmarks/bench_breakdown.py [--root /usr] [--repeat 3]
+
+Times storage_scan.breakdown on --root against the same walk aggregated
+the straightforward way (a dict update per file for category, extension
+and age), and checks that both arrive at the same category totals. The
+walk is shared, so the difference is the aggregation cost.
+"""
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import storage_scan  # noqa: E402
+from tree_walker import walk_files  # noqa: E402
+
+
+def dict_breakdown(root, now):
+    root = os.path.abspath(root)
+    categories = defaultdict(lambda: [0, 0])
+    extensions = defaultdict(lambda: [0, 0])
+    modified = defaultdict(lambda: [0, 0])
+    folders = {}
+    for path, st in walk_files(root, excluded_names=()):
+        directory, _, name = path.rpartition(os.sep)
+        ext = name.rpartition('.')[2].lower() if '.' in name else ''
+        forced = folders.get(directory)
+        if forced is None:
+            forced = folders[directory] = storage_scan._folder_category(directory, root)
+        category = forced if forced >= 0 else storage_scan._EXTENSION_CATEGORY.get(ext, len(storage_scan.CATEGORIES) - 1)
+        age = now - int(st.st_mtime)
+        bucket = next((i for i, (_, limit) in enumerate(storage_scan.AGE_BUCKETS) if limit is None or age < limit))
+        for totals, key in ((categories, storage_scan.CATEGORIES[category]), (extensions, ext), (modified, bucket)):
+            totals[key][0] += st.st_size
+            totals[key][1] += 1
+    return categories
+
+
+def best_of(repeat, func):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - started)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--root', default='/usr' if os.name != 'nt' else os.path.expanduser('~'))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    now = time.time()
+    walk_time, files = best_of(args.repeat, lambda: sum(1 for _ in walk_files(args.root, excluded_names=())))
+    dict_time, expected = best_of(args.repeat, lambda: dict_breakdown(args.root, int(now)))
+    numpy_time, result = best_of(args.repeat, lambda: storage_scan.breakdown(args.root, now))
+    print(f"{files:,} files under {args.root}")
+    print(f"walk only   {walk_time:7.2f}s")
+    print(f"dict        {dict_time:7.2f}s")
+    print(f"numpy       {numpy_time:7.2f}s")
+    same = all(expected[share.label] == [share.bytes, share.files] for share in result.categories)
+    print(f"category totals {'match' if same else 'DIFFER'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# bench_cache_cleaner.py - Cache cleanup with one unlink worker vs a pool
+"""
+Usage: python benchmarks/bench_cache_cleaner.py [--files 50000] [--workers 1 8] [--dir DIR]
+
+For each --workers value, builds a cache-like tree of --files small files
+(backdated so they pass the age filter), then times cache_cleaner.scan
+(the dry run) and cache_cleaner.clean, and checks that the freed bytes
+match the dry-run estimate.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cache_cleaner  # noqa: E402
+
+
+def build_cache(root, files):
+    old = time.time() - 10 * 86400
+    for i in range(files):
+        directory = os.path.join(root, f'{i % 256:02x}', f'{i // 256 % 64:02x}')
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        path = os.path.join(directory, f'entry{i}')
+        with open(path, 'wb') as f:
+            f.write(b'c' * (i % 8192))
+        os.utime(path, (old, old))
+    for directory, _, _ in os.walk(root):
+        if directory != root:
+            os.utime(directory, (old, old))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--files', type=int, default=50_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 8])
+    parser.add_argument('--dir', help="where to build the tree (default: a temporary directory)")
+    args = parser.parse_args()
+
+    for workers in args.workers:
+        root = tempfile.mkdtemp(prefix='tejas-cache-', dir=args.dir)
+        try:
+            build_cache(root, args.files)
+            location = [cache_cleaner.CacheLocation('Benchmark cache', root, 'contents')]
+            started = time.perf_counter()
+            estimate = cache_cleaner.scan(location)[0]
+            scanned = time.perf_counter() - started
+            started = time.perf_counter()
+            freed = cache_cleaner.clean(location, workers=workers)[0]
+            cleaned = time.perf_counter() - started
+            print(f"workers={workers:<3} dry run {scanned:6.2f}s  clean {cleaned:6.2f}s  "
+                  f"freed {freed.bytes:,} of {estimate.bytes:,} bytes estimated, {freed.failed} skipped, "
+                  f"{len(os.listdir(root))} folders left")
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
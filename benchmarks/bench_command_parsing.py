@@ -0,0 +1,119 @@
+# bench_command_parsing.py - Allocations per command: per-extractor re-splitting vs one ParsedCommand
+"""
+Usage: python benchmarks/bench_command_parsing.py [--commands N]
+
+The legacy pipeline lowercases the input, tokenizes it for routing and then
+lets the chosen handler re-split it (building its stop-word list each call).
+The parsed pipeline tokenizes once with parse_command() and hands the same
+ParsedCommand to routing and to the handler. tracemalloc reports the peak
+memory allocated while a single command is processed.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_intent_routing import INTENT_KEYWORDS, build_corpus  # noqa: E402
+from command_parser import parse_command, FOLDER_MARKERS  # noqa: E402
+from intent_matcher import IntentMatcher, tokenize  # noqa: E402
+
+
+def legacy_extract_app_name(user_input):
+    words_to_remove = ['open', 'launch', 'start', 'run', 'please', 'can', 'you', 'the', 'app', 'application']
+    words = user_input.split()
+    filtered_words = [word for word in words if word not in words_to_remove]
+    return ' '.join(filtered_words) if filtered_words else None
+
+
+def legacy_extract_search_query(user_input):
+    words_to_remove = ['google', 'search', 'for', 'please', 'can', 'you']
+    words = user_input.split()
+    filtered_words = [word for word in words if word not in words_to_remove]
+    return ' '.join(filtered_words) if filtered_words else "search query"
+
+
+def legacy_extract_folder_name(user_input):
+    words = user_input.split()
+    for marker in ('folder', 'directory'):
+        if marker in words:
+            idx = words.index(marker)
+            if idx + 1 < len(words):
+                return ' '.join(words[idx + 1:])
+    return "new_folder"
+
+
+def legacy_extract_url(user_input):
+    for word in user_input.split():
+        if '.' in word and not word.startswith('.'):
+            return word
+    return "google.com"
+
+
+def legacy_pipeline(matcher, raw):
+    user_input = raw.lower().strip()
+    intent = matcher.best(tokenize(user_input))
+    if intent == 'app':
+        return legacy_extract_app_name(user_input)
+    if intent == 'web':
+        return legacy_extract_search_query(user_input), legacy_extract_url(user_input)
+    if intent == 'file':
+        return legacy_extract_folder_name(user_input)
+    return intent
+
+
+def parsed_pipeline(matcher, raw):
+    command = parse_command(raw)
+    intent = matcher.best(command.tokens)
+    if intent == 'app':
+        return command.app
+    if intent == 'web':
+        return command.query, command.url
+    if intent == 'file':
+        return command.words_after(FOLDER_MARKERS)
+    return intent
+
+
+def measure_time(pipeline, matcher, corpus, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for raw in corpus:
+            pipeline(matcher, raw)
+        best = min(best, time.perf_counter() - start)
+    return best / len(corpus) * 1e6
+
+
+def measure_allocations(pipeline, matcher, corpus):
+    """Average peak bytes allocated while one command is processed"""
+    peak_total = 0
+    tracemalloc.start()
+    for raw in corpus:
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        pipeline(matcher, raw)
+        peak_total += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+    return peak_total / len(corpus)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--commands', type=int, default=5000)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.commands)
+    matcher = IntentMatcher(INTENT_KEYWORDS)
+
+    print(f"Corpus: {len(corpus)} utterances")
+    print(f"{'pipeline':<10} {'tokenizations':>13} {'peak bytes/cmd':>15} {'us/cmd':>8}")
+    for name, passes, pipeline in (('legacy', 2, legacy_pipeline), ('parsed', 1, parsed_pipeline)):
+        peak = measure_allocations(pipeline, matcher, corpus)
+        us = measure_time(pipeline, matcher, corpus)
+        print(f"{name:<10} {passes:>13} {peak:>15.0f} {us:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
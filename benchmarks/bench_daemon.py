@@ -0,0 +1,104 @@
+# bench_daemon.py - Throughput and latency of the Tejas daemon with N parallel clients
+"""
+Usage: python benchmarks/bench_daemon.py [--clients 1,4,16] [--requests 200]
+
+Starts tejas_daemon.py in a temporary TEJAS_HOME, then for each client
+count opens that many persistent connections. Every connection sends
+`--requests` side-effect-free commands back to back. Reports commands/s and
+round-trip p50/p99, next to the cost of a cold
+`python -c "import ai_core; ai_core.handle_task(...)"` run, which is what
+every command paid before the daemon existed.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tejas_client import TejasClient  # noqa: E402
+
+COMMANDS = ["hello", "what time is it", "what's the date today", "thank you", "memory usage"]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def wait_for_daemon(address, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with TejasClient(address) as client:
+                client.call('ping')
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("daemon did not start")
+
+
+def run_clients(address, clients, requests):
+    latencies = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(clients)
+
+    def client_loop(n):
+        local = []
+        with TejasClient(address) as client:
+            barrier.wait()
+            for i in range(requests):
+                start = time.perf_counter()
+                client.process_command(COMMANDS[(n + i) % len(COMMANDS)], session=f"bench-{n}")
+                local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client_loop, args=(n,)) for n in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clients', default='1,4,16')
+    parser.add_argument('--requests', type=int, default=200, help='commands per client')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ, TEJAS_HOME=home)
+        address = os.path.join(home, 'tejas.sock')
+
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', "import ai_core; ai_core.handle_task('hello')"],
+                       cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL)
+        cold_ms = (time.perf_counter() - start) * 1000
+
+        daemon = subprocess.Popen([sys.executable, 'tejas_daemon.py', '--socket', address],
+                                  cwd=ROOT, env=env, stdout=subprocess.DEVNULL)
+        try:
+            wait_for_daemon(address)
+            print(f"cold one-shot process: {cold_ms:.0f} ms per command")
+            print(f"{'clients':>8} {'commands/s':>11} {'p50 ms':>8} {'p99 ms':>8}")
+            for clients in (int(c) for c in args.clients.split(',')):
+                latencies, elapsed = run_clients(address, clients, args.requests)
+                print(f"{clients:>8} {len(latencies) / elapsed:>11,.0f} "
+                      f"{percentile(latencies, 50):>8.2f} {percentile(latencies, 99):>8.2f}")
+            with TejasClient(address) as client:
+                client.call('shutdown')
+            daemon.wait(10)
+        finally:
+            if daemon.poll() is None:
+                daemon.kill()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# bench_dir_sizes.py - Folder size tree: os.walk du vs parallel scan vs incremental rescan
+"""
+Usage: python benchmarks/bench_dir_sizes.py [--dirs 5000] [--files-per-dir 20] [--changed-percent 1] [--dir DIR]
+
+Builds --dirs nested directories holding --files-per-dir small files each,
+then times:
+
+  os.walk du       recursive totals with os.walk + os.path.getsize
+  full scan        dir_sizes.directory_sizes(full=True)
+  unchanged        a rescan served from the cache (one stat per directory)
+  N% changed       a rescan after adding a file to --changed-percent of the directories
+  drill down       children() of every node, as a view expanding the whole tree would
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dir_sizes  # noqa: E402
+
+
+def build_tree(root, dirs, files_per_dir):
+    rng = random.Random(3)
+    paths = [root]
+    for i in range(dirs):
+        path = os.path.join(rng.choice(paths[-200:]), f'd{i:05d}')
+        os.mkdir(path)
+        paths.append(path)
+        for j in range(files_per_dir):
+            with open(os.path.join(path, f'f{j:03d}'), 'wb') as f:
+                f.write(b'x' * rng.randint(0, 4096))
+    return paths
+
+
+def os_walk_du(root):
+    totals = {}
+    for directory, _, names in os.walk(root, topdown=False):
+        total = sum(os.path.getsize(os.path.join(directory, name)) for name in names)
+        for name in os.listdir(directory):
+            total += totals.pop(os.path.join(directory, name), 0)
+        totals[directory] = total
+    return totals[root]
+
+
+def timed(label, func):
+    started = time.perf_counter()
+    result = func()
+    print(f"{label:<14} {time.perf_counter() - started:7.3f}s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--dirs', type=int, default=5000)
+    parser.add_argument('--files-per-dir', type=int, default=20)
+    parser.add_argument('--changed-percent', type=float, default=1.0)
+    parser.add_argument('--dir', help="where to build the tree (default: a temporary directory)")
+    args = parser.parse_args()
+
+    os.environ.setdefault('TEJAS_HOME', tempfile.mkdtemp(prefix='tejas-home-'))
+    root = tempfile.mkdtemp(prefix='tejas-sizes-', dir=args.dir)
+    try:
+        paths = build_tree(root, args.dirs, args.files_per_dir)
+        # Let the new mtimes age past the racy window so the cache can trust them
+        time.sleep(dir_sizes.RACY_SECONDS + 0.5)
+        expected = timed("os.walk du", lambda: os_walk_du(root))
+        tree = timed("full scan", lambda: dir_sizes.directory_sizes(root, full=True))
+        time.sleep(dir_sizes.RACY_SECONDS + 0.5)
+        timed("unchanged", lambda: dir_sizes.directory_sizes(root))
+        for path in random.Random(5).sample(paths, max(1, int(len(paths) * args.changed_percent / 100))):
+            with open(os.path.join(path, 'added'), 'wb') as f:
+                f.write(b'y' * 1000)
+                expected += 1000
+        tree = timed(f"{args.changed_percent:g}% changed", lambda: dir_sizes.directory_sizes(root))
+        timed("drill down", lambda: [tree.children(index) for index in range(len(tree))])
+        print(f"{len(tree):,} folders, {tree.count[0]:,} files, totals {'match' if tree.size[0] == expected else 'DIFFER'}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
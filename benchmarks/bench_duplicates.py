@@ -0,0 +1,92 @@
+# bench_duplicates.py - Duplicate finder on a synthetic tree vs hashing every file
+"""
+Usage: python benchmarks/bench_duplicates.py [--files 200000] [--dup-percent 5] [--dir DIR]
+
+Builds a tree of --files small and medium files with random sizes, where
+--dup-percent of them are copies of another file and a few are same-size
+files that only differ in the middle. Then it times:
+
+  hash all    BLAKE2b of every file (what a naive finder reads)
+  staged      duplicate_finder.find_duplicates
+
+and prints how many files each stage had to open.
+"""
+import argparse
+import hashlib
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from duplicate_finder import find_duplicates  # noqa: E402
+
+
+def build_tree(root, files, dup_percent):
+    rng = random.Random(7)
+    originals = []
+    started = time.perf_counter()
+    for i in range(files):
+        directory = os.path.join(root, f'd{i // 1000:04d}')
+        if i % 1000 == 0:
+            os.makedirs(directory)
+        path = os.path.join(directory, f'f{i:07d}.bin')
+        roll = rng.random() * 100
+        if originals and roll < dup_percent:
+            shutil.copyfile(rng.choice(originals), path)
+            continue
+        # Mostly small files, some up to 2 MB; sizes collide often below 4 KB
+        size = rng.randint(1, 4096) if roll < 90 else rng.randint(4096, 2 * 1024 * 1024)
+        data = rng.randbytes(size)
+        with open(path, 'wb') as f:
+            f.write(data)
+        if roll > 99.5 and size > 256 * 1024:
+            # Same size and edges, different middle: only a full hash tells them apart
+            twin = bytearray(data)
+            twin[size // 2] ^= 0xFF
+            with open(path + '.twin', 'wb') as f:
+                f.write(twin)
+        if len(originals) < 5000:
+            originals.append(path)
+    print(f"built {files:,} files in {time.perf_counter() - started:.1f}s")
+
+
+def hash_all(root):
+    count = 0
+    for directory, _, names in os.walk(root):
+        for name in names:
+            with open(os.path.join(directory, name), 'rb') as f:
+                hashlib.blake2b(f.read())
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--files', type=int, default=200_000)
+    parser.add_argument('--dup-percent', type=float, default=5.0)
+    parser.add_argument('--dir', help="where to build the tree (default: a temporary directory)")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix='tejas-dupes-', dir=args.dir)
+    try:
+        build_tree(root, args.files, args.dup_percent)
+        started = time.perf_counter()
+        count = hash_all(root)
+        print(f"hash all  {time.perf_counter() - started:7.2f}s  ({count:,} files read in full)")
+        started = time.perf_counter()
+        groups, stats = find_duplicates(root)
+        elapsed = time.perf_counter() - started
+        wasted = sum(group.reclaimable for group in groups)
+        print(f"staged    {elapsed:7.2f}s  ({stats.files:,} files sized, {stats.candidates:,} edge-hashed, "
+              f"{stats.full_hashed:,} fully hashed)")
+        print(f"{len(groups):,} duplicate sets, {wasted / 1024 / 1024:.1f} MB reclaimable")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
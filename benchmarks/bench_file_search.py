@@ -0,0 +1,74 @@
+# bench_file_search.py - Time to first hit / first 20 hits of the streaming search vs collect-then-print
+"""
+Usage: python benchmarks/bench_file_search.py [ROOT] [--query "find pdfs bigger than 10MB modified this week"]
+
+The query is parsed the same way the assistant parses it. Three numbers
+are printed for the live (non-indexed) search:
+
+  collect all   the old approach: walk everything, build the full match list
+  first hit     find_files() until the first match arrives
+  first 20      find_files() closed after 20 matches (what a reply shows)
+"""
+import argparse
+import os
+import sys
+import time
+from contextlib import closing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from command_parser import parse_command  # noqa: E402
+from file_search import find_files, parse_file_query  # noqa: E402
+
+
+def collect_all(query, root):
+    name_ok = query.name_test()
+    found = []
+    for directory, _, names in os.walk(root):
+        for name in names:
+            if not name_ok(name):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                st = os.stat(path, follow_symlinks=False)
+            except OSError:
+                continue
+            if query.stat_matches(st.st_size, st.st_mtime):
+                found.append(path)
+    return found
+
+
+def first_n(query, root, n):
+    """Seconds until the first and the n-th hit"""
+    started = time.perf_counter()
+    first = None
+    with closing(find_files(query, root)) as hits:
+        for count, _ in enumerate(hits, 1):
+            if first is None:
+                first = time.perf_counter() - started
+            if count == n:
+                break
+    return first, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('root', nargs='?', default=os.path.expanduser('~'))
+    parser.add_argument('--query', default="find py files larger than 10kb modified this year")
+    args = parser.parse_args()
+
+    query = parse_file_query(parse_command(args.query))
+    print(f"{args.query!r} -> {query.describe()} under {args.root}")
+    started = time.perf_counter()
+    total = len(collect_all(query, args.root))
+    print(f"collect all  {(time.perf_counter() - started) * 1000:9.1f} ms  ({total:,} matches)")
+    first, twenty = first_n(query, args.root, 20)
+    if first is None:
+        print("first hit    (no matches)")
+        return
+    print(f"first hit    {first * 1000:9.1f} ms")
+    print(f"first 20     {twenty * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
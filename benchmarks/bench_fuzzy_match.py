@@ -0,0 +1,96 @@
+# bench_fuzzy_match.py - Fuzzy app-name lookup latency and accuracy vs alias count
+"""
+Usage: python benchmarks/bench_fuzzy_match.py [--sizes 100,1000,5000,20000] [--budget-ms 2]
+
+Builds a FuzzyMatcher over the built-in catalog aliases padded with
+synthetic names, then queries it with typo'd / split / merged variants of
+known aliases. Reports build time, p50/p99 lookup latency, how often the
+intended app is the top result, how often the top result is at least as
+close as the intended alias (synthetic names collide, so a garbled name can
+genuinely be nearer another app), and whether p99 stays inside the budget.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app_catalog import BUILTIN_CATALOG  # noqa: E402
+from fuzzy_match import FuzzyMatcher, bounded_levenshtein, compact  # noqa: E402
+
+SYLLABLES = ["ka", "lo", "mi", "tor", "zen", "pix", "nova", "byte", "core", "flux", "grid", "sync", "wave", "lab"]
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def aliases(size, seed=7):
+    with open(BUILTIN_CATALOG, 'r', encoding='utf-8') as f:
+        apps = json.load(f)['apps']
+    pairs = [(name, key) for key, info in apps.items() for name in info.get('names', [key])]
+    rng = random.Random(seed)
+    while len(pairs) < size:
+        name = ' '.join(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3)))
+                        for _ in range(rng.randint(1, 2)))
+        pairs.append((name, f"app{len(pairs)}"))
+    return pairs
+
+
+def garble(alias, rng):
+    """One realistic mistake: a dropped, swapped or substituted letter, or a split/merged word"""
+    chars = list(alias)
+    kind = rng.randrange(4)
+    i = rng.randrange(len(chars))
+    if kind == 0 and len(chars) > 4:
+        del chars[i]
+    elif kind == 1 and i + 1 < len(chars):
+        chars[i], chars[i + 1] = chars[i + 1], chars[i]
+    elif kind == 2:
+        chars[i] = rng.choice(LETTERS)
+    elif ' ' in alias:
+        return alias.replace(' ', '', 1)
+    else:
+        chars.insert(max(1, i), ' ')
+    return ''.join(chars)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', default='100,1000,5000,20000')
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--budget-ms', type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"{'aliases':>8} {'build ms':>9} {'p50 us':>8} {'p99 us':>8} {'top-1 %':>8} {'closest %':>10} {'in budget':>10}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        pairs = aliases(size)
+        start = time.perf_counter()
+        matcher = FuzzyMatcher(pairs)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        rng = random.Random(size)
+        samples = []
+        hits = closest = 0
+        for alias, key in rng.choices([p for p in pairs if len(p[0]) >= 5], k=args.queries):
+            query = garble(alias, rng)
+            start = time.perf_counter()
+            best = matcher.best(query, budget_ms=args.budget_ms)
+            samples.append((time.perf_counter() - start) * 1e6)
+            # Several keys may share an alias; any owner of the same alias counts
+            if best and (best.payload == key or best.alias == alias):
+                hits += 1
+            if best and best.distance <= bounded_levenshtein(compact(query), compact(alias), best.distance):
+                closest += 1
+        p99 = percentile(samples, 99)
+        print(f"{len(matcher):>8} {build_ms:>9.1f} {percentile(samples, 50):>8.1f} {p99:>8.1f} "
+              f"{hits / len(samples) * 100:>8.1f} {closest / len(samples) * 100:>10.1f} {'yes' if p99 <= args.budget_ms * 1000 else 'NO':>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# bench_intent_routing.py - Per-command routing cost: legacy substring cascade vs IntentMatcher
+"""
+Usage: python benchmarks/bench_intent_routing.py [--commands N] [--repeat R]
+
+Only the routing decision is timed; no handler is executed. AICore parses
+each command once (parse_command) and routes on the ParsedCommand's
+tokens, which every handler reuses, so "matcher on parsed tokens" is the
+routing cost AICore pays. "matcher on raw text" tokenizes again with the
+matcher's own regex and is shown for comparison.
+
+Best of 20 runs over 5000 commands on a noisy 1-CPU Linux sandbox
+(Python 3.11); the spread between runs is shown:
+
+  legacy substring cascade       2.0 - 2.3 us/command
+  matcher on raw text            3.2 - 4.5 us/command  (the regex tokenizer dominates)
+  matcher on parsed tokens       1.7 - 1.8 us/command
+  parse_command + matcher        3.7 - 5.2 us/command  (the parse is shared with every handler)
+
+Routing on the shared tokens is about as fast as the cascade, not a big
+win. What the matcher buys is correctness: the cascade matches words inside
+words ("restart" contains "start", "unlock" contains "lock"), and the
+routing differences list below shows those commands.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_core import INTENT_KEYWORDS  # noqa: E402
+from command_parser import parse_command  # noqa: E402
+from intent_matcher import IntentMatcher  # noqa: E402
+
+TEMPLATES = [
+    "open {app}", "please launch {app} for me", "can you start {app}", "run {app}",
+    "restart the computer", "put the system to sleep", "lock my screen now", "shutdown in a minute",
+    "create folder {word}", "list files", "delete the file {word}.txt", "copy {word} to backup",
+    "show battery status", "how much memory is free", "check disk usage", "show running processes",
+    "volume up", "mute the sound", "unmute", "google search for {word} {word}",
+    "open website {word}.com", "what time is it", "what is the date today", "weather in {word}",
+    "take a screenshot", "hello there", "thanks a lot", "tell me a joke about {word}",
+]
+APPS = ["chrome", "visual studio code", "firefox", "spotify", "discord", "notepad", "vlc media player"]
+WORDS = ["report", "holiday", "photos", "budget", "python", "music", "invoices", "kittens"]
+
+
+def legacy_route(user_input):
+    """The original AICore.process_command cascade"""
+    if any(k in user_input for k in ['open', 'launch', 'start', 'run']):
+        return 'app'
+    elif any(k in user_input for k in ['shutdown', 'restart', 'sleep', 'lock']):
+        return 'system_control'
+    elif any(k in user_input for k in ['file', 'folder', 'directory', 'create', 'delete', 'copy', 'move']):
+        return 'file'
+    elif any(k in user_input for k in ['battery', 'memory', 'disk', 'system', 'process', 'network']):
+        return 'system_info'
+    elif any(k in user_input for k in ['volume', 'sound', 'mute', 'unmute']):
+        return 'volume'
+    elif any(k in user_input for k in ['search', 'google', 'website', 'browse']):
+        return 'web'
+    elif any(k in user_input for k in ['time', 'date', 'clock']):
+        return 'time_date'
+    elif 'weather' in user_input:
+        return 'weather'
+    elif 'screenshot' in user_input:
+        return 'screenshot'
+    return None
+
+
+def build_corpus(count, seed=7):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        template = rng.choice(TEMPLATES)
+        text = template.replace("{app}", rng.choice(APPS), 1)
+        while "{word}" in text:
+            text = text.replace("{word}", rng.choice(WORDS), 1)
+        corpus.append(text)
+    return corpus
+
+
+def time_router(route, corpus, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in corpus:
+            route(text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(corpus) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--commands', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.commands)
+
+    start = time.perf_counter()
+    matcher = IntentMatcher(INTENT_KEYWORDS)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    parsed = [parse_command(text) for text in corpus]
+    legacy_us = time_router(legacy_route, corpus, args.repeat)
+    text_us = time_router(matcher.best, corpus, args.repeat)
+    tokens_us = time_router(lambda command: matcher.best(command.tokens), parsed, args.repeat)
+    parse_us = time_router(lambda text: matcher.best(parse_command(text).tokens), corpus, args.repeat)
+
+    disagreements = [t for t in corpus if legacy_route(t) != matcher.best(parse_command(t).tokens)]
+
+    print(f"Corpus: {len(corpus)} utterances, best of {args.repeat} runs")
+    print(f"IntentMatcher build:             {build_ms:8.3f} ms")
+    print(f"Legacy substring cascade:        {legacy_us:8.2f} us/command")
+    print(f"Matcher on raw text:             {text_us:8.2f} us/command")
+    print(f"Matcher on parsed tokens:        {tokens_us:8.2f} us/command")
+    print(f"parse_command + matcher:         {parse_us:8.2f} us/command")
+    print(f"Routing differences vs legacy:   {len(disagreements)}")
+    for text in sorted(set(disagreements))[:10]:
+        print(f"  {text!r}: legacy={legacy_route(text)} matcher={matcher.best(parse_command(text).tokens)}")
+
+
+if __name__ == "__main__":
+    main()
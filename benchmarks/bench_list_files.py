@@ -0,0 +1,73 @@
+# bench_list_files.py - list_files on a large directory: old listdir+isdir/isfile/getsize vs cached scandir
+"""
+Usage: python benchmarks/bench_list_files.py [--entries 100000]
+
+Creates a temporary directory with --entries empty files and times:
+
+  old         os.listdir + isdir/isfile/getsize per entry, string +=
+  cold        dir_listing read + sort + render one page
+  warm        the same call again (mtime check only, sorted view reused)
+  warm size   a different sort order on the cached entries
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dir_listing  # noqa: E402
+from dir_listing import DirectoryCache  # noqa: E402
+
+
+def old_listing(path):
+    files = os.listdir(path)
+    result = f"📁 **Files in {path}:**\n"
+    folders = [f for f in files if os.path.isdir(os.path.join(path, f))]
+    files_only = [f for f in files if os.path.isfile(os.path.join(path, f))]
+    for folder in sorted(folders):
+        result += f"📂 {folder}/\n"
+    for file in sorted(files_only):
+        size = os.path.getsize(os.path.join(path, file))
+        result += f"📄 {file} ({size} B)\n"
+    return result
+
+
+def new_listing(cache, path, sort='name', page_size=50):
+    entries = cache.listing(path, sort, reverse=sort != 'name')
+    lines = [f"📁 **Files in {path}**"]
+    lines.extend(f"📄 {entry.name} ({entry.size} B)" for entry in entries[:page_size])
+    return "\n".join(lines)
+
+
+def timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    func(*args, **kwargs)
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--entries', type=int, default=100_000)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix='tejas-list-')
+    try:
+        for i in range(args.entries):
+            open(os.path.join(root, f'file_{i:07d}.txt'), 'wb').close()
+        # The directory was written a moment ago; skip the racy-mtime guard so it gets cached
+        dir_listing.RACY_SECONDS = 0
+        cache = DirectoryCache()
+        print(f"{args.entries:,} entries")
+        print(f"old        {timed(old_listing, root):9.1f} ms")
+        print(f"cold       {timed(new_listing, cache, root):9.1f} ms")
+        print(f"warm       {timed(new_listing, cache, root):9.1f} ms")
+        print(f"warm size  {timed(new_listing, cache, root, 'size'):9.1f} ms")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
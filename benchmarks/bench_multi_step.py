@@ -0,0 +1,51 @@
+# bench_multi_step.py - Wall time of compound commands: planner vs running steps one after another
+"""
+Usage: python benchmarks/bench_multi_step.py [--step-ms 200]
+
+Each step's handler is simulated with a fixed sleep so the numbers show the
+scheduling rather than the machine. Compound commands are planned with the
+real router. The script prints the steps and dependency edges, the
+sequential time (sum of steps) and the planner's wall time, which should
+track the longest dependency chain.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_core import predict_intent  # noqa: E402
+from command_planner import plan_steps, run_steps  # noqa: E402
+
+COMMANDS = [
+    "take a screenshot and show memory usage and open chrome",
+    "open chrome, check disk usage; then mute the volume",
+    "create folder reports then move notes.txt into it and show battery",
+    "search for salt and pepper",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--step-ms', type=float, default=200.0)
+    args = parser.parse_args()
+
+    def run_step(step):
+        time.sleep(args.step_ms / 1000)
+        return step.intent
+
+    for text in COMMANDS:
+        steps = plan_steps(text, predict_intent)
+        start = time.perf_counter()
+        run_steps(steps, run_step)
+        wall_ms = (time.perf_counter() - start) * 1000
+        print(f"{text!r}")
+        for step in steps:
+            after = f" after {sorted(i + 1 for i in step.depends_on)}" if step.depends_on else ""
+            print(f"    {step.index + 1}. [{step.intent}] {step.text}{after}")
+        print(f"    sequential {len(steps) * args.step_ms:.0f} ms, planned {wall_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
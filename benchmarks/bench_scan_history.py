@@ -0,0 +1,70 @@
+# bench_scan_history.py - Saving and diffing large scan snapshots
+"""
+Usage: python benchmarks/bench_scan_history.py [--entries 1000000] [--changed-percent 1]
+
+Saves two synthetic snapshots of --entries folders into a temporary
+database, the second with --changed-percent of the sizes changed and a few
+folders added and removed, then times:
+
+  record      ScanHistory.record for each snapshot
+  diff        ScanHistory.diff (sort-merge join of the two snapshots)
+
+and prints the peak Python memory of a second, traced diff run.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scan_history import ScanHistory  # noqa: E402
+
+
+def synthetic_rows(entries, seed, changed_percent=0.0):
+    rng = random.Random(seed)
+    changed = rng.random
+    for i in range(entries):
+        size = (i * 7919) % 10_000_000
+        if changed() * 100 < changed_percent:
+            size += rng.randint(-size, 50_000_000)
+        yield f"/data/d{i // 1000:05d}/sub{i % 1000:03d}", size, i
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--entries', type=int, default=1_000_000)
+    parser.add_argument('--changed-percent', type=float, default=1.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='tejas-history-') as directory:
+        history = ScanHistory(os.path.join(directory, 'history.sqlite3'))
+        started = time.perf_counter()
+        old = history.record('/data', synthetic_rows(args.entries, 1), taken_at=1.0)
+        print(f"record 1  {time.perf_counter() - started:7.2f}s  ({old.entries:,} folders)")
+        started = time.perf_counter()
+        rows = list(synthetic_rows(args.entries, 2, args.changed_percent))
+        rows = rows[100:] + [(f"/data/new/n{i}", 1_000_000 * i, 0) for i in range(100)]
+        new = history.record('/data', rows, taken_at=2.0)
+        print(f"record 2  {time.perf_counter() - started:7.2f}s  ({new.entries:,} folders)")
+        del rows
+
+        started = time.perf_counter()
+        diff = history.diff(old.id, new.id, limit=20)
+        elapsed = time.perf_counter() - started
+        # Memory is measured on a second run, since tracemalloc slows everything down
+        tracemalloc.start()
+        history.diff(old.id, new.id, limit=20)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"diff      {elapsed:7.2f}s  ({diff.grown:,} grew, {diff.shrunk:,} shrank, "
+              f"peak {peak / 1024 / 1024:.1f} MB)")
+        for change in diff.changes[:5]:
+            print(f"  +{(change.new_size - change.old_size) / 1024 / 1024:8.1f} MB  {change.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# bench_tree_walker.py - os.walk + getsize vs the parallel scandir walker on a synthetic tree
+"""
+Usage: python benchmarks/bench_tree_walker.py [--files 1000000] [--per-dir 100] [--root DIR] [--keep]
+
+Builds a tree of empty files (depth 3, --per-dir files per leaf directory)
+in a temporary directory, or reuses --root if it already holds one, then
+times three full scans that each collect (size, path) for every file:
+
+  os.walk      os.walk plus os.path.getsize per file (the old storage scan)
+  walk 1       tree_walker.walk_files with a single worker (scandir stat reuse only)
+  walk N       tree_walker.walk_files with the default worker pool
+
+Run it twice, or drop the page cache in between, to see warm and cold
+numbers.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tree_walker import DEFAULT_WORKERS, walk_files  # noqa: E402
+
+
+def build_tree(root, files, per_dir):
+    """Create files empty files spread over a 3-level directory tree"""
+    marker = os.path.join(root, f'.tree-{files}-{per_dir}')
+    if os.path.exists(marker):
+        return
+    leaves = max(1, files // per_dir)
+    fanout = max(2, round(leaves ** (1 / 3)) + 1)
+    created = 0
+    started = time.perf_counter()
+    for leaf in range(leaves):
+        a, b, c = leaf // (fanout * fanout), (leaf // fanout) % fanout, leaf % fanout
+        directory = os.path.join(root, f'd{a}', f'd{b}', f'd{c}')
+        os.makedirs(directory, exist_ok=True)
+        for i in range(min(per_dir, files - created)):
+            open(os.path.join(directory, f'file_{i}.dat'), 'wb').close()
+        created += per_dir
+    open(marker, 'wb').close()
+    print(f"built {files:,} files in {leaves:,} directories in {time.perf_counter() - started:.1f}s")
+
+
+def scan_os_walk(root):
+    found = []
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            try:
+                found.append((os.path.getsize(path), path))
+            except OSError:
+                continue
+    return found
+
+
+def scan_walker(root, workers):
+    return [(st.st_size, path) for path, st in walk_files(root, workers=workers)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--files', type=int, default=1_000_000)
+    parser.add_argument('--per-dir', type=int, default=100)
+    parser.add_argument('--root', help="directory to build the tree in (default: a temporary one)")
+    parser.add_argument('--keep', action='store_true', help="do not delete the temporary tree")
+    args = parser.parse_args()
+
+    root = args.root or tempfile.mkdtemp(prefix='tejas-walk-')
+    os.makedirs(root, exist_ok=True)
+    try:
+        build_tree(root, args.files, args.per_dir)
+        runs = [('os.walk', lambda: scan_os_walk(root)),
+                ('walk 1', lambda: scan_walker(root, 1)),
+                (f'walk {DEFAULT_WORKERS}', lambda: scan_walker(root, DEFAULT_WORKERS))]
+        baseline = None
+        for label, scan in runs:
+            started = time.perf_counter()
+            count = len(scan())
+            elapsed = time.perf_counter() - started
+            baseline = baseline or elapsed
+            print(f"{label:<10} {count:>10,} files  {elapsed:7.2f}s  {count / elapsed:>12,.0f} files/s  "
+                  f"x{baseline / elapsed:.1f}")
+    finally:
+        if not args.root and not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# intent_classifier_report.py - Accuracy and latency report for the intent classifier
+"""
+Usage: python benchmarks/intent_classifier_report.py [--folds K] [--threshold T]
+
+Accuracy is measured with stratified K-fold cross-validation on the bundled
+corpus; latency is measured with the shipped model (data/intent_model.npz).
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from intent_classifier import IntentClassifier, load_corpus, MODEL_PATH  # noqa: E402
+
+
+def stratified_folds(labels, folds, seed=11):
+    by_label = defaultdict(list)
+    for i, label in enumerate(labels):
+        by_label[label].append(i)
+    rng = random.Random(seed)
+    assignment = [0] * len(labels)
+    for indices in by_label.values():
+        rng.shuffle(indices)
+        for position, i in enumerate(indices):
+            assignment[i] = position % folds
+    return assignment
+
+
+def cross_validate(labels, texts, folds, threshold):
+    assignment = stratified_folds(labels, folds)
+    correct = confident = confident_correct = 0
+    confusion = defaultdict(int)
+    for fold in range(folds):
+        train = [i for i in range(len(texts)) if assignment[i] != fold]
+        test = [i for i in range(len(texts)) if assignment[i] == fold]
+        model = IntentClassifier.train([labels[i] for i in train], [texts[i] for i in train])
+        for i, (predicted, confidence) in zip(test, model.predict([texts[i] for i in test])):
+            correct += predicted == labels[i]
+            if predicted != labels[i]:
+                confusion[(labels[i], predicted)] += 1
+            if confidence >= threshold:
+                confident += 1
+                confident_correct += predicted == labels[i]
+    return correct, confident, confident_correct, confusion
+
+
+def measure_latency(model, texts, repeat=2000):
+    samples = []
+    for i in range(repeat):
+        text = texts[i % len(texts)]
+        start = time.perf_counter()
+        model.classify(text)
+        samples.append(time.perf_counter() - start)
+    samples = np.array(samples) * 1e6
+    start = time.perf_counter()
+    model.predict(texts)
+    batch_us = (time.perf_counter() - start) / len(texts) * 1e6
+    return np.percentile(samples, 50), np.percentile(samples, 99), batch_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--threshold', type=float, default=0.5)
+    args = parser.parse_args()
+
+    labels, texts = load_corpus()
+    correct, confident, confident_correct, confusion = cross_validate(labels, texts, args.folds, args.threshold)
+    n = len(texts)
+    print(f"Corpus: {n} utterances, {len(set(labels))} intents, {args.folds}-fold cross-validation")
+    print(f"Accuracy:                       {correct / n:.1%}")
+    print(f"Coverage at confidence >= {args.threshold}: {confident / n:.1%} "
+          f"(accuracy {confident_correct / max(confident, 1):.1%}, rest falls back to keywords)")
+    if confusion:
+        print("Most common confusions (true -> predicted):")
+        for (true, predicted), count in sorted(confusion.items(), key=lambda item: -item[1])[:8]:
+            print(f"  {true:>15} -> {predicted:<15} {count}")
+
+    model = IntentClassifier.load(MODEL_PATH)
+    p50, p99, batch_us = measure_latency(model, texts)
+    print(f"Model: {MODEL_PATH} ({os.path.getsize(MODEL_PATH) / 1024:.1f} KB)")
+    print(f"Single utterance latency:       p50 {p50:.1f} us, p99 {p99:.1f} us")
+    print(f"Batched inference ({n} texts): {batch_us:.1f} us/utterance")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# stress_sessions.py - Concurrent commands against one shared AICore, checking history integrity
+"""
+Usage: python benchmarks/stress_sessions.py [--threads 16] [--sessions 4] [--commands 300]
+
+Worker threads send commands through a single AICore. Each thread uses one
+of several sessions, and some use the default session. Every command
+carries a unique nonce word ("open qqz3x41") that the reply echoes back.
+When the run ends, every session's in-memory history (a ring buffer of the
+most recent turns) and its rows in the on-disk HistoryLog must hold only
+commands sent to that session. Each response must mention that entry's own
+nonce and no other, and the log must contain every command exactly once.
+Exits non-zero on any violation.
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_core import AICore  # noqa: E402
+from history_log import HistoryLog  # noqa: E402
+
+NONCE_RE = re.compile(r'qqz\d+x\d+')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--sessions', type=int, default=4)
+    parser.add_argument('--commands', type=int, default=300, help='commands per thread')
+    args = parser.parse_args()
+
+    log_dir = tempfile.TemporaryDirectory()
+    core = AICore(history_log=HistoryLog(os.path.join(log_dir.name, 'history.sqlite3')))
+    # Nonce names never match a real app, but make sure nothing can be launched
+    core._open_application = lambda app_info: False
+    core._launch_installed = lambda installed: False
+    core.app_index.ready.wait(30)
+
+    sessions = [core.new_session() for _ in range(args.sessions)] + [core.default_session]
+    sent = defaultdict(set)
+    reply_errors = []
+    start_barrier = threading.Barrier(args.threads)
+
+    def worker(thread_no):
+        session = sessions[thread_no % len(sessions)]
+        use_default = session is core.default_session
+        start_barrier.wait()
+        for i in range(args.commands):
+            text = f"open qqz{thread_no}x{i}"
+            sent[session.id].add(text)
+            if use_default:
+                reply = core.process_command(text)
+            else:
+                reply = core.process_command(text, session=session)
+            if NONCE_RE.findall(reply) != [f"qqz{thread_no}x{i}"]:
+                reply_errors.append((text, reply))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(args.threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    core.history_log.flush()
+    problems = list(reply_errors)
+    for session in sessions:
+        expected = sent[session.id]
+        users = [entry['user'] for entry in session.history]
+        if len(users) != min(len(expected), session.history.maxlen) or not set(users) <= expected:
+            problems.append((session.id, f"{len(users)} buffered entries for {len(expected)} commands"))
+        logged = core.history_log.recent(session.id, len(expected) + 1)
+        if sorted(row['user'] for row in logged) != sorted(expected):
+            problems.append((session.id, f"{len(logged)} logged turns for {len(expected)} commands"))
+        for entry in list(session.history) + logged:
+            if entry['response'] is None or NONCE_RE.findall(entry['response']) != NONCE_RE.findall(entry['user']):
+                problems.append((session.id, entry))
+
+    total = args.threads * args.commands
+    print(f"{total} commands on {args.threads} threads, {len(sessions)} sessions: "
+          f"{elapsed:.2f}s ({total / elapsed:,.0f} commands/s)")
+    if problems:
+        print(f"❌ {len(problems)} integrity problems, first few:")
+        for problem in problems[:5]:
+            print("   ", problem)
+        sys.exit(1)
+    print("✅ Every history entry holds its own response; no logged turns lost or duplicated")
+    core.history_log.close()
+    log_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
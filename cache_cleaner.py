@@ -0,0 +1,221 @@
+# cache_cleaner.py - Registry of temp/cache locations, dry-run estimates and parallel cleanup
+"""
+default_locations() lists the places that only hold disposable data on
+this platform: the temp directory, the user cache directory, browser
+caches and Python bytecode (__pycache__) trees. Only the ones that exist
+are returned.
+
+scan() is a dry run. It reports how many files and bytes each location
+would free. clean() deletes those files with a thread pool and reports
+the bytes actually freed, counting only unlinks that succeeded. Both take
+min_age_days: a file is only eligible if it has been neither modified
+nor read for that long, which keeps files in use by running programs out
+of reach. Each file is stat'ed again right before it is unlinked, so a
+file used since the scan is left alone.
+
+Locations nested inside another one (a browser cache under ~/.cache) are
+excluded from the outer location's walk, so every file is counted once,
+under its most specific location. Tejas' own folder and its trash folders
+are never entered. Empty folders left behind are removed; the location
+folders themselves are kept.
+"""
+import glob
+import os
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from file_search import format_size
+from task_context import current_task
+from trash import trash_folder_name
+from tree_walker import EXCLUDED_NAMES, walk
+from user_paths import USER_DIR
+
+DEFAULT_MIN_AGE_DAYS = 1
+UNLINK_BATCH = 256
+UNLINK_WORKERS = 8
+
+# kind 'contents': everything below path; kind 'pycache': __pycache__ folders anywhere below path
+CacheLocation = namedtuple('CacheLocation', ['name', 'path', 'kind'])
+LocationReport = namedtuple('LocationReport', ['location', 'files', 'bytes', 'failed'])
+
+
+def _browser_caches(home):
+    if sys.platform == 'win32':
+        local = os.getenv('LOCALAPPDATA', os.path.join(home, 'AppData', 'Local'))
+        patterns = {
+            'Chrome cache': os.path.join(local, 'Google', 'Chrome', 'User Data', '*', 'Cache'),
+            'Edge cache': os.path.join(local, 'Microsoft', 'Edge', 'User Data', '*', 'Cache'),
+            'Brave cache': os.path.join(local, 'BraveSoftware', 'Brave-Browser', 'User Data', '*', 'Cache'),
+            'Firefox cache': os.path.join(local, 'Mozilla', 'Firefox', 'Profiles', '*', 'cache2'),
+        }
+    elif sys.platform == 'darwin':
+        caches = os.path.join(home, 'Library', 'Caches')
+        patterns = {
+            'Chrome cache': os.path.join(caches, 'Google', 'Chrome'),
+            'Safari cache': os.path.join(caches, 'com.apple.Safari'),
+            'Firefox cache': os.path.join(caches, 'Firefox', 'Profiles', '*', 'cache2'),
+        }
+    else:
+        caches = os.getenv('XDG_CACHE_HOME') or os.path.join(home, '.cache')
+        patterns = {
+            'Chrome cache': os.path.join(caches, 'google-chrome'),
+            'Chromium cache': os.path.join(caches, 'chromium'),
+            'Brave cache': os.path.join(caches, 'BraveSoftware'),
+            'Firefox cache': os.path.join(caches, 'mozilla', 'firefox', '*', 'cache2'),
+        }
+    return [CacheLocation(name, path, 'contents') for name, pattern in patterns.items()
+            for path in sorted(glob.glob(pattern))]
+
+
+def default_locations():
+    """Cache locations that exist on this machine"""
+    home = os.path.expanduser('~')
+    if sys.platform == 'win32':
+        local = os.getenv('LOCALAPPDATA', os.path.join(home, 'AppData', 'Local'))
+        user_cache = os.path.join(local, 'Microsoft', 'Windows', 'INetCache')
+    elif sys.platform == 'darwin':
+        user_cache = os.path.join(home, 'Library', 'Caches')
+    else:
+        user_cache = os.getenv('XDG_CACHE_HOME') or os.path.join(home, '.cache')
+    locations = [CacheLocation('Temporary files', tempfile.gettempdir(), 'contents'),
+                 CacheLocation('User cache', user_cache, 'contents')]
+    locations += _browser_caches(home)
+    locations.append(CacheLocation('Python bytecode', home, 'pycache'))
+    seen = set()
+    existing = []
+    for location in locations:
+        key = (os.path.normcase(os.path.realpath(location.path)), location.kind)
+        if key not in seen and os.path.isdir(location.path):
+            seen.add(key)
+            existing.append(location)
+    return existing
+
+
+def _skipped(location, locations):
+    """What location's walk leaves out: nested 'contents' locations, Tejas' own files and trash folders"""
+    prefix = os.path.join(os.path.abspath(location.path), '')
+    nested = [os.path.abspath(other.path) for other in locations
+              if other is not location and other.kind == 'contents' and os.path.abspath(other.path).startswith(prefix)]
+    return nested + [os.path.abspath(USER_DIR), trash_folder_name()]
+
+
+def _eligible(location, locations, cutoff, folders):
+    """Yield (file path, size) for files in location unused since cutoff; old folders go into folders"""
+    pycache = location.kind == 'pycache'
+    # A pycache search has to enter __pycache__ folders, which walks normally skip
+    names = EXCLUDED_NAMES - {'__pycache__'} if pycache else ()
+    for entry in walk(location.path, _skipped(location, locations), stat=True, dirs=True, excluded_names=names):
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                # Judged before cleaning: deleting a folder's files makes its mtime current
+                if (not pycache or entry.name == '__pycache__') and entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                    folders.append(entry.path)
+                continue
+            if pycache and os.path.basename(os.path.dirname(entry.path)) != '__pycache__':
+                continue
+            st = entry.stat(follow_symlinks=False)
+        except OSError:
+            continue
+        if max(st.st_mtime, st.st_atime) < cutoff:
+            yield entry.path, st.st_size
+
+
+def _unlink_batch(batch, cutoff):
+    """(files, bytes) actually freed from batch, skipping files used since cutoff"""
+    freed = count = 0
+    for path in batch:
+        try:
+            st = os.lstat(path)
+            if max(st.st_mtime, st.st_atime) >= cutoff:
+                continue
+            os.unlink(path)
+        except OSError:
+            continue
+        freed += st.st_size
+        count += 1
+    return count, freed
+
+
+def _remove_empty(folders):
+    # Deepest first, so a folder emptied by removing its children goes too
+    for folder in sorted(folders, key=len, reverse=True):
+        try:
+            os.rmdir(folder)
+        except OSError:
+            continue
+
+
+def scan(locations=None, min_age_days=DEFAULT_MIN_AGE_DAYS, now=None):
+    """Dry run: a LocationReport per location with what clean() would free"""
+    task = current_task()
+    locations = default_locations() if locations is None else locations
+    cutoff = (now or time.time()) - min_age_days * 86400
+    reports = []
+    for location in locations:
+        task.report(f"🧹 Measuring {location.name}...")
+        files = total = 0
+        for files, (_, size) in enumerate(_eligible(location, locations, cutoff, []), 1):
+            total += size
+            if files % UNLINK_BATCH == 0:
+                task.check()
+        reports.append(LocationReport(location, files, total, 0))
+    return reports
+
+
+def clean(locations=None, min_age_days=DEFAULT_MIN_AGE_DAYS, workers=UNLINK_WORKERS, now=None):
+    """Delete eligible files in every location; a LocationReport per location with what was freed"""
+    task = current_task()
+    locations = default_locations() if locations is None else locations
+    cutoff = (now or time.time()) - min_age_days * 86400
+    reports = []
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='clean') as pool:
+        for location in locations:
+            task.report(f"🧹 Cleaning {location.name}...")
+            folders, futures, batch = [], [], []
+            eligible = 0
+            # Batches are unlinked while the walk goes on
+            for path, _ in _eligible(location, locations, cutoff, folders):
+                batch.append(path)
+                if len(batch) == UNLINK_BATCH:
+                    task.check()
+                    futures.append(pool.submit(_unlink_batch, batch, cutoff))
+                    eligible += len(batch)
+                    batch = []
+            if batch:
+                futures.append(pool.submit(_unlink_batch, batch, cutoff))
+                eligible += len(batch)
+            count = freed = 0
+            for future in futures:
+                batch_count, batch_bytes = future.result()
+                count += batch_count
+                freed += batch_bytes
+            _remove_empty(folders)
+            task.report(f"🧹 {location.name}: {format_size(freed)} freed")
+            reports.append(LocationReport(location, count, freed, eligible - count))
+    return reports
+
+
+def format_report(reports, dry_run=False):
+    """Chat-style summary of scan() or clean() results"""
+    total = sum(report.bytes for report in reports)
+    files = sum(report.files for report in reports)
+    if dry_run:
+        lines = [f"🧹 **{format_size(total)} can be freed** ({files:,} files):"]
+    else:
+        lines = [f"🧹 **Freed {format_size(total)}** ({files:,} files deleted):"]
+    for report in sorted(reports, key=lambda report: report.bytes, reverse=True):
+        if not report.files and not report.failed:
+            continue
+        line = f"• {report.location.name}: {format_size(report.bytes)} ({report.files:,} files) — {report.location.path}"
+        if report.failed:
+            line += f" ⚠️ {report.failed:,} in use or protected, skipped"
+        lines.append(line)
+    empty = [report.location.name for report in reports if not report.files and not report.failed]
+    if empty:
+        lines.append(f"✅ Nothing to clean in: {', '.join(empty)}")
+    if not reports:
+        lines.append("• No cache locations found")
+    return "\n".join(lines)
@@ -0,0 +1,112 @@
+# command_parser.py - Tokenize a command once and share the result with every handler
+import re
+from collections import namedtuple
+
+APP_STOP_WORDS = frozenset(['open', 'launch', 'start', 'run', 'restart', 'relaunch', 'reopen', 'please', 'can',
+                            'you', 'the', 'app', 'application'])
+SEARCH_STOP_WORDS = frozenset(['google', 'search', 'for', 'please', 'can', 'you'])
+FOLDER_MARKERS = frozenset(['folder', 'directory'])
+FILE_NAME_MARKERS = frozenset(['named', 'called', 'matching'])
+
+_STRIP_CHARS = ".,!?;:\"'()[]{}"
+_QUANTITY_RE = re.compile(r"^(\d+(?:\.\d+)?)([a-z%]*)$")
+_PATH_STARTS = frozenset('/~.\\')
+_UNIT_WORDS = frozenset(['b', 'kb', 'mb', 'gb', 'tb', 'bytes', 'percent', '%', 'seconds', 'minutes',
+                         'hours', 'days', 'weeks', 'months', 'years'])
+_ENTITY_HINT_RE = re.compile(r"[0-9./\\~]")
+
+
+class ParsedCommand(namedtuple('_ParsedCommand', ['raw', 'text', 'tokens', 'path', 'url', 'quantity'])):
+    """Immutable, tokenized view of a user command.
+
+    ``tokens`` are the lowercased words with surrounding punctuation removed and
+    ``spans`` are their (start, end) offsets into ``text``. Entities that could
+    be detected are exposed as ``app``, ``path``, ``url``, ``query`` and
+    ``quantity`` (a ``(value, unit)`` tuple); missing ones are None. ``spans``,
+    ``app`` and ``query`` are derived from the tokens when accessed.
+    """
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return f"ParsedCommand({self.text!r}, app={self.app!r}, path={self.path!r}, url={self.url!r}, quantity={self.quantity!r})"
+
+    def __contains__(self, phrase):
+        """Substring test against the normalized text, mirroring `phrase in user_input`"""
+        return phrase in self.text
+
+    @property
+    def spans(self):
+        """(start, end) offsets of each token in ``text``"""
+        spans = []
+        position = 0
+        for token in self.tokens:
+            start = self.text.find(token, position)
+            position = start + len(token)
+            spans.append((start, position))
+        return tuple(spans)
+
+    @property
+    def app(self):
+        """Application name: the command with launch verbs and filler words removed"""
+        return ' '.join([t for t in self.tokens if t not in APP_STOP_WORDS]) or None
+
+    @property
+    def query(self):
+        """Search query: the command with search verbs and filler words removed"""
+        return ' '.join([t for t in self.tokens if t not in SEARCH_STOP_WORDS]) or None
+
+    def has_token(self, *words):
+        """True if any of the given words appears as a whole token"""
+        return any(word in self.tokens for word in words)
+
+    def words_after(self, markers):
+        """Return the text after the first token found in `markers`, or None"""
+        tokens = self.tokens
+        for i, token in enumerate(tokens):
+            if token in markers and i + 1 < len(tokens):
+                return self.text[self.spans[i + 1][0]:]
+        return None
+
+
+def _looks_like_path(word):
+    if '://' in word or word.startswith('www.'):
+        return False
+    return (word.startswith(('/', '~', './', '../', '\\'))
+            or '\\' in word
+            or (len(word) > 2 and word[1] == ':' and word[2] in '/\\'))
+
+
+def command_tokens(text):
+    """Tokens of text exactly as parse_command produces them (phrase indexes must tokenize their aliases the same way)"""
+    tokens = [word.strip(_STRIP_CHARS) for word in text.lower().split()]
+    if '' in tokens:
+        tokens = [token for token in tokens if token]
+    return tokens
+
+
+def parse_command(user_input):
+    """Tokenize user input once and detect path, URL and quantity entities in the same pass"""
+    text = user_input.lower().strip()
+    tokens = command_tokens(text)
+    path = url = quantity = None
+    if not _ENTITY_HINT_RE.search(text):
+        return ParsedCommand(user_input, text, tuple(tokens), None, None, None)
+    for i, token in enumerate(tokens):
+        first = token[0]
+        if quantity is None and first.isdigit():
+            number = _QUANTITY_RE.match(token)
+            if number:
+                unit = number.group(2) or None
+                if unit is None and i + 1 < len(tokens) and tokens[i + 1] in _UNIT_WORDS:
+                    # Bare number: take the following token as its unit
+                    unit = tokens[i + 1]
+                quantity = (float(number.group(1)), unit)
+                continue
+        if first in _PATH_STARTS or '/' in token or '\\' in token:
+            if path is None and _looks_like_path(token):
+                path = token
+                continue
+        if url is None and '.' in token and first != '.':
+            url = token
+    return ParsedCommand(user_input, text, tuple(tokens), path, url, quantity)
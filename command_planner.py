@@ -0,0 +1,105 @@
+# command_planner.py - Split compound commands into steps and run independent steps concurrently
+"""
+"take a screenshot and show memory usage and open chrome" becomes three
+steps. A conjunction only starts a new step when the words after it route to
+a command intent on their own, so "search for salt and pepper" stays one
+step.
+
+Ordering edges:
+  * "then" / "after that", or a back-reference ("move it", "open that"),
+    makes a step wait for the step before it
+  * steps that change state (files, volume) keep their relative order
+  * system control (shutdown, restart, lock, ...) waits for everything
+    before it, and everything after waits for it
+
+Independent steps are submitted to a shared thread pool as soon as their
+dependencies finish. The caller gets all responses when the slowest step
+finishes, not after the sum of their latencies.
+"""
+import re
+import threading
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+Step = namedtuple('Step', ['index', 'text', 'intent', 'depends_on'])
+
+# Intents whose steps mutate state and must run in the order they were spoken
+STATEFUL_INTENTS = frozenset({'file', 'volume'})
+BARRIER_INTENTS = frozenset({'system_control'})
+
+_SEPARATOR_RE = re.compile(
+    r'(\s*[,;]\s*(?:and\s+)?(?:then\s+)?|\s+and\s+then\s+|\s+after\s+that\s+|\s+then\s+|\s+and\s+|\s+also\s+)',
+    re.IGNORECASE)
+_SEQUENTIAL_RE = re.compile(r'\bthen\b|\bafter\b', re.IGNORECASE)
+_BACK_REFERENCE_RE = re.compile(r'\b(?:it|that|them|there|those)\b', re.IGNORECASE)
+_SPLIT_HINTS = frozenset(['and', 'then', 'also'])
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def might_be_compound(command):
+    """Cheap pre-check on a ParsedCommand before running the planner"""
+    return ',' in command.text or ';' in command.text or not _SPLIT_HINTS.isdisjoint(command.tokens)
+
+
+def plan_steps(text, predict_intent):
+    """Split text into Steps; predict_intent(text) -> intent name ('conversation' if none)"""
+    parts = _SEPARATOR_RE.split(text.strip())
+    segments = [[parts[0], predict_intent(parts[0]) if parts[0].strip() else 'conversation', False]]
+    for i in range(1, len(parts), 2):
+        separator, segment = parts[i], parts[i + 1]
+        intent = predict_intent(segment) if segment.strip() else 'conversation'
+        if intent != 'conversation' and segments[-1][0].strip():
+            segments.append([segment, intent, bool(_SEQUENTIAL_RE.search(separator))])
+        else:
+            # Not a command of its own ("salt and pepper"): keep it inside the current step
+            segments[-1][0] += separator + segment
+    if len(segments) == 1:
+        return [Step(0, text.strip(), segments[0][1], frozenset())]
+
+    steps = []
+    for index, (segment, _, sequential) in enumerate(segments):
+        # Re-predict: merged text ("search for salt and pepper") may route differently than its first part
+        intent = predict_intent(segment)
+        depends_on = set()
+        if index and (sequential or _BACK_REFERENCE_RE.search(segment)):
+            depends_on.add(index - 1)
+        for earlier in steps:
+            if earlier.intent in BARRIER_INTENTS or intent in BARRIER_INTENTS:
+                depends_on.add(earlier.index)
+            elif intent in STATEFUL_INTENTS and earlier.intent in STATEFUL_INTENTS:
+                depends_on.add(earlier.index)
+        steps.append(Step(index, segment.strip(), intent, frozenset(depends_on)))
+    return steps
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='step')
+        return _executor
+
+
+def run_steps(steps, run_step):
+    """Run run_step(step) for every step, respecting dependencies; returns responses in step order.
+
+    Steps are only submitted once their dependencies are done, so pool
+    threads never wait on each other. Exceptions from a step (including
+    TaskCancelled) are re-raised here once it finishes.
+    """
+    executor = _get_executor()
+    results = {}
+    pending = {}
+    waiting = list(steps)
+    while waiting or pending:
+        ready = [step for step in waiting if step.depends_on <= results.keys()]
+        for step in ready:
+            waiting.remove(step)
+            pending[executor.submit(run_step, step)] = step
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            step = pending.pop(future)
+            results[step.index] = future.result()
+    return [results[step.index] for step in steps]
@@ -0,0 +1,268 @@
+# copy_engine.py - File and folder copies with kernel-side copying, parallel small files and progress
+"""
+copy() and move() behave like shutil.copy2 / copytree / move, but:
+
+* File data is copied inside the kernel with os.copy_file_range (Linux,
+  which can reflink on Btrfs/XFS) or os.sendfile. When neither works for
+  a file, a chunked copy with a 1 MiB buffer is used. The method is chosen
+  per file, and a file falls back mid-way if the kernel refuses.
+* Folder copies list the tree once, create the directories, then copy the
+  files on a thread pool. Many small files no longer wait on each other's
+  open/close/metadata round trips.
+* Progress (bytes, percentage, throughput, ETA) goes to the current task
+  between chunks, and cancellation is checked at the same points. A file
+  that was being written when the copy is cancelled is removed.
+
+Symlinks inside a copied tree are recreated as symlinks (like
+copytree(symlinks=True)), so a link loop cannot make a copy run forever.
+"""
+import errno
+import os
+import shutil
+import stat as stat_module
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+
+from file_search import format_size
+from task_context import current_task
+
+KERNEL_CHUNK = 8 * 1024 * 1024  # bytes per copy_file_range / sendfile call (a progress step)
+BUFFER_SIZE = 1024 * 1024
+DEFAULT_WORKERS = 8
+BATCH_FILES = 64  # small files handed to a worker at a time (one pool task per file costs more than the copy)
+
+# errnos meaning "this copy method does not work for these two files", not "the copy failed"
+_FALLBACK_ERRNOS = frozenset(filter(None, [errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP,
+                                           getattr(errno, 'ENOTSUP', None), errno.EBADF, errno.EPERM,
+                                           getattr(errno, 'ENOTSOCK', None)]))
+
+CopyResult = namedtuple('CopyResult', ['files', 'bytes', 'seconds'])
+
+
+class _Unsupported(Exception):
+    def __init__(self, offset):
+        super().__init__(offset)
+        self.offset = offset
+
+
+class CopyProgress:
+    """Thread-safe byte counter that reports rate and ETA to a task and checks for cancellation"""
+
+    def __init__(self, task, total_bytes, label):
+        self.task = task
+        self.total = total_bytes
+        self.label = label
+        self.done = 0
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def advance(self, count):
+        with self._lock:
+            self.done += count
+        self.task.check()
+        if self.task.progress is not None:
+            self.task.report(self.status())
+
+    def status(self):
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        rate = self.done / elapsed
+        percent = self.done * 100 // self.total if self.total else 100
+        eta = f", ETA {(self.total - self.done) / rate:.0f}s" if rate and self.done < self.total else ""
+        return (f"📋 {self.label}: {format_size(self.done)} of {format_size(self.total)} ({percent}%), "
+                f"{format_size(rate)}/s{eta}")
+
+
+def _copy_range(src_fd, dst_fd, offset, size, advance):
+    while True:
+        try:
+            copied = os.copy_file_range(src_fd, dst_fd, KERNEL_CHUNK)
+        except OSError as e:
+            if e.errno in _FALLBACK_ERRNOS:
+                raise _Unsupported(offset)
+            raise
+        if not copied:
+            if offset == 0 and size:
+                # Some filesystems report 0 instead of an error for files they cannot handle
+                raise _Unsupported(offset)
+            return
+        offset += copied
+        advance(copied)
+
+
+def _send_file(src_fd, dst_fd, offset, size, advance):
+    while True:
+        try:
+            copied = os.sendfile(dst_fd, src_fd, offset, KERNEL_CHUNK)
+        except OSError as e:
+            if e.errno in _FALLBACK_ERRNOS:
+                raise _Unsupported(offset)
+            raise
+        if not copied:
+            if offset == 0 and size:
+                raise _Unsupported(offset)
+            return
+        offset += copied
+        advance(copied)
+
+
+def _copy_buffered(src_fd, dst_fd, offset, size, advance):
+    buffer = bytearray(BUFFER_SIZE)
+    view = memoryview(buffer)
+    # An unbuffered FileIO reads into the same buffer every time, on Windows too (os.readv is Unix-only)
+    with open(src_fd, 'rb', buffering=0, closefd=False) as source:
+        while True:
+            count = source.readinto(buffer)
+            if not count:
+                return
+            written = 0
+            while written < count:
+                written += os.write(dst_fd, view[written:count])
+            advance(count)
+
+
+_METHODS = [method for method, available in ((_copy_range, hasattr(os, 'copy_file_range')),
+                                             (_send_file, hasattr(os, 'sendfile') and os.name == 'posix'),
+                                             (_copy_buffered, True)) if available]
+
+
+def copy_data(source, destination, advance, size=None):
+    """Copy file contents and permissions/timestamps (like copy2), calling advance(bytes) per chunk"""
+    # Opening the destination truncates it, which would wipe a file copied onto itself
+    if os.path.exists(destination) and os.path.samefile(source, destination):
+        raise shutil.SameFileError(f"'{source}' and '{destination}' are the same file")
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    src_fd = os.open(source, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        if size is None:
+            size = os.fstat(src_fd).st_size
+        dst_fd = os.open(destination, flags, 0o666)
+        try:
+            offset = 0
+            for method in _METHODS:
+                # Every method works from the current positions; rewind to what has been copied
+                os.lseek(src_fd, offset, os.SEEK_SET)
+                os.lseek(dst_fd, offset, os.SEEK_SET)
+                try:
+                    method(src_fd, dst_fd, offset, size, advance)
+                    break
+                except _Unsupported as e:
+                    offset = e.offset
+        except BaseException:
+            os.close(dst_fd)
+            dst_fd = None
+            _remove_quietly(destination)
+            raise
+        finally:
+            if dst_fd is not None:
+                os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    shutil.copystat(source, destination)
+
+
+def _remove_quietly(path):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _plan_tree(source, destination):
+    """(directories, files, links) to create for a folder copy; files carry their size"""
+    directories = [(source, destination)]
+    files = []
+    links = []
+    stack = [(source, destination)]
+    while stack:
+        src_dir, dst_dir = stack.pop()
+        with os.scandir(src_dir) as entries:
+            for entry in entries:
+                target = os.path.join(dst_dir, entry.name)
+                if entry.is_symlink():
+                    links.append((entry.path, target))
+                elif entry.is_dir():
+                    directories.append((entry.path, target))
+                    stack.append((entry.path, target))
+                else:
+                    st = entry.stat()
+                    if stat_module.S_ISREG(st.st_mode):
+                        files.append((entry.path, target, st.st_size))
+    return directories, files, links
+
+
+def _batches(files):
+    """Group small files into pool tasks of up to BATCH_FILES files / KERNEL_CHUNK bytes"""
+    batch, batch_bytes = [], 0
+    for item in files:
+        batch.append(item)
+        batch_bytes += item[2]
+        if len(batch) >= BATCH_FILES or batch_bytes >= KERNEL_CHUNK:
+            yield batch
+            batch, batch_bytes = [], 0
+    if batch:
+        yield batch
+
+
+def _copy_batch(batch, advance):
+    for source, destination, size in batch:
+        copy_data(source, destination, advance, size)
+
+
+def copy(source, destination, workers=DEFAULT_WORKERS):
+    """Copy a file or folder, reporting progress to the current task; returns a CopyResult"""
+    task = current_task()
+    started = time.monotonic()
+    if os.path.isdir(source):
+        if os.path.exists(destination):
+            raise FileExistsError(errno.EEXIST, "Destination already exists", destination)
+        directories, files, links = _plan_tree(source, destination)
+        total = sum(size for _, _, size in files)
+        progress = CopyProgress(task, total, f"Copying {len(files):,} files")
+        for _, target in directories:
+            os.makedirs(target, exist_ok=True)
+        for link, target in links:
+            os.symlink(os.readlink(link), target)
+        # Largest first, so one big file does not start last and stretch the tail
+        files.sort(key=lambda item: item[2], reverse=True)
+        pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='copy')
+        try:
+            futures = [pool.submit(_copy_batch, batch, progress.advance) for batch in _batches(files)]
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in done:
+                future.result()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        # Directory timestamps last: creating their contents changed them
+        for src, target in reversed(directories):
+            shutil.copystat(src, target)
+        return CopyResult(len(files), total, time.monotonic() - started)
+
+    if os.path.isdir(destination):
+        destination = os.path.join(destination, os.path.basename(source))
+    size = os.path.getsize(source)
+    progress = CopyProgress(task, size, f"Copying {os.path.basename(source)}")
+    copy_data(source, destination, progress.advance, size)
+    return CopyResult(1, size, time.monotonic() - started)
+
+
+def move(source, destination, workers=DEFAULT_WORKERS):
+    """Rename when possible, otherwise copy then delete the source; returns a CopyResult or None if renamed"""
+    if os.path.isdir(destination):
+        destination = os.path.join(destination, os.path.basename(source.rstrip(os.sep)))
+        if os.path.exists(destination):
+            raise FileExistsError(errno.EEXIST, "Destination already exists", destination)
+    try:
+        os.rename(source, destination)
+        return None
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    # Different filesystem: copy, and only remove the source once the copy is complete
+    result = copy(source, destination, workers)
+    if os.path.isdir(source) and not os.path.islink(source):
+        shutil.rmtree(source)
+    else:
+        os.unlink(source)
+    return result
@@ -1,7 +1,6 @@
 import sys
 import os
 import json
-import pyttsx3
 import psutil
 from datetime import datetime, timedelta
 from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QPropertyAnimation, QEasingCurve
@@ -10,9 +9,15 @@ from PyQt5.QtWidgets import (
     QMainWindow, QPushButton, QTextEdit, QVBoxLayout, QHBoxLayout,
     QWidget, QLineEdit, QLabel, QFrame, QGridLayout, QSpacerItem, QSizePolicy, QScrollArea, QStackedWidget,
     QComboBox, QDateTimeEdit, QListWidget, QListWidgetItem, QFileDialog, QMessageBox, QProgressBar, QTableWidget,
-    QTableWidgetItem, QHeaderView, QColorDialog, QCheckBox
+    QTableWidgetItem, QHeaderView, QColorDialog, QCheckBox, QTreeWidget, QTreeWidgetItem
 )
-from ai_core import handle_task, llm_fallback, recognize_voice, get_network_info
+from ai_core import handle_task, llm_fallback, recognize_voice, get_network_info, shared_core
+from task_runner import TaskRunner
+from speaker import Speaker
+import dir_sizes
+import duplicate_finder
+import scan_history
+import storage_scan
 from auth_manager import AuthManager
 from auth_dialog import AuthDialog
 import random
@@ -498,11 +503,58 @@ class ChatInterface(GlassFrame):
         
         voice_row.addWidget(self.speech_toggle)
         
+        # Pending indicator shown while a command runs in the background
+        pending_row = QHBoxLayout()
+        pending_row.setSpacing(10)
+        
+        self.pending_label = QLabel("")
+        self.pending_label.setStyleSheet("color: #FFD700; font-size: 13px; background: transparent; border: none;")
+        
+        self.cancel_btn = GlassButton("🛑 Cancel")
+        self.cancel_btn.setFixedHeight(36)
+        if self.parent_dashboard:
+            self.cancel_btn.clicked.connect(self.parent_dashboard.on_cancel_task)
+        
+        pending_row.addWidget(self.pending_label)
+        pending_row.addStretch()
+        pending_row.addWidget(self.cancel_btn)
+        
+        self.pending_frames = ["⏳", "⌛"]
+        self.pending_step = 0
+        self.pending_text = ""
+        self.pending_timer = QTimer(self)
+        self.pending_timer.timeout.connect(self._animate_pending)
+        self.clear_pending()
+        
         layout.addLayout(input_layout)
         layout.addLayout(voice_row)
+        layout.addLayout(pending_row)
         
         section.setLayout(layout)
         return section
+    
+    def set_pending(self, text):
+        """Show the working indicator with the latest status text"""
+        self.pending_text = text
+        self.pending_label.setText(f"{self.pending_frames[self.pending_step]} {text}")
+        self.pending_label.show()
+        self.cancel_btn.show()
+        if not self.pending_timer.isActive():
+            self.pending_timer.start(400)
+    
+    def clear_pending(self):
+        self.pending_timer.stop()
+        self.pending_label.hide()
+        self.cancel_btn.hide()
+    
+    def _animate_pending(self):
+        self.pending_step = (self.pending_step + 1) % len(self.pending_frames)
+        self.pending_label.setText(f"{self.pending_frames[self.pending_step]} {self.pending_text}")
+    
+    def append_message(self, html):
+        """Append a message and keep the view scrolled to the bottom"""
+        self.chat_display.append(html)
+        self.chat_display.verticalScrollBar().setValue(self.chat_display.verticalScrollBar().maximum())
 
 class GlassDashboard(QMainWindow):
     def __init__(self):
@@ -514,9 +566,21 @@ class GlassDashboard(QMainWindow):
         self.auth_manager = AuthManager()
         self.auth_dialog = None
         
-        # Initialize AI components
+        # Initialize AI components (building the core starts app and file indexing)
+        shared_core()
         self.enable_speech_output = False
-        self.tts_engine = pyttsx3.init()
+        # Replies are spoken on a separate thread; runAndWait() would freeze the window
+        self.speaker = Speaker()
+        
+        # Commands run on a worker thread so the window stays responsive
+        self.task_runner = TaskRunner(self)
+        self.task_runner.progress.connect(self.on_task_progress)
+        self.task_runner.output.connect(self.on_task_output)
+        self.task_runner.finished.connect(self.on_task_finished)
+        self.task_runner.failed.connect(self.on_task_failed)
+        self.task_runner.cancelled.connect(self.on_task_cancelled)
+        self.task_runner.idle.connect(self.on_tasks_idle)
+        self.task_kinds = {}
         
         # Persistence files
         self.reminders_file = os.path.join(os.getcwd(), 'reminders.json')
@@ -676,28 +740,13 @@ class GlassDashboard(QMainWindow):
         user_text = self.chat_interface.text_input.text().strip()
         if user_text:
             # Display user message
-            self.chat_interface.chat_display.append(f"<div style='color: #64B5F6;'><b>👤 You:</b> {user_text}</div>")
-            
-            # Get AI response
-            try:
-                ai_reply = handle_task(user_text, llm_fallback_func=llm_fallback)
-                self.chat_interface.chat_display.append(f"<div style='color: #4CAF50;'><b>🤖 AI:</b> {ai_reply}</div>")
-                
-                # Speak if enabled
-                if self.enable_speech_output:
-                    self.speak(ai_reply)
-                    
-            except Exception as e:
-                error_msg = f"Sorry, I encountered an error: {str(e)}"
-                self.chat_interface.chat_display.append(f"<div style='color: #FF6B6B;'><b>❌ Error:</b> {error_msg}</div>")
+            self.chat_interface.append_message(f"<div style='color: #64B5F6;'><b>👤 You:</b> {user_text}</div>")
             
             # Clear input
             self.chat_interface.text_input.clear()
             
-            # Scroll to bottom
-            self.chat_interface.chat_display.verticalScrollBar().setValue(
-                self.chat_interface.chat_display.verticalScrollBar().maximum()
-            )
+            # Get AI response in the background
+            self.run_command(user_text, kind='command')
     
     def on_voice_input(self):
         """Handle voice input"""
@@ -709,37 +758,75 @@ class GlassDashboard(QMainWindow):
             self.show_auth_dialog()
             return
         
-        self.chat_interface.chat_display.append("<div style='color: #FFD700;'><b>🎤 Listening...</b> Speak now!</div>")
-        self.chat_interface.repaint()
-        
-        try:
-            voice_text = recognize_voice(duration=5)
-            if voice_text:
-                # Display what was heard
-                self.chat_interface.chat_display.append(f"<div style='color: #64B5F6;'><b>🗣️ You said:</b> {voice_text}</div>")
-                
-                # Get AI response
-                ai_reply = handle_task(voice_text, llm_fallback_func=llm_fallback)
-                self.chat_interface.chat_display.append(f"<div style='color: #4CAF50;'><b>🤖 AI:</b> {ai_reply}</div>")
-                
-                # Always speak voice responses
-                self.speak(ai_reply)
+        self.chat_interface.append_message("<div style='color: #FFD700;'><b>🎤 Listening...</b> Speak now!</div>")
+        task_id = self.task_runner.submit(lambda context: recognize_voice(duration=5))
+        self.task_kinds[task_id] = 'listen'
+        self.chat_interface.set_pending("Listening...")
+    
+    def run_command(self, text, kind='command'):
+        """Process a command on the task runner; the reply arrives in on_task_finished"""
+        task_id = self.task_runner.submit(
+            lambda context: handle_task(text, llm_fallback_func=llm_fallback, context=context)
+        )
+        self.task_kinds[task_id] = kind
+        self.chat_interface.set_pending("Working on it...")
+        return task_id
+    
+    def on_cancel_task(self):
+        """Cancel whatever the assistant is currently doing"""
+        self.task_runner.cancel()
+    
+    def on_task_progress(self, task_id, message):
+        self.chat_interface.set_pending(message)
+    
+    def on_task_output(self, task_id, text):
+        # Partial results (e.g. search hits) appear as they are found
+        self.chat_interface.append_message(f"<div style='color: #A5D6A7;'>{text}</div>")
+    
+    def on_task_finished(self, task_id, result):
+        kind = self.task_kinds.pop(task_id, 'command')
+        if kind == 'listen':
+            if result:
+                # Display what was heard, then answer it
+                self.chat_interface.append_message(f"<div style='color: #64B5F6;'><b>🗣️ You said:</b> {result}</div>")
+                self.run_command(result, kind='voice_command')
             else:
-                self.chat_interface.chat_display.append("<div style='color: #FF9800;'><b>⚠️ No speech detected.</b> Please try again.</div>")
-                
-        except Exception as e:
-            error_msg = f"Voice recognition error: {str(e)}"
-            self.chat_interface.chat_display.append(f"<div style='color: #FF6B6B;'><b>❌ Error:</b> {error_msg}</div>")
+                self.chat_interface.append_message("<div style='color: #FF9800;'><b>⚠️ No speech detected.</b> Please try again.</div>")
+            return
         
-        # Scroll to bottom
-        self.chat_interface.chat_display.verticalScrollBar().setValue(
-            self.chat_interface.chat_display.verticalScrollBar().maximum()
-        )
+        self.chat_interface.append_message(f"<div style='color: #4CAF50;'><b>🤖 AI:</b> {result}</div>")
+        
+        # Speak if enabled
+        self.speak(result)
+    
+    def on_task_failed(self, task_id, error):
+        kind = self.task_kinds.pop(task_id, 'command')
+        if kind == 'listen':
+            error_msg = f"Voice recognition error: {error}"
+        else:
+            error_msg = f"Sorry, I encountered an error: {error}"
+        self.chat_interface.append_message(f"<div style='color: #FF6B6B;'><b>❌ Error:</b> {error_msg}</div>")
+    
+    def on_task_cancelled(self, task_id):
+        self.task_kinds.pop(task_id, None)
+        self.chat_interface.append_message("<div style='color: #FF9800;'><b>🛑 Cancelled.</b></div>")
+    
+    def on_tasks_idle(self):
+        # A finished listen may already have queued its follow-up command
+        if not self.task_runner.busy():
+            self.chat_interface.clear_pending()
+    
+    def closeEvent(self, event):
+        self.task_runner.shutdown()
+        self.speaker.shutdown()
+        super().closeEvent(event)
     
     def toggle_speech(self):
         """Toggle speech output on/off"""
         self.enable_speech_output = not self.enable_speech_output
         status = "ON" if self.enable_speech_output else "OFF"
+        if not self.enable_speech_output:
+            self.speaker.clear()
         self.chat_interface.speech_toggle.setText(f"🔊 Voice Output: {status}")
         
         # Update button style based on state
@@ -782,12 +869,8 @@ class GlassDashboard(QMainWindow):
     
     def speak(self, text):
         """Convert text to speech"""
-        if text and self.tts_engine and self.enable_speech_output:
-            try:
-                self.tts_engine.say(text)
-                self.tts_engine.runAndWait()
-            except Exception as e:
-                print(f"Speech error: {e}")
+        if text and self.enable_speech_output:
+            self.speaker.say(text)
     
     # ----------------------------
     # Persistence helpers
@@ -1175,12 +1258,48 @@ class StoragePanel(GlassFrame):
         self.scan_path = QLineEdit(); self.scan_path.setPlaceholderText("Path to analyze…")
         browse = GlassButton("Browse", "📂"); browse.clicked.connect(self.browse_folder)
         scan = GlassButton("Scan Large Files", "🔎"); scan.clicked.connect(self.scan_large_files)
-        scan_row.addWidget(self.scan_path,1); scan_row.addWidget(browse); scan_row.addWidget(scan)
+        dupes = GlassButton("Find Duplicates", "🧬"); dupes.clicked.connect(self.find_duplicates)
+        sizes = GlassButton("Folder Sizes", "📊"); sizes.clicked.connect(self.scan_folder_sizes)
+        grew = GlassButton("What Grew", "📈"); grew.clicked.connect(self.show_what_grew)
+        types = GlassButton("Type & Age", "🗂️"); types.clicked.connect(self.scan_breakdown)
+        scan_row.addWidget(self.scan_path,1); scan_row.addWidget(browse); scan_row.addWidget(scan); scan_row.addWidget(types)
+        scan_row.addWidget(dupes); scan_row.addWidget(sizes); scan_row.addWidget(grew)
         layout.addLayout(scan_row)
         
+        status_row = QHBoxLayout()
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet("color: #FFD700; background: transparent; border: none;")
+        self.cancel_btn = GlassButton("🛑 Cancel")
+        self.cancel_btn.clicked.connect(lambda: self.runner.cancel())
+        self.cancel_btn.hide()
+        status_row.addWidget(self.status_label, 1); status_row.addWidget(self.cancel_btn)
+        layout.addLayout(status_row)
+        
         self.results = QListWidget(); self.results.setStyleSheet("QListWidget { background: rgba(255,255,255,0.05); border:1px solid rgba(255,255,255,0.1); border-radius:12px; color:white; }")
         layout.addWidget(self.results,1)
         
+        # Folder sizes drill down: children are added when a node is first expanded
+        self.size_tree = QTreeWidget(); self.size_tree.setColumnCount(3)
+        self.size_tree.setHeaderLabels(["Folder", "Size", "Files"])
+        self.size_tree.setStyleSheet(self.results.styleSheet().replace("QListWidget", "QTreeWidget"))
+        self.size_tree.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.size_tree.itemExpanded.connect(self.expand_size_node)
+        self.size_tree.hide()
+        layout.addWidget(self.size_tree,1)
+        self.sizes = None
+        
+        # Long scans run here so the window stays responsive
+        self.runner = TaskRunner(self)
+        self.runner.progress.connect(lambda task_id, message: self.status_label.setText(message))
+        self.runner.output.connect(self.on_scan_snapshot)
+        self.runner.finished.connect(self.on_scan_finished)
+        self.runner.failed.connect(lambda task_id, error: self.status_label.setText(f"❌ {error}"))
+        self.runner.cancelled.connect(lambda task_id: self.status_label.setText("🛑 Scan cancelled"))
+        self.runner.idle.connect(self.cancel_btn.hide)
+        self.scan_kinds = {}
+        # Every folder size scan is saved so later scans can be compared against it
+        self.history = scan_history.ScanHistory()
+        
         self.setLayout(layout)
         self.refresh_partitions()
     
@@ -1203,24 +1322,117 @@ class StoragePanel(GlassFrame):
         if path:
             self.scan_path.setText(path)
     
-    def scan_large_files(self):
+    def start_scan(self, kind, status, func):
+        """Run func(base) on the panel's worker; a new scan replaces one still running"""
         base = self.scan_path.text().strip() or os.getcwd()
+        self.runner.cancel()
         self.results.clear()
-        candidates = []
-        try:
-            for root, _, files in os.walk(base):
-                for f in files:
-                    fp = os.path.join(root, f)
-                    try:
-                        size = os.path.getsize(fp)
-                    except Exception:
-                        continue
-                    candidates.append((size, fp))
-            candidates.sort(reverse=True)
-            for size, fp in candidates[:50]:
-                self.results.addItem(f"{size/1024/1024:.1f} MB — {fp}")
-        except Exception as e:
-            QMessageBox.critical(self, "Storage", f"Error: {e}")
+        self.results.show(); self.size_tree.hide()
+        self.status_label.setText(status.format(base=base))
+        task_id = self.runner.submit(lambda context: func(base))
+        self.scan_kinds[task_id] = kind
+        self.cancel_btn.show()
+    
+    def scan_large_files(self):
+        # Only the 50 largest are kept while walking, never a list of every file
+        self.start_scan('largest', "🔎 Scanning {base}...", lambda base: storage_scan.largest_files(base, 50))
+    
+    def scan_breakdown(self):
+        self.start_scan('breakdown', "🗂️ Sorting files in {base} by type and age...", storage_scan.breakdown)
+    
+    def show_breakdown(self, result):
+        total = result.bytes or 1
+        self.status_label.setText(f"🗂️ {result.bytes/1024**3:.2f} GB in {result.files:,} files")
+        sections = [("By type", result.categories), ("By extension", result.extensions[:15]),
+                    ("By last modified", result.modified), ("By last accessed", result.accessed)]
+        for title, shares in sections:
+            self.results.addItem(title)
+            for share in shares:
+                self.results.addItem(f"    {share.label}: {share.bytes/1024/1024:,.1f} MB ({share.bytes/total:.0%}) — "
+                                     f"{share.files:,} files")
+    
+    def find_duplicates(self):
+        self.start_scan('duplicates', "🧬 Looking for duplicates in {base}...", duplicate_finder.find_duplicates)
+    
+    def scan_folder_sizes(self):
+        # Reuses the cached tree for this folder; only folders whose mtime changed are listed again
+        self.start_scan('sizes', "📊 Sizing folders in {base}...", self.size_and_record)
+    
+    def size_and_record(self, base):
+        tree = dir_sizes.directory_sizes(base)
+        self.history.record_tree(tree)
+        return tree
+    
+    def show_what_grew(self):
+        self.start_scan('growth', "📈 Comparing the last two scans of {base}...", self.history.what_grew)
+    
+    def add_size_nodes(self, parent_item, index):
+        tree = self.sizes
+        for child in tree.children(index):
+            share = tree.size[child] / tree.size[index] * 100 if tree.size[index] else 0
+            item = QTreeWidgetItem([tree.names[child], f"{tree.size[child]/1024/1024:,.1f} MB  ({share:.0f}%)",
+                                    f"{tree.count[child]:,}"])
+            item.setData(0, Qt.UserRole, child)
+            if tree.child_count[child]:
+                item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+            parent_item.addChild(item)
+    
+    def expand_size_node(self, item):
+        if self.sizes is not None and item.childCount() == 0:
+            self.add_size_nodes(item, item.data(0, Qt.UserRole))
+    
+    def show_folder_sizes(self, tree):
+        self.sizes = tree
+        self.size_tree.clear()
+        root = QTreeWidgetItem([tree.root, f"{tree.size[0]/1024/1024:,.1f} MB", f"{tree.count[0]:,}"])
+        root.setData(0, Qt.UserRole, 0)
+        self.size_tree.addTopLevelItem(root)
+        self.add_size_nodes(root, 0)
+        root.setExpanded(True)
+        self.results.hide(); self.size_tree.show()
+        self.status_label.setText(f"📊 {tree.size[0]/1024**3:.2f} GB in {tree.count[0]:,} files, {len(tree):,} folders")
+    
+    def show_growth(self, diff):
+        if diff is None:
+            self.status_label.setText("ℹ️ Run Folder Sizes on this folder twice to see what grew")
+            return
+        since = datetime.fromtimestamp(diff.old.taken_at).strftime('%Y-%m-%d %H:%M')
+        self.status_label.setText(f"📈 {diff.total_change/1024/1024:+,.1f} MB since {since} "
+                                  f"({diff.grown:,} folders grew, {diff.shrunk:,} shrank)")
+        for change in diff.changes:
+            self.results.addItem(f"+{(change.new_size - change.old_size)/1024/1024:,.1f} MB — {change.path} "
+                                 f"({change.old_size/1024/1024:,.1f} → {change.new_size/1024/1024:,.1f} MB)")
+    
+    def show_largest(self, snapshot):
+        self.results.clear()
+        self.results.addItems([f"{size/1024/1024:.1f} MB — {fp}" for size, fp in snapshot.largest])
+        state = "✅ Scanned" if snapshot.done else "🔎 Scanning:"
+        self.status_label.setText(f"{state} {snapshot.files:,} files, {snapshot.bytes/1024**3:.2f} GB")
+    
+    def on_scan_snapshot(self, task_id, snapshot):
+        if self.scan_kinds.get(task_id) == 'largest':
+            self.show_largest(snapshot)
+    
+    def on_scan_finished(self, task_id, result):
+        kind = self.scan_kinds.pop(task_id, None)
+        if kind == 'largest':
+            self.show_largest(result)
+        elif kind == 'sizes':
+            self.show_folder_sizes(result)
+        elif kind == 'growth':
+            self.show_growth(result)
+        elif kind == 'breakdown':
+            self.show_breakdown(result)
+        elif kind == 'duplicates':
+            groups, stats = result
+            wasted = sum(group.reclaimable for group in groups)
+            self.status_label.setText(f"🧬 {len(groups)} sets of duplicates, {wasted/1024/1024:.1f} MB reclaimable "
+                                      f"({stats.files:,} files checked)")
+            for group in groups[:200]:
+                self.results.addItem(f"{len(group.paths)} × {group.size/1024/1024:.1f} MB — "
+                                     f"{group.reclaimable/1024/1024:.1f} MB reclaimable")
+                for path in group.paths:
+                    self.results.addItem(f"    {path}")
 
 class ThemePanel(GlassFrame):
     def __init__(self, parent: 'GlassDashboard'):
@@ -0,0 +1,88 @@
+# dir_listing.py - Cached, sortable directory listings for list_files
+"""
+A directory is read with a single os.scandir pass and one stat per entry.
+The entries are kept in a small per-directory cache together with the
+directory's mtime, and sorted views (by name, size or modification time)
+are built once and reused for every page. The next listing of the same
+directory only stats the directory itself: an unchanged mtime means no
+entry was added, removed or renamed. As with any mtime check, a file that
+grew in place keeps its old size until something in the directory changes.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+Entry = namedtuple('Entry', ['name', 'is_dir', 'size', 'mtime'])
+
+SORT_KEYS = {
+    'name': lambda entry: entry.name.lower(),
+    'size': lambda entry: entry.size,
+    'mtime': lambda entry: entry.mtime,
+}
+# Directories changed this recently may change again within the same mtime tick, so they are not cached
+RACY_SECONDS = 2.0
+
+
+def read_directory(path):
+    """Entries of path from one scandir pass (one stat per entry)"""
+    entries = []
+    with os.scandir(path) as it:
+        for item in it:
+            try:
+                is_dir = item.is_dir()
+                st = item.stat()
+            except OSError:
+                continue
+            entries.append(Entry(item.name, is_dir, 0 if is_dir else st.st_size, st.st_mtime))
+    return entries
+
+
+class DirectoryCache:
+    """LRU cache of directory listings validated by the directory mtime"""
+
+    def __init__(self, max_dirs=32):
+        self.max_dirs = max_dirs
+        self._dirs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def entries(self, path):
+        """(mtime_ns, {sort view: entries}) for path, re-read only if the directory changed"""
+        path = os.path.abspath(path)
+        mtime_ns = os.stat(path).st_mtime_ns
+        with self._lock:
+            cached = self._dirs.get(path)
+            if cached and cached[0] == mtime_ns:
+                self._dirs.move_to_end(path)
+                return cached
+        cached = (mtime_ns, {'': read_directory(path)})
+        if time.time() - mtime_ns / 1e9 > RACY_SECONDS:
+            with self._lock:
+                self._dirs[path] = cached
+                self._dirs.move_to_end(path)
+                while len(self._dirs) > self.max_dirs:
+                    self._dirs.popitem(last=False)
+        return cached
+
+    def listing(self, path, sort='name', reverse=False):
+        """All entries of path, folders first, each group ordered by sort ('name', 'size' or 'mtime')"""
+        _, views = self.entries(path)
+        view = (sort, reverse)
+        ordered = views.get(view)
+        if ordered is None:
+            key = SORT_KEYS[sort]
+            entries = views['']
+            # Folders have no size of their own; order them by name when sorting by size
+            folder_key = SORT_KEYS['name'] if sort == 'size' else key
+            folders = sorted((e for e in entries if e.is_dir), key=folder_key,
+                             reverse=reverse and sort != 'size')
+            files = sorted((e for e in entries if not e.is_dir), key=key, reverse=reverse)
+            ordered = views[view] = folders + files
+        return ordered
+
+    def invalidate(self, path=None):
+        with self._lock:
+            if path is None:
+                self._dirs.clear()
+            else:
+                self._dirs.pop(os.path.abspath(path), None)
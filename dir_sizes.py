@@ -0,0 +1,212 @@
+# dir_sizes.py - du-style recursive directory sizes in a compact array-backed tree
+"""
+directory_sizes() lists every directory below a root once, on a thread
+pool, and records each directory's own files (bytes and count). The
+directories are then numbered in breadth-first order and stored in a
+SizeTree as parallel arrays: parent, first child, child count, mtime,
+own and recursive size/count. In breadth-first order a node's children
+are contiguous and come after it, so recursive totals are one backward
+pass over the arrays, and expanding a node in a view is an index lookup.
+Everything is sized, .git and node_modules included; only virtual
+filesystems (/proc, /sys, ...) are skipped and symlinks are not followed.
+
+The tree is pickled into the cache directory, one file per root. The next
+scan only lists a directory again if its mtime changed (a file was added,
+removed or renamed in it) or it was cached too soon after a change to
+trust the mtime. Unchanged directories cost one stat. A file that grows in
+place does not change its directory's mtime; full=True rescans everything.
+"""
+import hashlib
+import os
+import pickle
+import time
+from array import array
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from dir_listing import RACY_SECONDS
+from task_context import current_task
+from tree_walker import DEFAULT_WORKERS, VIRTUAL_FS_PATHS
+from user_paths import cache_path, write_atomic
+
+CACHE_VERSION = 2  # 2: folders in tree_walker.EXCLUDED_NAMES are sized too
+
+# What one listing of a directory found: its own files and its subdirectory names
+DirRecord = namedtuple('DirRecord', ['mtime', 'own_size', 'own_count', 'subdirs'])
+
+
+class SizeTree:
+    """Directories below root, indexed 0..len-1 in breadth-first order (0 is root).
+
+    size/count are recursive totals; own_size/own_count cover only the files
+    directly inside a directory. Node i's children are indices
+    first_child[i] .. first_child[i] + child_count[i] - 1.
+    """
+
+    ARRAYS = ('parent', 'first_child', 'child_count', 'mtime', 'own_size', 'own_count', 'size', 'count')
+
+    def __init__(self, root, names, scanned_at, **arrays):
+        self.root = root
+        self.names = names
+        self.scanned_at = scanned_at
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+
+    @classmethod
+    def build(cls, root, records, scanned_at):
+        """Number the directories in records (path -> DirRecord) breadth first and sum the totals"""
+        names = [root]
+        paths = [root]
+        parent, first_child, child_count = array('q', [-1]), array('q'), array('q')
+        queue = deque([0])
+        while queue:
+            index = queue.popleft()
+            path = paths[index]
+            subdirs = [name for name in records[path].subdirs if os.path.join(path, name) in records]
+            first_child.append(len(names))
+            child_count.append(len(subdirs))
+            for name in subdirs:
+                queue.append(len(names))
+                names.append(name)
+                paths.append(os.path.join(path, name))
+                parent.append(index)
+
+        ordered = [records[path] for path in paths]
+        mtime = array('q', (record.mtime for record in ordered))
+        own_size = array('q', (record.own_size for record in ordered))
+        own_count = array('q', (record.own_count for record in ordered))
+        size, count = array('q', own_size), array('q', own_count)
+        for index in range(len(names) - 1, 0, -1):
+            size[parent[index]] += size[index]
+            count[parent[index]] += count[index]
+        return cls(root, names, scanned_at, parent=parent, first_child=first_child, child_count=child_count,
+                   mtime=mtime, own_size=own_size, own_count=own_count, size=size, count=count)
+
+    def __len__(self):
+        return len(self.names)
+
+    def children(self, index):
+        """Child indices of a directory, biggest first"""
+        start = self.first_child[index]
+        return sorted(range(start, start + self.child_count[index]), key=self.size.__getitem__, reverse=True)
+
+    def path(self, index):
+        parts = []
+        while index > 0:
+            parts.append(self.names[index])
+            index = self.parent[index]
+        return os.path.join(self.root, *reversed(parts))
+
+    def paths(self):
+        """Path of every node, in index order (cheaper than path() per node)"""
+        paths = [self.root]
+        for index in range(1, len(self.names)):
+            paths.append(os.path.join(paths[self.parent[index]], self.names[index]))
+        return paths
+
+    def records(self):
+        """path -> DirRecord, the input of the next incremental scan"""
+        records = {}
+        for index, path in enumerate(self.paths()):
+            start = self.first_child[index]
+            subdirs = self.names[start:start + self.child_count[index]]
+            records[path] = DirRecord(self.mtime[index], self.own_size[index], self.own_count[index], subdirs)
+        return records
+
+    def __getstate__(self):
+        return {'root': self.root, 'names': self.names, 'scanned_at': self.scanned_at,
+                **{name: getattr(self, name) for name in self.ARRAYS}}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+
+def cache_file(root):
+    digest = hashlib.sha1(os.path.normcase(root).encode('utf-8', 'surrogatepass')).hexdigest()[:16]
+    return cache_path(f'dir_sizes_{digest}.pickle')
+
+
+def load_cached(root):
+    """The cached SizeTree for root, or None"""
+    try:
+        with open(cache_file(root), 'rb') as f:
+            cached = pickle.load(f)
+        if cached['version'] == CACHE_VERSION and cached['tree'].root == root:
+            return cached['tree']
+    except Exception:
+        pass
+    return None
+
+
+def _list_directory(path, cached, trusted_before):
+    """DirRecord for path, reusing cached when the directory's mtime says nothing changed"""
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None, False
+    if cached is not None and cached.mtime == mtime and mtime < trusted_before:
+        return cached, False
+    own_size = own_count = 0
+    subdirs = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        # Unlike searches, sizing enters .git, node_modules etc.; only virtual filesystems are skipped
+                        if entry.path not in VIRTUAL_FS_PATHS:
+                            subdirs.append(entry.name)
+                    elif entry.is_file(follow_symlinks=False):
+                        own_size += entry.stat(follow_symlinks=False).st_size
+                        own_count += 1
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    subdirs.sort()
+    return DirRecord(mtime, own_size, own_count, subdirs), True
+
+
+def directory_sizes(root, full=False, workers=DEFAULT_WORKERS, use_cache=True):
+    """SizeTree for root, re-listing only directories whose mtime changed since the cached scan"""
+    task = current_task()
+    root = os.path.abspath(root)
+    if not os.path.isdir(root):
+        raise NotADirectoryError(root)
+    started = time.time()
+    cached_tree = None if full or not use_cache else load_cached(root)
+    previous = cached_tree.records() if cached_tree else {}
+    # An mtime within RACY_SECONDS of the previous scan may hide a later change in the same tick
+    trusted_before = int((cached_tree.scanned_at - RACY_SECONDS) * 1e9) if cached_tree else 0
+
+    records = {}
+    listed = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='du') as pool:
+        pending = {pool.submit(_list_directory, root, previous.get(root), trusted_before): root}
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = pending.pop(future)
+                    record, was_listed = future.result()
+                    if record is None:
+                        continue
+                    records[path] = record
+                    listed += was_listed
+                    for name in record.subdirs:
+                        child = os.path.join(path, name)
+                        pending[pool.submit(_list_directory, child, previous.get(child), trusted_before)] = child
+                task.check()
+                task.report(f"📊 Sizing folders: {len(records):,} found, {listed:,} listed")
+        finally:
+            for future in pending:
+                future.cancel()
+
+    tree = SizeTree.build(root, records, started)
+    if use_cache:
+        try:
+            payload = {'version': CACHE_VERSION, 'tree': tree}
+            write_atomic(cache_file(root), pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+        except OSError as e:
+            print(f"⚠️ Unable to cache folder sizes: {e}")
+    return tree
@@ -0,0 +1,144 @@
+# duplicate_finder.py - Find duplicate files: size groups, then head/tail hashes, then full hashes
+"""
+Three stages. Each one only looks at files that are still candidates:
+
+1. Size: one parallel walk (tree_walker) groups files by size. A file with
+   a unique size cannot have a duplicate and is never opened. Hard links
+   to the same inode are counted once, since removing one frees nothing.
+   No folder is skipped by default: vendored node_modules copies and .venv
+   site-packages are where duplicates usually are.
+2. Edges: files in a shared size group are hashed over their first and
+   last PARTIAL_BLOCK bytes. Most same-size files differ here. For files
+   no bigger than two blocks this already covers the whole content.
+3. Full: files that still collide are hashed in full.
+
+Hashing reads memory-mapped files (only the touched pages are faulted in)
+with BLAKE2b on a thread pool; hashlib releases the GIL while hashing large
+buffers. No process pool: forking the dashboard, which already runs Qt and
+indexer threads, can leave the children stuck on locks held at fork time.
+"""
+import hashlib
+import mmap
+import os
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from task_context import current_task
+from tree_walker import walk_files
+
+PARTIAL_BLOCK = 64 * 1024
+FULL_CHUNK = 16 * 1024 * 1024
+MIN_POOL_FILES = 64  # below this many files to hash, a pool costs more than it saves
+
+DuplicateStats = namedtuple('DuplicateStats', ['files', 'candidates', 'partial_hashed', 'full_hashed'])
+
+
+class DuplicateGroup(namedtuple('_DuplicateGroup', ['size', 'paths'])):
+    """Files with identical content"""
+
+    __slots__ = ()
+
+    @property
+    def reclaimable(self):
+        """Bytes freed by keeping one copy"""
+        return self.size * (len(self.paths) - 1)
+
+
+def _hash_edges(item):
+    path, size = item
+    try:
+        with open(path, 'rb') as f:
+            if size <= 2 * PARTIAL_BLOCK:
+                return path, hashlib.blake2b(f.read()).digest()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                digest = hashlib.blake2b(view[:PARTIAL_BLOCK])
+                digest.update(view[-PARTIAL_BLOCK:])
+                return path, digest.digest()
+    except (OSError, ValueError):
+        return path, None
+
+
+def _hash_full(item):
+    path, size = item
+    try:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            digest = hashlib.blake2b()
+            memory = memoryview(view)
+            try:
+                for offset in range(0, len(view), FULL_CHUNK):
+                    digest.update(memory[offset:offset + FULL_CHUNK])
+            finally:
+                memory.release()
+            return path, digest.digest()
+    except (OSError, ValueError):
+        return path, None
+
+
+def _hash_stage(func, groups, pool, label):
+    """Split every group of (path, size) by func's digest; returns groups that still have 2+ members"""
+    task = current_task()
+    items = [item for group in groups for item in group]
+    if pool is None:
+        results = map(func, items)
+    else:
+        results = pool.map(func, items)
+    digests = {}
+    for done, (path, digest) in enumerate(results, 1):
+        digests[path] = digest
+        if done % 100 == 0:
+            task.check()
+            task.report(f"🧬 {label}: {done:,} of {len(items):,} files")
+    split = []
+    for group in groups:
+        buckets = defaultdict(list)
+        for path, size in group:
+            digest = digests.get(path)
+            if digest is not None:
+                buckets[digest].append((path, size))
+        split.extend(bucket for bucket in buckets.values() if len(bucket) > 1)
+    return split
+
+
+def find_duplicates(root, min_size=1, workers=None, excluded_names=()):
+    """(groups sorted by reclaimable bytes, DuplicateStats) for identical files below root.
+
+    excluded_names: folder names not to enter (e.g. tree_walker.EXCLUDED_NAMES)
+    """
+    task = current_task()
+    by_size = defaultdict(list)
+    seen_inodes = set()
+    files = 0
+    for files, (path, st) in enumerate(walk_files(root, excluded_names=excluded_names), 1):
+        if files % 5000 == 0:
+            task.check()
+            task.report(f"🧬 Sizing: {files:,} files")
+        if st.st_size < min_size:
+            continue
+        if st.st_nlink > 1:
+            inode = (st.st_dev, st.st_ino)
+            if inode in seen_inodes:
+                continue
+            seen_inodes.add(inode)
+        by_size[st.st_size].append((path, st.st_size))
+
+    groups = [group for group in by_size.values() if len(group) > 1]
+    candidates = sum(len(group) for group in groups)
+    workers = workers or os.cpu_count() or 4
+    pool = None
+    if candidates >= MIN_POOL_FILES:
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='hash')
+    try:
+        groups = _hash_stage(_hash_edges, groups, pool, "Comparing file edges")
+        partial_hashed = candidates
+        # Small files were hashed whole in the edge stage; only bigger ones need a full pass
+        settled = [group for group in groups if group[0][1] <= 2 * PARTIAL_BLOCK]
+        pending = [group for group in groups if group[0][1] > 2 * PARTIAL_BLOCK]
+        full_hashed = sum(len(group) for group in pending)
+        groups = settled + _hash_stage(_hash_full, pending, pool, "Hashing candidates")
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    result = [DuplicateGroup(group[0][1], sorted(path for path, _ in group)) for group in groups]
+    result.sort(key=lambda group: group.reclaimable, reverse=True)
+    return result, DuplicateStats(files, candidates, partial_hashed, full_hashed)
@@ -0,0 +1,282 @@
+# file_index.py - Persistent SQLite filename index for fast file search
+"""
+Filenames under the indexed roots (the home directory by default, or the
+os.pathsep-separated TEJAS_INDEX_ROOTS) are kept in an SQLite database in
+the cache directory. The index stores path, name, extension, size and
+mtime.
+
+A background thread builds the index, and later refreshes are incremental.
+Every directory's mtime is stored; a directory whose mtime has not changed
+is not listed again, and its known subdirectories are only stat'ed. Like
+any mtime-based scheme, this sees files created, deleted or renamed, but
+not in-place size changes inside an unchanged directory until that
+directory changes.
+
+Substring queries use an FTS5 trigram table when SQLite provides one. Prefix
+queries use an ordered index on the lowercased name, and extension queries
+use an index on the extension. Size and date criteria filter on the stored
+stat columns, so no file is touched at query time.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+from file_search import FileQuery
+from tree_walker import EXCLUDED_NAMES, VIRTUAL_FS_PATHS
+from user_paths import cache_path
+
+REFRESH_INTERVAL = 300  # seconds before a search triggers a background refresh
+COMMIT_EVERY = 500  # directories per write transaction while indexing
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS roots (path TEXT PRIMARY KEY, complete INTEGER NOT NULL, refreshed REAL);
+CREATE TABLE IF NOT EXISTS dirs (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    parent INTEGER,
+    mtime_ns INTEGER
+);
+CREATE INDEX IF NOT EXISTS dirs_parent ON dirs (parent);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    dir INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    name_lower TEXT NOT NULL,
+    ext TEXT NOT NULL,
+    size INTEGER,
+    mtime REAL
+);
+CREATE INDEX IF NOT EXISTS files_dir ON files (dir);
+CREATE INDEX IF NOT EXISTS files_name ON files (name_lower);
+CREATE INDEX IF NOT EXISTS files_ext ON files (ext);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5(
+    name_lower, content='files', content_rowid='id', tokenize='trigram');
+CREATE TRIGGER IF NOT EXISTS files_ai AFTER INSERT ON files BEGIN
+    INSERT INTO files_fts (rowid, name_lower) VALUES (new.id, new.name_lower);
+END;
+CREATE TRIGGER IF NOT EXISTS files_ad AFTER DELETE ON files BEGIN
+    INSERT INTO files_fts (files_fts, rowid, name_lower) VALUES ('delete', old.id, old.name_lower);
+END;
+"""
+
+
+def default_roots():
+    configured = os.getenv('TEJAS_INDEX_ROOTS')
+    if configured:
+        return [os.path.abspath(os.path.expanduser(p)) for p in configured.split(os.pathsep) if p]
+    return [os.path.expanduser('~')]
+
+
+def file_extension(name):
+    """Lowercased extension without the dot ('' if none)"""
+    return os.path.splitext(name)[1][1:].lower()
+
+
+def _under(column, root):
+    """SQL condition (and params) matching root itself or any path below it"""
+    prefix = root.rstrip(os.sep) + os.sep
+    # chr(ord(sep) + 1) is the first string sorting after every "root/..." path
+    return (f"({column} = ? OR ({column} >= ? AND {column} < ?))",
+            [root, prefix, prefix[:-1] + chr(ord(os.sep) + 1)])
+
+
+_GLOB_CHARS = frozenset('*?[')
+
+
+def _glob_literal(text):
+    """Escape GLOB wildcards so text matches literally"""
+    return ''.join(f'[{ch}]' if ch in '*?[' else ch for ch in text)
+
+
+class FileIndex:
+    """On-disk filename index over a set of root directories"""
+
+    def __init__(self, roots=None, path=None):
+        self.roots = [os.path.abspath(r) for r in (roots if roots is not None else default_roots())]
+        self.path = path or cache_path('file_index.sqlite3')
+        self.ready = threading.Event()
+        self._local = threading.local()
+        self._refresh_lock = threading.Lock()
+        self._thread = None
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        try:
+            conn.executescript(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            self.has_fts = False
+        conn.commit()
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ----------------------------
+    # Indexing
+    # ----------------------------
+    def start(self):
+        """Refresh every root on a daemon thread; returns immediately"""
+        if self._thread and self._thread.is_alive():
+            return
+        self.ready.clear()
+        self._thread = threading.Thread(target=self.refresh_all, name='FileIndex', daemon=True)
+        self._thread.start()
+
+    def refresh_all(self):
+        try:
+            for root in self.roots:
+                self.refresh(root)
+        finally:
+            self.ready.set()
+
+    def refresh(self, root):
+        """Bring the index for root up to date, re-listing only directories whose mtime changed"""
+        root = os.path.abspath(root)
+        with self._refresh_lock:
+            conn = self._connect()
+            condition, params = _under('path', root)
+            known = {}
+            children = {}
+            for dir_id, path, parent, mtime_ns in conn.execute(
+                    f"SELECT id, path, parent, mtime_ns FROM dirs WHERE {condition}", params):
+                known[path] = (dir_id, mtime_ns)
+                children.setdefault(parent, []).append(path)
+
+            seen = set()
+            stack = [(root, None)]
+            rescanned = 0
+            while stack:
+                path, parent = stack.pop()
+                try:
+                    mtime_ns = os.stat(path).st_mtime_ns
+                except OSError:
+                    continue
+                seen.add(path)
+                record = known.get(path)
+                if record and record[1] == mtime_ns:
+                    stack.extend((child, record[0]) for child in children.get(record[0], ()))
+                    continue
+                subdirs = self._rescan_dir(conn, path, parent, mtime_ns, record)
+                stack.extend(subdirs)
+                rescanned += 1
+                if rescanned % COMMIT_EVERY == 0:
+                    conn.commit()
+
+            removed = [known[path][0] for path in known.keys() - seen]
+            for dir_id in removed:
+                conn.execute("DELETE FROM files WHERE dir = ?", (dir_id,))
+                conn.execute("DELETE FROM dirs WHERE id = ?", (dir_id,))
+            conn.execute("INSERT OR REPLACE INTO roots (path, complete, refreshed) VALUES (?, 1, ?)",
+                         (root, time.time()))
+            conn.commit()
+            return rescanned
+
+    def _rescan_dir(self, conn, path, parent, mtime_ns, record):
+        if record:
+            dir_id = record[0]
+            conn.execute("UPDATE dirs SET mtime_ns = ?, parent = ? WHERE id = ?", (mtime_ns, parent, dir_id))
+            conn.execute("DELETE FROM files WHERE dir = ?", (dir_id,))
+        else:
+            dir_id = conn.execute("INSERT INTO dirs (path, parent, mtime_ns) VALUES (?, ?, ?)",
+                                  (path, parent, mtime_ns)).lastrowid
+        rows = []
+        subdirs = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in EXCLUDED_NAMES and entry.path not in VIRTUAL_FS_PATHS:
+                                subdirs.append((entry.path, dir_id))
+                        elif entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            rows.append((dir_id, entry.name, entry.name.lower(), file_extension(entry.name),
+                                         st.st_size, st.st_mtime))
+                    except OSError:
+                        continue
+        except OSError:
+            return []
+        conn.executemany("INSERT INTO files (dir, name, name_lower, ext, size, mtime) VALUES (?, ?, ?, ?, ?, ?)",
+                         rows)
+        return subdirs
+
+    # ----------------------------
+    # Queries
+    # ----------------------------
+    def indexed_root(self, path):
+        """The completely indexed root containing path, or None"""
+        path = os.path.abspath(path)
+        for root in self.roots:
+            if path == root or path.startswith(root.rstrip(os.sep) + os.sep):
+                row = self._connect().execute("SELECT complete, refreshed FROM roots WHERE path = ?",
+                                              (root,)).fetchone()
+                if row and row[0]:
+                    return root
+        return None
+
+    def refresh_if_stale(self, root):
+        """Start a background refresh of root if it was last refreshed over REFRESH_INTERVAL ago"""
+        row = self._connect().execute("SELECT refreshed FROM roots WHERE path = ?", (root,)).fetchone()
+        if row and time.time() - (row[0] or 0) > REFRESH_INTERVAL and not self._refresh_lock.locked():
+            threading.Thread(target=self.refresh, args=(root,), name='FileIndex', daemon=True).start()
+
+    def search(self, query, path, limit=20):
+        """(total, [(path, size, mtime), ...]) for files under path matching query, newest first.
+
+        query is a FileQuery or a typed pattern: "*.pdf" or ".pdf" is an
+        extension query, "report*" a glob and anything else a case-insensitive
+        substring. Size and date criteria are answered from the stored stat
+        data; a regular expression is applied to the candidate rows in Python.
+        """
+        if not isinstance(query, FileQuery):
+            query = FileQuery.from_pattern(query)
+        where, params = [], []
+        if query.extensions:
+            where.append(f"f.ext IN ({', '.join('?' * len(query.extensions))})")
+            params.extend(sorted(query.extensions))
+        if query.glob:
+            prefix = query.glob[:-1]
+            if query.glob.endswith('*') and not _GLOB_CHARS.intersection(prefix):
+                where.append("f.name_lower >= ? AND f.name_lower < ?")
+                params.extend([prefix, prefix + '\uffff'])
+            else:
+                where.append("f.name_lower GLOB ?")
+                params.append(query.glob)
+        if query.name:
+            if self.has_fts and len(query.name) >= 3:
+                where.append("f.id IN (SELECT rowid FROM files_fts WHERE name_lower GLOB ?)")
+                params.append(f"*{_glob_literal(query.name)}*")
+            else:
+                where.append("instr(f.name_lower, ?) > 0")
+                params.append(query.name)
+        for condition, value in (("f.size >= ?", query.min_size), ("f.size <= ?", query.max_size),
+                                 ("f.mtime >= ?", query.newer_than), ("f.mtime < ?", query.older_than)):
+            if value is not None:
+                where.append(condition)
+                params.append(value)
+        under, under_params = _under('d.path', os.path.abspath(path))
+        where.append(under)
+        params.extend(under_params)
+        base = f"FROM files f JOIN dirs d ON d.id = f.dir WHERE {' AND '.join(where)}"
+        conn = self._connect()
+        if query.regex is None:
+            total = conn.execute(f"SELECT COUNT(*) {base}", params).fetchone()[0]
+            rows = conn.execute(f"SELECT d.path, f.name, f.size, f.mtime {base} ORDER BY f.mtime DESC LIMIT ?",
+                                params + [limit]).fetchall()
+        else:
+            total, rows = 0, []
+            for row in conn.execute(f"SELECT d.path, f.name, f.size, f.mtime {base} ORDER BY f.mtime DESC", params):
+                if query.regex.search(row[1]):
+                    total += 1
+                    if len(rows) < limit:
+                        rows.append(row)
+        return total, [(os.path.join(directory, name), size, mtime) for directory, name, size, mtime in rows]
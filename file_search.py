@@ -0,0 +1,299 @@
+# file_search.py - File search queries with name, type, size and date predicates
+"""
+A FileQuery describes what to look for: a name (substring, glob or regular
+expression), a set of extensions, a size range and a modification-time
+range. parse_file_query() builds one from a spoken command such as
+
+    "find pdfs bigger than 10MB modified this week"
+    "locate files named report*.docx from yesterday"
+    "search for photos older than 6 months smaller than 1 mb"
+
+find_files() is a generator over a directory tree (via tree_walker). Names
+are tested first, and only entries whose name matches are stat'ed. Each hit
+is yielded as soon as its directory has been read, so the caller can stop
+after the first N or keep going to count them all. FileIndex.search takes
+the same FileQuery and answers it from the index.
+"""
+import fnmatch
+import os
+import re
+from collections import namedtuple
+from contextlib import closing
+from datetime import datetime, timedelta
+
+from command_parser import FILE_NAME_MARKERS
+from task_context import current_task
+from tree_walker import walk
+
+SIZE_UNITS = {'b': 1, 'byte': 1, 'bytes': 1, 'k': 1024, 'kb': 1024, 'm': 1024 ** 2, 'mb': 1024 ** 2,
+              'g': 1024 ** 3, 'gb': 1024 ** 3, 't': 1024 ** 4, 'tb': 1024 ** 4}
+AGE_UNITS = {'minute': 60, 'hour': 3600, 'day': 86400, 'week': 7 * 86400, 'month': 30 * 86400, 'year': 365 * 86400}
+
+# Spoken file kinds (singular) and the extensions they cover
+TYPE_EXTENSIONS = {
+    'pdf': ('pdf',),
+    'document': ('pdf', 'doc', 'docx', 'odt', 'rtf', 'txt', 'md'),
+    'doc': ('doc', 'docx', 'odt', 'rtf'),
+    'spreadsheet': ('xls', 'xlsx', 'ods', 'csv'),
+    'presentation': ('ppt', 'pptx', 'odp', 'key'),
+    'image': ('jpg', 'jpeg', 'png', 'gif', 'bmp', 'webp', 'heic', 'tif', 'tiff', 'svg'),
+    'photo': ('jpg', 'jpeg', 'png', 'heic', 'raw', 'cr2', 'nef', 'dng'),
+    'picture': ('jpg', 'jpeg', 'png', 'gif', 'bmp', 'webp', 'heic'),
+    'video': ('mp4', 'mkv', 'mov', 'avi', 'wmv', 'webm', 'm4v'),
+    'movie': ('mp4', 'mkv', 'mov', 'avi', 'wmv', 'webm', 'm4v'),
+    'song': ('mp3', 'flac', 'wav', 'aac', 'ogg', 'm4a'),
+    'audio': ('mp3', 'flac', 'wav', 'aac', 'ogg', 'm4a'),
+    'music': ('mp3', 'flac', 'wav', 'aac', 'ogg', 'm4a'),
+    'archive': ('zip', 'rar', '7z', 'tar', 'gz', 'bz2', 'xz'),
+    'installer': ('exe', 'msi', 'dmg', 'pkg', 'deb', 'rpm', 'appimage'),
+}
+
+_SIZE_RE = re.compile(
+    r'\b(bigger|larger|greater|more|over|above|at least|smaller|less|under|below|at most)\s+(?:than\s+)?'
+    r'(\d+(?:\.\d+)?)\s*(bytes?|[kmgt]?b|[kmgt])\b')
+_LAST_N_RE = re.compile(r'\b(?:last|past|within)\s+(\d+)\s+(minute|hour|day|week|month|year)s?\b')
+_OLDER_RE = re.compile(r'\b(?:older than|more than|not (?:modified|changed|touched) (?:in|for))\s+'
+                       r'(\d+)\s+(minute|hour|day|week|month|year)s?(?:\s+old)?\b')
+_REGEX_RE = re.compile(r'\b(?:regex|regexp|pattern)\s+(\S+)')
+_GLOB_CHARS = frozenset('*?[')
+
+_SEARCH_VERBS = frozenset(['find', 'search', 'locate', 'look', 'show', 'list', 'get'])
+# Words that end a "named X" phrase and are never part of a file name
+_PREDICATE_WORDS = frozenset([
+    'bigger', 'larger', 'greater', 'more', 'over', 'above', 'smaller', 'less', 'under', 'below', 'at',
+    'than', 'modified', 'changed', 'edited', 'created', 'updated', 'touched', 'from', 'since', 'in',
+    'this', 'last', 'past', 'within', 'today', 'yesterday', 'recent', 'recently', 'older', 'newer',
+    'that', 'which', 'are', 'were', 'not', 'regex', 'regexp', 'pattern',
+])
+_FILLER_WORDS = frozenset(['for', 'file', 'files', 'my', 'the', 'all', 'any', 'me', 'a', 'an', 'of', 'and',
+                           'week', 'month', 'year', 'day', 'days', 'weeks', 'months', 'years', 'hours', 'ago',
+                           'old', 'named', 'called', 'matching', 'with', 'name'])
+
+
+class FileQuery(namedtuple('_FileQuery', ['name', 'glob', 'regex', 'extensions', 'min_size', 'max_size',
+                                          'newer_than', 'older_than'])):
+    """What to search for; unset criteria are None.
+
+    ``name`` is a lowercase substring, ``glob`` a lowercase shell pattern and
+    ``regex`` a compiled case-insensitive pattern, all tested against the
+    file name. ``extensions`` is a frozenset without dots. Sizes are bytes,
+    and ``newer_than`` / ``older_than`` are epoch seconds bounding the mtime.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_pattern(cls, pattern):
+        """Query for a typed pattern: "*.pdf" or ".pdf" -> extension, "report*" -> glob, else substring"""
+        text = pattern.strip().lower()
+        if text.startswith('*.') and not _GLOB_CHARS.intersection(text[2:]) \
+                or (text.startswith('.') and '.' not in text[1:]):
+            return cls(None, None, None, frozenset([text.lstrip('*.')]), None, None, None, None)
+        if _GLOB_CHARS.intersection(text):
+            return cls(None, text, None, None, None, None, None, None)
+        return cls(text or None, None, None, None, None, None, None, None)
+
+    @property
+    def needs_stat(self):
+        return not (self.min_size is None and self.max_size is None
+                    and self.newer_than is None and self.older_than is None)
+
+    def name_test(self):
+        """Function(name) -> bool for the name and extension criteria"""
+        tests = []
+        if self.extensions:
+            extensions = self.extensions
+            tests.append(lambda name: os.path.splitext(name)[1][1:].lower() in extensions)
+        if self.name:
+            needle = self.name
+            tests.append(lambda name: needle in name.lower())
+        if self.glob:
+            tests.append(re.compile(fnmatch.translate(self.glob), re.IGNORECASE).match)
+        if self.regex is not None:
+            tests.append(self.regex.search)
+        if not tests:
+            return lambda name: True
+        if len(tests) == 1:
+            return lambda name: bool(tests[0](name))
+        return lambda name: all(test(name) for test in tests)
+
+    def stat_matches(self, size, mtime):
+        return ((self.min_size is None or size >= self.min_size)
+                and (self.max_size is None or size <= self.max_size)
+                and (self.newer_than is None or mtime >= self.newer_than)
+                and (self.older_than is None or mtime < self.older_than))
+
+    def describe(self):
+        """Short human-readable summary, e.g. "'report', .pdf, > 10.0 MB, modified after Oct 12" """
+        parts = []
+        if self.name:
+            parts.append(f"'{self.name}'")
+        if self.glob:
+            parts.append(f"'{self.glob}'")
+        if self.regex is not None:
+            parts.append(f"/{self.regex.pattern}/")
+        if self.extensions:
+            parts.append(', '.join(f'.{ext}' for ext in sorted(self.extensions)))
+        if self.min_size is not None:
+            parts.append(f"> {format_size(self.min_size)}")
+        if self.max_size is not None:
+            parts.append(f"< {format_size(self.max_size)}")
+        if self.newer_than is not None:
+            parts.append(f"modified after {_format_time(self.newer_than)}")
+        if self.older_than is not None:
+            parts.append(f"modified before {_format_time(self.older_than)}")
+        return ', '.join(parts) or 'anything'
+
+
+def format_size(size):
+    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+        if size < 1024.0:
+            return f"{size:.1f} {unit}"
+        size /= 1024.0
+    return f"{size:.1f} PB"
+
+
+def _format_time(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M')
+
+
+def _time_range(text, now):
+    """(newer_than, older_than) epoch bounds spoken in text"""
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    newer = older = None
+    match = _LAST_N_RE.search(text)
+    if match:
+        newer = (now - timedelta(seconds=int(match.group(1)) * AGE_UNITS[match.group(2)])).timestamp()
+    elif 'yesterday' in text:
+        newer, older = (today - timedelta(days=1)).timestamp(), today.timestamp()
+    elif 'today' in text:
+        newer = today.timestamp()
+    elif 'this week' in text:
+        newer = (today - timedelta(days=today.weekday())).timestamp()
+    elif 'this month' in text:
+        newer = today.replace(day=1).timestamp()
+    elif 'this year' in text:
+        newer = today.replace(month=1, day=1).timestamp()
+    elif 'last week' in text or 'recent' in text:
+        newer = (now - timedelta(days=7)).timestamp()
+    elif 'last month' in text:
+        newer = (now - timedelta(days=30)).timestamp()
+    match = _OLDER_RE.search(text)
+    if match:
+        older = (now - timedelta(seconds=int(match.group(1)) * AGE_UNITS[match.group(2)])).timestamp()
+    return newer, older
+
+
+def _kind_extensions(token):
+    """Extensions for a spoken kind ('pdfs', 'photos', 'music'), or None"""
+    for word in (token, token[:-1] if token.endswith('s') else None, token[:-2] if token.endswith('es') else None):
+        if word and word in TYPE_EXTENSIONS:
+            return TYPE_EXTENSIONS[word]
+    return None
+
+
+def parse_file_query(command, now=None):
+    """FileQuery for a ParsedCommand like "find pdfs bigger than 10MB modified this week", or None"""
+    text = command.text
+    now = now or datetime.now()
+    tokens = command.tokens
+
+    min_size = max_size = None
+    for match in _SIZE_RE.finditer(text):
+        size = int(float(match.group(2)) * SIZE_UNITS[match.group(3)])
+        if match.group(1) in ('smaller', 'less', 'under', 'below', 'at most'):
+            max_size = size
+        else:
+            min_size = size
+    newer_than, older_than = _time_range(text, now)
+
+    regex = None
+    match = _REGEX_RE.search(command.raw)
+    if match:
+        try:
+            regex = re.compile(match.group(1), re.IGNORECASE)
+        except re.error:
+            regex = None
+
+    extensions = set()
+    glob = None
+    name_words = []
+    named = command.words_after(FILE_NAME_MARKERS)
+    if named:
+        for word in named.split():
+            if word.strip('.,!?') in _PREDICATE_WORDS or _SIZE_RE.match(word):
+                break
+            name_words.append(word.strip(",!?;\"'"))
+    skip = set()
+    if regex is not None:
+        skip.add(match.group(1).lower())
+    for i, token in enumerate(tokens):
+        if token in _SEARCH_VERBS or token in skip:
+            continue
+        if token.startswith('*.') and not _GLOB_CHARS.intersection(token[2:]):
+            extensions.add(token[2:])
+        elif token.startswith('.') and len(token) > 1 and token[1:].isalnum():
+            extensions.add(token[1:])
+        elif _kind_extensions(token):
+            extensions.update(_kind_extensions(token))
+        elif (i + 1 < len(tokens) and tokens[i + 1] in ('file', 'files') and token.isalnum()
+              and len(token) <= 5 and not token.isdigit() and token not in _FILLER_WORDS
+              and token not in _PREDICATE_WORDS):
+            # "py files", "mp4 files"
+            extensions.add(token)
+
+    if name_words:
+        name = ' '.join(name_words)
+        if _GLOB_CHARS.intersection(name):
+            glob, name = name, None
+    else:
+        name = None
+        leftovers = [t for t in tokens
+                     if t not in _SEARCH_VERBS and t not in _PREDICATE_WORDS and t not in _FILLER_WORDS
+                     and t not in skip and not t[0].isdigit() and t not in SIZE_UNITS
+                     and not _kind_extensions(t) and not t.startswith('.') and t != command.path
+                     and t.lstrip('*.') not in extensions]
+        globs = [t for t in leftovers if _GLOB_CHARS.intersection(t) and not t.startswith('*.')]
+        if globs:
+            glob = globs[-1]
+        elif leftovers and regex is None:
+            # Like the old matcher: the last remaining word is the name
+            name = leftovers[-1]
+    if glob and glob.startswith('*.') and not _GLOB_CHARS.intersection(glob[2:]):
+        extensions.add(glob[2:])
+        glob = None
+
+    query = FileQuery(name, glob, regex, frozenset(extensions) or None, min_size, max_size,
+                      newer_than, older_than)
+    if query == FileQuery(None, None, None, None, None, None, None, None):
+        return None
+    return query
+
+
+def find_files(query, roots, excludes=None):
+    """Yield (path, size, mtime) for every file below roots matching query, as the walk finds them.
+
+    Progress and cancellation go through current_task(); closing the
+    generator stops the walk.
+    """
+    name_ok = query.name_test()
+    task = current_task()
+    matched = 0
+    with closing(walk(roots, excludes)) as entries:
+        for scanned, entry in enumerate(entries, 1):
+            if scanned % 500 == 0:
+                task.check()
+                task.report(f"🔍 Searched {scanned:,} files, {matched} matches so far...")
+            if not name_ok(entry.name):
+                continue
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            if query.stat_matches(st.st_size, st.st_mtime):
+                matched += 1
+                yield entry.path, st.st_size, st.st_mtime
+
+
+def format_match(path, size, mtime):
+    return f"📄 {path} ({format_size(size)}, {_format_time(mtime)})"
@@ -0,0 +1,158 @@
+# fuzzy_match.py - Typo/mishearing tolerant alias lookup over a character-trigram index
+"""
+Aliases are compared in a "compact" form (lowercase, letters and digits
+only) so that split or merged words ("fire fox", "vs code" / "vscode") line
+up. Candidates are gathered from a trigram inverted index (bucketed by
+alias length, so only reachable lengths are read), the ones sharing
+the most trigrams are verified with a bounded Levenshtein distance, and the
+whole lookup stops once its time budget is spent.
+"""
+import re
+import time
+from collections import Counter, namedtuple
+from itertools import chain
+
+FuzzyMatch = namedtuple('FuzzyMatch', ['alias', 'payload', 'distance', 'score'])
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def compact(text):
+    """Lowercase text with everything but letters and digits removed"""
+    return _NON_ALNUM.sub('', text.lower())
+
+
+def trigrams(word):
+    padded = f'^{word}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _pattern(a):
+    """Per-character match bitmasks of a, reusable across many comparisons"""
+    peq = {}
+    for i, ch in enumerate(a):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    return peq, len(a)
+
+
+def _bit_parallel_distance(pattern, b, max_distance):
+    peq, length = pattern
+    if abs(length - len(b)) > max_distance:
+        return max_distance + 1
+    if not length or not b:
+        return max(length, len(b))
+    full = (1 << length) - 1
+    last = 1 << (length - 1)
+    pv, mv, distance = full, 0, length
+    remaining = len(b)
+    for ch in b:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = ((((eq & pv) + pv) & full) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & last:
+            distance += 1
+        elif mh & last:
+            distance -= 1
+        remaining -= 1
+        # The distance can shrink by at most one per remaining character
+        if distance - remaining > max_distance:
+            return max_distance + 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+    return min(distance, max_distance + 1)
+
+
+def bounded_levenshtein(a, b, max_distance):
+    """Edit distance between a and b, or max_distance + 1 once it is known to exceed it.
+
+    Bit-parallel (Myers/Hyyrö) so each character of b costs a handful of int ops.
+    """
+    return _bit_parallel_distance(_pattern(a), b, max_distance)
+
+
+class FuzzyMatcher:
+    """Trigram inverted index over aliases with edit-distance verification"""
+
+    def __init__(self, aliases=()):
+        self._aliases = []
+        self._compact = []
+        self._payloads = []
+        self._postings = {}
+        for alias, payload in aliases:
+            self.add(alias, payload)
+
+    def add(self, alias, payload):
+        key = compact(alias)
+        if len(key) < 2:
+            return
+        alias_id = len(self._aliases)
+        self._aliases.append(alias)
+        self._compact.append(key)
+        self._payloads.append(payload)
+        # Postings are split by alias length so a query only touches lengths it can reach
+        for gram in trigrams(key):
+            self._postings.setdefault((gram, len(key)), []).append(alias_id)
+
+    def __len__(self):
+        return len(self._aliases)
+
+    def search(self, query, limit=3, max_candidates=40, budget_ms=2.0):
+        """Return up to `limit` FuzzyMatch results, best first, within the time budget"""
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        key = compact(query)
+        if len(key) < 2:
+            return []
+        query_grams = trigrams(key)
+        max_distance = max(1, len(key) // 3)
+        postings = self._postings
+        buckets = [(gram, length) for gram in query_grams
+                   for length in range(len(key) - max_distance, len(key) + max_distance + 1)]
+        shared = Counter(chain.from_iterable(postings[b] for b in buckets if b in postings))
+        if not shared:
+            return []
+        pattern = _pattern(key)
+        best = {}
+        for alias_id, count in shared.most_common(max_candidates):
+            # q-gram lemma: each edit destroys at most 3 of the len+1 padded trigrams, so
+            # later (lower-count) candidates cannot beat `limit` matches that are already closer
+            lower_bound = -(-(len(key) + 1 - count) // 3)
+            if len(best) >= limit and lower_bound > max(m.distance for m in best.values()):
+                break
+            if time.perf_counter() > deadline:
+                break
+            candidate = self._compact[alias_id]
+            if count < max(len(key), len(candidate)) + 1 - 3 * max_distance:
+                continue
+            distance = _bit_parallel_distance(pattern, candidate, max_distance)
+            if distance > max_distance:
+                continue
+            payload = self._payloads[alias_id]
+            score = 1.0 - distance / max(len(key), len(candidate))
+            marker = id(payload)
+            if marker not in best or best[marker].score < score:
+                best[marker] = FuzzyMatch(self._aliases[alias_id], payload, distance, score)
+        return sorted(best.values(), key=lambda m: (-m.score, m.distance))[:limit]
+
+    def best(self, query, **kwargs):
+        """Best FuzzyMatch for query, or None"""
+        matches = self.search(query, limit=1, **kwargs)
+        return matches[0] if matches else None
+
+    def search_phrases(self, tokens, limit=3, max_words=3, budget_ms=2.0):
+        """Search every run of up to `max_words` consecutive tokens and merge the results"""
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        best = {}
+        for size in range(min(max_words, len(tokens)), 0, -1):
+            for start in range(len(tokens) - size + 1):
+                remaining_ms = (deadline - time.perf_counter()) * 1000.0
+                if remaining_ms <= 0:
+                    break
+                for match in self.search(' '.join(tokens[start:start + size]), limit, budget_ms=remaining_ms):
+                    marker = id(match.payload)
+                    if marker not in best or best[marker].score < match.score:
+                        best[marker] = match
+        return sorted(best.values(), key=lambda m: (-m.score, m.distance))[:limit]
@@ -0,0 +1,176 @@
+# history_log.py - Append-only SQLite log of conversation turns with batched writes
+"""
+Finished turns are queued in memory and written by a single background
+thread in batches (every `batch_size` turns or `flush_interval` seconds,
+and at exit), so process_command never waits on the disk. Rows are only
+ever inserted. The log is indexed by session and time, and the text is
+also indexed in an FTS5 table when SQLite has FTS5 (otherwise text search
+falls back to LIKE).
+"""
+import atexit
+import queue
+import sqlite3
+import threading
+from datetime import datetime
+
+from user_paths import user_path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS turns (
+    id INTEGER PRIMARY KEY,
+    session TEXT NOT NULL,
+    ts REAL NOT NULL,
+    timestamp TEXT NOT NULL,
+    user TEXT NOT NULL,
+    response TEXT
+);
+CREATE INDEX IF NOT EXISTS turns_ts ON turns (ts);
+CREATE INDEX IF NOT EXISTS turns_session_ts ON turns (session, ts);
+"""
+
+# Turns allowed to wait for the writer; beyond this append() blocks instead of growing memory
+MAX_PENDING = 10000
+
+_STOP = object()
+
+
+def _epoch(value):
+    """Seconds since the epoch for a datetime, ISO string or number"""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp()
+    return float(value)
+
+
+class HistoryLog:
+    """Durable, searchable conversation log shared by all sessions"""
+
+    def __init__(self, path=None, batch_size=64, flush_interval=1.0):
+        self.path = path or user_path('history.sqlite3')
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=MAX_PENDING)
+        self._local = threading.local()
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        try:
+            conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS turns_fts USING fts5(user, response)")
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            self.has_fts = False
+        conn.commit()
+        self._writer = threading.Thread(target=self._write_loop, name='HistoryLog', daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ----------------------------
+    # Writing
+    # ----------------------------
+    def append(self, session_id, entry):
+        """Queue a finished turn ({'user', 'timestamp', 'response'}) for writing"""
+        self._queue.put((session_id, _epoch(entry['timestamp']), entry['timestamp'],
+                         entry['user'], entry['response']))
+
+    def flush(self):
+        """Block until every turn queued so far is on disk"""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self):
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+
+    def _write_loop(self):
+        conn = self._connect()
+        batch = []
+        waiters = []
+        stop = False
+        while not stop:
+            timeout = self.flush_interval if batch else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                stop = True
+            elif isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item is not None:
+                batch.append(item)
+                if len(batch) < self.batch_size:
+                    continue
+            if batch:
+                self._write_batch(conn, batch)
+                batch = []
+            for waiter in waiters:
+                waiter.set()
+            waiters = []
+
+    def _write_batch(self, conn, batch):
+        try:
+            with conn:
+                text_rows = []
+                for row in batch:
+                    cursor = conn.execute(
+                        "INSERT INTO turns (session, ts, timestamp, user, response) VALUES (?, ?, ?, ?, ?)", row)
+                    text_rows.append((cursor.lastrowid, row[3], row[4] or ''))
+                if self.has_fts:
+                    conn.executemany("INSERT INTO turns_fts (rowid, user, response) VALUES (?, ?, ?)", text_rows)
+        except sqlite3.Error as e:
+            print(f"⚠️ Unable to write conversation history: {e}")
+
+    # ----------------------------
+    # Queries
+    # ----------------------------
+    def _rows(self, sql, params):
+        cursor = self._connect().execute(sql, params)
+        return [{'session': session, 'timestamp': timestamp, 'user': user, 'response': response}
+                for session, timestamp, user, response in cursor]
+
+    def recent(self, session_id, limit):
+        """Last `limit` turns of a session, oldest first"""
+        rows = self._rows("SELECT session, timestamp, user, response FROM turns WHERE session = ? "
+                          "ORDER BY ts DESC, id DESC LIMIT ?", (session_id, limit))
+        return rows[::-1]
+
+    def between(self, start, end, session_id=None, limit=1000):
+        """Turns with start <= time < end (datetimes, ISO strings or epoch seconds), oldest first"""
+        sql = "SELECT session, timestamp, user, response FROM turns WHERE ts >= ? AND ts < ?"
+        params = [_epoch(start), _epoch(end)]
+        if session_id is not None:
+            sql += " AND session = ?"
+            params.append(session_id)
+        return self._rows(sql + " ORDER BY ts, id LIMIT ?", params + [limit])
+
+    def search(self, text, session_id=None, limit=50):
+        """Turns whose command or response contains text, newest first"""
+        if not text.strip():
+            return []
+        if self.has_fts:
+            # Quote each word so user text is never parsed as FTS query syntax
+            words = [w.replace('"', '""') for w in text.split()]
+            query = ' '.join(f'"{w}"' for w in words)
+            sql = ("SELECT t.session, t.timestamp, t.user, t.response FROM turns_fts f "
+                   "JOIN turns t ON t.id = f.rowid WHERE turns_fts MATCH ?")
+            params = [query]
+        else:
+            pattern = f"%{text}%"
+            sql = ("SELECT t.session, t.timestamp, t.user, t.response FROM turns t "
+                   "WHERE (t.user LIKE ? OR t.response LIKE ?)")
+            params = [pattern, pattern]
+        if session_id is not None:
+            sql += " AND t.session = ?"
+            params.append(session_id)
+        return self._rows(sql + " ORDER BY t.ts DESC, t.id DESC LIMIT ?", params + [limit])
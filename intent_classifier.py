@@ -0,0 +1,188 @@
+# intent_classifier.py - Hashed n-gram + softmax intent classifier for AICore routing
+"""
+Optional learned router for AICore.process_command.
+
+Features are hashed word unigrams/bigrams and character trigrams, so the
+model needs no vocabulary file. A multinomial logistic regression is
+trained offline from data/intent_corpus.tsv and stored as a small .npz:
+
+    python intent_classifier.py train            # writes data/intent_model.npz
+    python benchmarks/intent_classifier_report.py
+"""
+import os
+import sys
+import zlib
+
+import numpy as np
+
+from intent_matcher import tokenize
+from user_paths import data_path
+
+CORPUS_PATH = data_path('intent_corpus.tsv')
+MODEL_PATH = data_path('intent_model.npz')
+DEFAULT_DIMS = 1 << 12
+
+
+def load_corpus(path=CORPUS_PATH):
+    """Read (labels, texts) from a label<TAB>text file, skipping comments"""
+    labels, texts = [], []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line or line.startswith('#') or '\t' not in line:
+                continue
+            label, text = line.split('\t', 1)
+            labels.append(label.strip())
+            texts.append(text.strip().lower())
+    return labels, texts
+
+
+class HashingFeaturizer:
+    """Map text to sparse hashed n-gram features (indices, weights)"""
+
+    def __init__(self, dims=DEFAULT_DIMS):
+        self.dims = dims
+        self._mask = dims - 1
+        self._cache = {}
+
+    def _hash(self, gram):
+        index = self._cache.get(gram)
+        if index is None:
+            index = zlib.crc32(gram.encode('utf-8')) & self._mask
+            if len(self._cache) < 50000:
+                self._cache[gram] = index
+        return index
+
+    def features(self, text):
+        """Return (indices, values) with sublinear tf and L2 normalisation"""
+        tokens = tokenize(text)
+        counts = {}
+        h = self._hash
+        for i, token in enumerate(tokens):
+            idx = h('w:' + token)
+            counts[idx] = counts.get(idx, 0) + 1
+            if i:
+                idx = h('b:' + tokens[i - 1] + ' ' + token)
+                counts[idx] = counts.get(idx, 0) + 1
+            padded = '<' + token + '>'
+            for j in range(len(padded) - 2):
+                idx = h('c:' + padded[j:j + 3])
+                counts[idx] = counts.get(idx, 0) + 0.25
+        if not counts:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+        indices = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+        values = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)) + 1e-6)
+        values /= np.sqrt(np.dot(values, values))
+        return indices, values
+
+    def batch(self, texts):
+        """Featurize many texts into CSR arrays (indptr, indices, values)"""
+        indptr = [0]
+        all_indices, all_values = [], []
+        for text in texts:
+            indices, values = self.features(text)
+            all_indices.append(indices)
+            all_values.append(values)
+            indptr.append(indptr[-1] + len(indices))
+        indices = np.concatenate(all_indices) if all_indices else np.zeros(0, dtype=np.int32)
+        values = np.concatenate(all_values) if all_values else np.zeros(0, dtype=np.float32)
+        return np.asarray(indptr, dtype=np.int64), indices, values
+
+    def dense(self, texts):
+        """Featurize texts into a dense (n, dims) matrix, used for training"""
+        indptr, indices, values = self.batch(texts)
+        matrix = np.zeros((len(texts), self.dims), dtype=np.float32)
+        rows = np.repeat(np.arange(len(texts)), np.diff(indptr))
+        np.add.at(matrix, (rows, indices), values)
+        return matrix
+
+
+class IntentClassifier:
+    """Linear softmax model over hashed features with vectorized batch inference"""
+
+    def __init__(self, labels, weights, bias, dims=DEFAULT_DIMS):
+        self.labels = list(labels)
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.bias = np.asarray(bias, dtype=np.float32)
+        self.featurizer = HashingFeaturizer(dims)
+
+    @classmethod
+    def train(cls, labels, texts, dims=DEFAULT_DIMS, epochs=300, learning_rate=2.0, l2=1e-4):
+        """Fit a multinomial logistic regression with full-batch gradient descent"""
+        classes = sorted(set(labels))
+        class_index = {label: i for i, label in enumerate(classes)}
+        y = np.array([class_index[label] for label in labels])
+        X = HashingFeaturizer(dims).dense(texts)
+        n = len(texts)
+        onehot = np.zeros((n, len(classes)), dtype=np.float32)
+        onehot[np.arange(n), y] = 1.0
+        W = np.zeros((dims, len(classes)), dtype=np.float32)
+        b = np.zeros(len(classes), dtype=np.float32)
+        for _ in range(epochs):
+            probs = _softmax(X @ W + b)
+            error = (probs - onehot) / n
+            W -= learning_rate * (X.T @ error + l2 * W)
+            b -= learning_rate * error.sum(axis=0)
+        return cls(classes, W, b, dims)
+
+    def save(self, path=MODEL_PATH):
+        """Write the model as a compressed .npz with float16 weights"""
+        np.savez_compressed(
+            path,
+            labels=np.array(self.labels),
+            weights=self.weights.astype(np.float16),
+            bias=self.bias,
+            dims=np.array(self.featurizer.dims),
+        )
+
+    @classmethod
+    def load(cls, path=MODEL_PATH):
+        """Load a model written by save()"""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['labels'].tolist(), data['weights'].astype(np.float32),
+                       data['bias'], int(data['dims']))
+
+    def predict_proba(self, texts):
+        """Return an (n, classes) probability matrix for a batch of texts"""
+        indptr, indices, values = self.featurizer.batch(texts)
+        contributions = self.weights[indices] * values[:, None]
+        scores = np.zeros((len(texts), len(self.labels)), dtype=np.float32)
+        nonempty = np.diff(indptr) > 0
+        if contributions.size:
+            sums = np.add.reduceat(contributions, indptr[:-1][nonempty], axis=0)
+            scores[nonempty] = sums
+        return _softmax(scores + self.bias)
+
+    def predict(self, texts):
+        """Return [(label, confidence), ...] for a batch of texts"""
+        probs = self.predict_proba(texts)
+        best = probs.argmax(axis=1)
+        return [(self.labels[i], float(probs[row, i])) for row, i in enumerate(best)]
+
+    def classify(self, text):
+        """Return (label, confidence) for a single utterance"""
+        indices, values = self.featurizer.features(text)
+        scores = values @ self.weights[indices] + self.bias if len(indices) else self.bias.copy()
+        probs = _softmax(scores[None, :])[0]
+        best = int(probs.argmax())
+        return self.labels[best], float(probs[best])
+
+
+def _softmax(scores):
+    scores = scores - scores.max(axis=1, keepdims=True)
+    exp = np.exp(scores)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != 'train':
+        print("Usage: python intent_classifier.py train [corpus.tsv] [model.npz]")
+        sys.exit(1)
+    corpus = sys.argv[2] if len(sys.argv) > 2 else CORPUS_PATH
+    output = sys.argv[3] if len(sys.argv) > 3 else MODEL_PATH
+    labels, texts = load_corpus(corpus)
+    model = IntentClassifier.train(labels, texts)
+    model.save(output)
+    train_accuracy = np.mean([label == predicted for label, (predicted, _) in zip(labels, model.predict(texts))])
+    print(f"✅ Trained on {len(texts)} utterances, {len(model.labels)} intents "
+          f"(train accuracy {train_accuracy:.1%}) -> {output} ({os.path.getsize(output) / 1024:.1f} KB)")
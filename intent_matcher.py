@@ -0,0 +1,147 @@
+# intent_matcher.py - Compiled keyword matcher used to route commands in AICore
+import re
+from collections import namedtuple
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:['.+#\-/:_][a-z0-9]+)*")
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class PhraseIndex:
+    """Token trie that finds multi-word phrases in a single pass over a token list"""
+
+    # Terminal marker; tokens are never empty so it cannot collide, and it survives pickling
+    _END = ''
+
+    def __init__(self):
+        self._root = {}
+        self.max_phrase_len = 0
+
+    def add(self, phrase, payload):
+        """Register a phrase (str or token sequence) with an associated payload"""
+        tokens = tokenize(phrase) if isinstance(phrase, str) else list(phrase)
+        if not tokens:
+            return
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node.setdefault(self._END, []).append(payload)
+        self.max_phrase_len = max(self.max_phrase_len, len(tokens))
+
+    def __len__(self):
+        count = 0
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            for key, child in node.items():
+                if key is self._END:
+                    count += len(child)
+                else:
+                    stack.append(child)
+        return count
+
+    def find_all(self, tokens):
+        """Yield (start, end, payloads) for every phrase occurrence, overlapping included"""
+        root = self._root
+        for start in range(len(tokens)):
+            node = root.get(tokens[start])
+            end = start + 1
+            while node is not None:
+                payloads = node.get(self._END)
+                if payloads:
+                    yield start, end, payloads
+                if end >= len(tokens):
+                    break
+                node = node.get(tokens[end])
+                end += 1
+
+    def longest_matches(self, tokens):
+        """Return non-overlapping (start, end, payloads), preferring the longest phrase at each position"""
+        matches = []
+        root = self._root
+        start = 0
+        while start < len(tokens):
+            node = root.get(tokens[start])
+            end = start + 1
+            best = None
+            while node is not None:
+                payloads = node.get(self._END)
+                if payloads:
+                    best = (start, end, payloads)
+                if end >= len(tokens):
+                    break
+                node = node.get(tokens[end])
+                end += 1
+            if best:
+                matches.append(best)
+                start = best[1]
+            else:
+                start += 1
+        return matches
+
+
+IntentCandidate = namedtuple('IntentCandidate', ['intent', 'score', 'keywords'])
+
+
+class IntentMatcher:
+    """Find every intent keyword in one pass and rank the candidate intents.
+
+    ``intent_keywords`` is an ordered mapping of intent name to keyword phrases.
+    Keywords only match on word boundaries, so "restart" never triggers "start".
+    Candidates are ranked by number of keyword hits, then by declaration order.
+    """
+
+    def __init__(self, intent_keywords):
+        self.intents = list(intent_keywords)
+        self._priority = {intent: i for i, intent in enumerate(self.intents)}
+        self._index = PhraseIndex()
+        self._single = {}
+        for intent, keywords in intent_keywords.items():
+            for keyword in keywords:
+                tokens = tokenize(keyword)
+                if len(tokens) == 1:
+                    self._single.setdefault(tokens[0], []).append((intent, keyword))
+                else:
+                    self._index.add(tokens, (intent, keyword))
+
+    def match(self, text_or_tokens):
+        """Return ranked IntentCandidate tuples for the given text or token list"""
+        tokens = tokenize(text_or_tokens) if isinstance(text_or_tokens, str) else text_or_tokens
+        hits = {}
+        single = self._single
+        for token in tokens:
+            payloads = single.get(token)
+            if payloads:
+                for intent, keyword in payloads:
+                    hits.setdefault(intent, []).append(keyword)
+        if self._index.max_phrase_len:
+            for _, _, payloads in self._index.find_all(tokens):
+                for intent, keyword in payloads:
+                    hits.setdefault(intent, []).append(keyword)
+        if not hits:
+            return []
+        priority = self._priority
+        ranked = sorted(hits.items(), key=lambda item: (-len(item[1]), priority[item[0]]))
+        return [IntentCandidate(intent, len(keywords), tuple(keywords)) for intent, keywords in ranked]
+
+    def best(self, text_or_tokens):
+        """Return the top-ranked intent name, or None (match()[0] without building the ranking)"""
+        tokens = tokenize(text_or_tokens) if isinstance(text_or_tokens, str) else text_or_tokens
+        counts = {}
+        single = self._single
+        for token in tokens:
+            payloads = single.get(token)
+            if payloads:
+                for intent, _ in payloads:
+                    counts[intent] = counts.get(intent, 0) + 1
+        if self._index.max_phrase_len:
+            for _, _, payloads in self._index.find_all(tokens):
+                for intent, _ in payloads:
+                    counts[intent] = counts.get(intent, 0) + 1
+        if not counts:
+            return None
+        priority = self._priority
+        return min(counts, key=lambda intent: (-counts[intent], priority[intent]))
@@ -0,0 +1,90 @@
+# launcher_cache.py - Persistent app key -> executable path cache for the app launcher
+import json
+import os
+import shutil
+import stat
+import threading
+
+from app_indexer import exec_program
+from user_paths import cache_path, write_atomic
+
+
+class LauncherCache:
+    """On-disk map of app key -> resolved executable, validated with one stat per use"""
+
+    def __init__(self, path=None):
+        self.path = path or cache_path('launchers.json')
+        self.entries = {}
+        self._save_lock = threading.Lock()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def get(self, app_key):
+        """Cached executable path for app_key if it still exists, else None"""
+        entry = self.entries.get(app_key)
+        if not entry:
+            return None
+        try:
+            st = os.stat(entry['path'])
+        except OSError:
+            self.forget(app_key)
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            self.forget(app_key)
+            return None
+        if st.st_mtime_ns != entry.get('mtime_ns'):
+            # Binary was updated in place; the path is still good, just refresh the stamp
+            self.put(app_key, entry['path'], st)
+        return entry['path']
+
+    def put(self, app_key, path, st=None):
+        """Remember the executable path for app_key"""
+        try:
+            st = st or os.stat(path)
+        except OSError:
+            return
+        self.entries[app_key] = {'path': path, 'mtime_ns': st.st_mtime_ns}
+        self._save()
+
+    def forget(self, app_key):
+        if self.entries.pop(app_key, None) is not None:
+            self._save()
+
+    def _save(self):
+        # Serialize a snapshot under the lock so concurrent launches never write a stale file last
+        try:
+            with self._save_lock:
+                write_atomic(self.path, json.dumps(dict(self.entries), indent=1).encode('utf-8'))
+        except OSError as e:
+            print(f"⚠️ Unable to save launcher cache: {e}")
+
+    def resolve_unix(self, app_info, index=None):
+        """Cached path, else resolve via the installed-app index (PATH + .desktop) and cache it"""
+        key = app_info.get('key') or app_info['executable']
+        cached = self.get(key)
+        if cached:
+            return cached
+        candidates = []
+        if app_info.get('executable'):
+            candidates.append(app_info['executable'])
+        if index is not None:
+            for name in [app_info.get('executable')] + list(app_info.get('names', [])):
+                installed = index.find(name)
+                if installed and installed['kind'] == 'desktop':
+                    candidates.append(exec_program(installed['exec']))
+        for program in candidates:
+            path = self._which(program, index)
+            if path:
+                self.put(key, path)
+                return path
+        return None
+
+    def _which(self, program, index=None):
+        if not program:
+            return None
+        if os.path.isabs(program):
+            return program if os.path.isfile(program) else None
+        return (index.executable(program) if index is not None else None) or shutil.which(program)
@@ -0,0 +1,197 @@
+# scan_history.py - Saved storage scan snapshots and "what grew" diffs between them
+"""
+Every folder size scan is saved as a snapshot: one (path id, size, mtime)
+row per directory, in an SQLite database in the user directory. Paths are
+stored once in a shared table and referred to by id, so a snapshot is a
+few integers per row.
+
+Rows are clustered on (snapshot, path id), so a snapshot can be read back
+in path-id order without sorting. diff() reads the two snapshots side by
+side and merges them (a sort-merge join). Memory stays bounded: only the
+top changes are kept, in a heap.
+
+Sizes are recursive, so when /var/log/app grows, /var/log, /var and the
+root grow by the same amount. The report drops an entry when one of its
+descendants in the candidate list explains at least EXPLAINED of its
+growth, so the most specific folder is listed.
+
+Each snapshot records the SNAPSHOT_VERSION it was taken with. When the
+scan's rules change (which folders are sized), the version is bumped and
+what_grew() only compares snapshots of the newest version, so a rule
+change never shows up as growth.
+"""
+import heapq
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from user_paths import user_path
+
+SNAPSHOT_VERSION = 2  # 2: dir_sizes sizes .git, node_modules etc. too
+KEEP_SNAPSHOTS = 10  # per root; older snapshots are deleted
+EXPLAINED = 0.9
+FETCH_ROWS = 10000
+CANDIDATES_PER_RESULT = 4
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS paths (id INTEGER PRIMARY KEY, path TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    root TEXT NOT NULL,
+    taken_at REAL NOT NULL,
+    entries INTEGER NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS snapshots_root ON snapshots (root, taken_at);
+CREATE TABLE IF NOT EXISTS entries (
+    snapshot INTEGER NOT NULL,
+    path_id INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime INTEGER,
+    PRIMARY KEY (snapshot, path_id)
+) WITHOUT ROWID;
+"""
+
+Snapshot = namedtuple('Snapshot', ['id', 'root', 'taken_at', 'entries', 'version'])
+Change = namedtuple('Change', ['path', 'old_size', 'new_size'])
+SnapshotDiff = namedtuple('SnapshotDiff', ['old', 'new', 'changes', 'grown', 'shrunk', 'total_change'])
+
+
+def _rows(conn, snapshot_id):
+    cursor = conn.execute("SELECT path_id, size FROM entries WHERE snapshot = ? ORDER BY path_id", (snapshot_id,))
+    while True:
+        batch = cursor.fetchmany(FETCH_ROWS)
+        if not batch:
+            return
+        yield from batch
+
+
+def _merge(old_rows, new_rows):
+    """(path_id, old_size, new_size) for ids whose size differs; a missing side counts as 0"""
+    old, new = next(old_rows, None), next(new_rows, None)
+    while old is not None or new is not None:
+        if new is None or (old is not None and old[0] < new[0]):
+            yield old[0], old[1], 0
+            old = next(old_rows, None)
+        elif old is None or new[0] < old[0]:
+            yield new[0], 0, new[1]
+            new = next(new_rows, None)
+        else:
+            if old[1] != new[1]:
+                yield old[0], old[1], new[1]
+            old, new = next(old_rows, None), next(new_rows, None)
+
+
+def _most_specific(changes, limit):
+    """Drop changes whose growth is mostly explained by a listed descendant"""
+    kept = []
+    for change in changes:
+        growth = change.new_size - change.old_size
+        prefix = change.path.rstrip(os.sep) + os.sep
+        explained = any(other.path.startswith(prefix) and other.new_size - other.old_size >= growth * EXPLAINED
+                        for other in changes)
+        if not explained:
+            kept.append(change)
+    return kept[:limit]
+
+
+class ScanHistory:
+    """Snapshots of folder size scans, per root"""
+
+    def __init__(self, path=None):
+        self.path = path or user_path('scan_history.sqlite3')
+        self._local = threading.local()
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        # Databases from before snapshot versions: their snapshots count as version 1
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(snapshots)")]
+        if 'version' not in columns:
+            conn.execute("ALTER TABLE snapshots ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+        conn.commit()
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def record(self, root, rows, taken_at=None, version=SNAPSHOT_VERSION):
+        """Save (path, size, mtime) rows as a new snapshot of root; returns its Snapshot"""
+        conn = self._connect()
+        taken_at = taken_at or time.time()
+        with conn:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS staging (path TEXT, size INTEGER, mtime INTEGER)")
+            conn.execute("DELETE FROM staging")
+            conn.executemany("INSERT INTO staging VALUES (?, ?, ?)", rows)
+            conn.execute("INSERT OR IGNORE INTO paths (path) SELECT path FROM staging")
+            snapshot_id = conn.execute("INSERT INTO snapshots (root, taken_at, entries, version) "
+                                       "VALUES (?, ?, (SELECT COUNT(*) FROM staging), ?)",
+                                       (root, taken_at, version)).lastrowid
+            conn.execute("INSERT OR REPLACE INTO entries (snapshot, path_id, size, mtime) "
+                         "SELECT ?, paths.id, staging.size, staging.mtime FROM staging JOIN paths USING (path)",
+                         (snapshot_id,))
+            conn.execute("DELETE FROM staging")
+            self._prune(conn, root)
+        return self.snapshot(snapshot_id)
+
+    def record_tree(self, tree):
+        """Save a dir_sizes.SizeTree (recursive size and mtime of every folder)"""
+        return self.record(tree.root, zip(tree.paths(), tree.size, tree.mtime), tree.scanned_at)
+
+    def _prune(self, conn, root):
+        old = [row[0] for row in conn.execute("SELECT id FROM snapshots WHERE root = ? ORDER BY taken_at DESC "
+                                              "LIMIT -1 OFFSET ?", (root, KEEP_SNAPSHOTS))]
+        if not old:
+            return
+        conn.executemany("DELETE FROM entries WHERE snapshot = ?", [(i,) for i in old])
+        conn.executemany("DELETE FROM snapshots WHERE id = ?", [(i,) for i in old])
+        conn.execute("DELETE FROM paths WHERE id NOT IN (SELECT path_id FROM entries)")
+
+    def snapshot(self, snapshot_id):
+        row = self._connect().execute("SELECT id, root, taken_at, entries, version FROM snapshots WHERE id = ?",
+                                      (snapshot_id,)).fetchone()
+        return Snapshot(*row) if row else None
+
+    def snapshots(self, root):
+        """Snapshots of root, newest first"""
+        rows = self._connect().execute("SELECT id, root, taken_at, entries, version FROM snapshots WHERE root = ? "
+                                       "ORDER BY taken_at DESC", (os.path.abspath(root),))
+        return [Snapshot(*row) for row in rows]
+
+    def diff(self, old_id, new_id, limit=50):
+        """SnapshotDiff with the folders that grew most from old_id to new_id"""
+        conn = self._connect()
+        old, new = self.snapshot(old_id), self.snapshot(new_id)
+        # Sizes are recursive, so the root's own change is the net change of the whole tree
+        root_id = conn.execute("SELECT id FROM paths WHERE path = ?", (new.root,)).fetchone()
+        heap = []
+        grown = shrunk = total_change = 0
+        for path_id, old_size, new_size in _merge(_rows(conn, old_id), _rows(conn, new_id)):
+            if root_id and path_id == root_id[0]:
+                total_change = new_size - old_size
+            if new_size > old_size:
+                grown += 1
+                item = (new_size - old_size, path_id, old_size, new_size)
+                if len(heap) < limit * CANDIDATES_PER_RESULT:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+            else:
+                shrunk += 1
+        heap.sort(reverse=True)
+        names = dict(conn.execute(f"SELECT id, path FROM paths WHERE id IN ({','.join('?' * len(heap))})",
+                                  [item[1] for item in heap])) if heap else {}
+        changes = [Change(names[path_id], old_size, new_size) for _, path_id, old_size, new_size in heap]
+        return SnapshotDiff(old, new, _most_specific(changes, limit), grown, shrunk, total_change)
+
+    def what_grew(self, root, limit=50):
+        """Diff of the two latest snapshots of root, or None if there are fewer than two of the current version"""
+        latest = [snapshot for snapshot in self.snapshots(root) if snapshot.version == SNAPSHOT_VERSION][:2]
+        if len(latest) < 2:
+            return None
+        return self.diff(latest[1].id, latest[0].id, limit)
@@ -0,0 +1,70 @@
+# session.py - Per-client conversation state for a shared AICore
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+
+# Recent turns kept in memory per session; older ones live only in the HistoryLog
+HISTORY_CAPACITY = 200
+
+# How long an offer like "say yes to delete these files" stays open
+CONFIRM_SECONDS = 300
+
+
+def new_session_id(prefix='session'):
+    """Id that stays unique across processes and restarts, so logged histories never merge"""
+    return f"{prefix}-{uuid.uuid4().hex}"
+
+
+class Session:
+    """Conversation history for one client of a shared AICore.
+
+    AICore only holds shared, read-mostly resources (app catalog, indexes,
+    intent matcher), so commands from many sessions - or several commands
+    from one session - can run on different threads at once. Each command
+    fills in the history entry it created rather than ``history[-1]``.
+
+    ``history`` is a ring buffer of the last ``capacity`` turns. When a
+    HistoryLog is given, finished turns are also appended to it and a
+    session with a known id starts with its most recent logged turns.
+
+    A destructive action that needs a "yes" first is parked with
+    ``await_confirmation`` and handed back once by ``take_pending``.
+    """
+
+    def __init__(self, session_id=None, log=None, capacity=HISTORY_CAPACITY):
+        self.id = session_id or new_session_id()
+        self.created = datetime.now()
+        self.log = log
+        self.history = deque(maxlen=capacity)
+        self._pending = None
+        if log is not None and session_id:
+            for row in log.recent(session_id, capacity):
+                self.history.append({'user': row['user'], 'timestamp': row['timestamp'], 'response': row['response']})
+
+    def record(self, text):
+        """Append a history entry for a new command and return it"""
+        entry = {'user': text, 'timestamp': datetime.now().isoformat(), 'response': None}
+        self.history.append(entry)
+        return entry
+
+    def finish(self, entry, response):
+        """Store the response on its entry and queue the finished turn for the log"""
+        entry['response'] = response
+        if self.log is not None:
+            self.log.append(self.id, entry)
+
+    def search(self, text, limit=50):
+        """This session's logged turns mentioning text, newest first"""
+        return self.log.search(text, session_id=self.id, limit=limit) if self.log is not None else []
+
+    def await_confirmation(self, action):
+        """Park action (a callable returning a reply) until the next command confirms it"""
+        self._pending = (action, time.monotonic())
+
+    def take_pending(self):
+        """The parked action if it is still fresh, or None; either way it is no longer pending"""
+        pending, self._pending = self._pending, None
+        if pending is None or time.monotonic() - pending[1] > CONFIRM_SECONDS:
+            return None
+        return pending[0]
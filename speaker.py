@@ -0,0 +1,54 @@
+# speaker.py - Text-to-speech on a dedicated thread
+"""
+Speaker owns a pyttsx3 engine on its own daemon thread and reads texts
+from a queue, so say() returns at once and a long reply never blocks the
+GUI thread. The engine is created on that thread, since pyttsx3 engines
+must be driven from the thread that made them. Replies are spoken in
+order; clear() drops the ones not started yet.
+"""
+import queue
+import threading
+
+_STOP = object()
+
+
+class Speaker:
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='tts', daemon=True)
+        self._thread.start()
+
+    def say(self, text):
+        if text:
+            self._queue.put(text)
+
+    def clear(self):
+        """Forget replies that are still waiting to be spoken"""
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+
+    def shutdown(self):
+        self.clear()
+        self._queue.put(_STOP)
+
+    def _run(self):
+        try:
+            import pyttsx3
+            engine = pyttsx3.init()
+        except Exception as e:
+            print(f"Speech error: {e}")
+            engine = None
+        while True:
+            text = self._queue.get()
+            if text is _STOP:
+                break
+            if engine is None:
+                continue
+            try:
+                engine.say(text)
+                engine.runAndWait()
+            except Exception as e:
+                print(f"Speech error: {e}")
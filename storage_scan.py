@@ -0,0 +1,175 @@
+# storage_scan.py - Storage analyses over a directory tree for the storage panel and AICore
+"""
+largest_files() walks a tree (via tree_walker) and keeps a fixed-size
+min-heap of the N biggest files. Memory stays O(N) however many files the
+tree holds. While it runs, it emits ScanSnapshot objects through the
+current task (a few per second) so a UI can show the current top N and
+the counters before the walk finishes.
+
+breakdown() sorts every file into a type category and into modified and
+accessed age buckets. The walk only appends small integers (extension
+code, folder kind, size, times) to flat arrays. Every BREAKDOWN_CHUNK
+files those are turned into NumPy arrays and summed with bincount, so
+memory stays bounded and no per-file dictionary is updated.
+"""
+import heapq
+import os
+import time
+from array import array
+from collections import namedtuple
+
+import numpy as np
+
+from file_search import TYPE_EXTENSIONS
+from task_context import current_task
+from tree_walker import walk_files
+
+SNAPSHOT_INTERVAL = 0.3  # seconds between interim results
+CHECK_EVERY = 256  # files between cancellation checks
+BREAKDOWN_CHUNK = 65536  # files per vectorized aggregation step
+COLUMNS = ('extension', 'folder', 'size', 'mtime', 'atime')
+
+ScanSnapshot = namedtuple('ScanSnapshot', ['largest', 'files', 'bytes', 'done'])
+Share = namedtuple('Share', ['label', 'bytes', 'files'])
+Breakdown = namedtuple('Breakdown', ['root', 'files', 'bytes', 'categories', 'extensions', 'modified', 'accessed'])
+
+# Categories by extension; anything else is 'Other'
+CATEGORY_EXTENSIONS = {
+    'Videos': TYPE_EXTENSIONS['video'],
+    'Audio': TYPE_EXTENSIONS['audio'],
+    'Images': TYPE_EXTENSIONS['image'] + ('raw', 'cr2', 'nef', 'dng'),
+    'Documents': TYPE_EXTENSIONS['document'] + TYPE_EXTENSIONS['doc'] + TYPE_EXTENSIONS['spreadsheet']
+                 + TYPE_EXTENSIONS['presentation'],
+    'Archives': TYPE_EXTENSIONS['archive'] + ('tgz', 'zst', 'iso', 'img'),
+    'Installers': TYPE_EXTENSIONS['installer'],
+    'Build artifacts': ('o', 'obj', 'a', 'lib', 'pdb', 'ilk', 'pyc', 'pyo', 'class', 'whl', 'tsbuildinfo'),
+}
+# Folders whose whole content counts as caches or build artifacts, whatever the extension
+CACHE_FOLDERS = frozenset(['cache', '.cache', 'caches', 'cachestorage', 'code cache', 'gpucache', '__pycache__',
+                           'temp', 'tmp', '.npm', '.gradle', '.m2', '.pytest_cache', '.mypy_cache'])
+BUILD_FOLDERS = frozenset(['node_modules', 'build', 'dist', 'target', '.next', '.tox', '.venv', 'venv',
+                           'cmake-build-debug', 'cmake-build-release'])
+CATEGORIES = tuple(CATEGORY_EXTENSIONS) + ('Caches', 'Other')
+_CATEGORY_INDEX = {name: index for index, name in enumerate(CATEGORIES)}
+_EXTENSION_CATEGORY = {ext: _CATEGORY_INDEX[name] for name, exts in CATEGORY_EXTENSIONS.items() for ext in exts}
+
+DAY = 86400
+AGE_BUCKETS = (('Last week', 7 * DAY), ('Last month', 30 * DAY), ('Last 6 months', 182 * DAY),
+               ('Last year', 365 * DAY), ('1-3 years', 3 * 365 * DAY), ('Older', None))
+_AGE_EDGES = np.array([limit for _, limit in AGE_BUCKETS[:-1]], dtype=np.int64)
+
+
+def largest_files(root, limit=50, snapshot_interval=SNAPSHOT_INTERVAL):
+    """Final ScanSnapshot: the limit biggest (size, path) pairs, largest first, plus file/byte counters"""
+    task = current_task()
+    heap = []
+    files = total = 0
+    last_snapshot = time.monotonic()
+    # Dependency and VCS folders (node_modules, .git, .venv) often hold the biggest files, so nothing is skipped
+    for path, st in walk_files(root, excluded_names=()):
+        size = st.st_size
+        files += 1
+        total += size
+        if len(heap) < limit:
+            heapq.heappush(heap, (size, path))
+        elif size > heap[0][0]:
+            heapq.heapreplace(heap, (size, path))
+        if files % CHECK_EVERY == 0:
+            task.check()
+            now = time.monotonic()
+            if task.streaming and now - last_snapshot >= snapshot_interval:
+                last_snapshot = now
+                task.emit(ScanSnapshot(sorted(heap, reverse=True), files, total, False))
+    return ScanSnapshot(sorted(heap, reverse=True), files, total, True)
+
+
+def _folder_category(directory, root):
+    """Category index forced by a cache/build folder between root and directory, or -1"""
+    for part in os.path.relpath(directory, root).lower().split(os.sep):
+        if part in CACHE_FOLDERS:
+            return _CATEGORY_INDEX['Caches']
+        if part in BUILD_FOLDERS:
+            return _CATEGORY_INDEX['Build artifacts']
+    return -1
+
+
+def _ranked(shares):
+    """Non-empty shares, biggest first"""
+    return sorted((share for share in shares if share.files), key=lambda share: share.bytes, reverse=True)
+
+
+class _Totals:
+    """Bytes and file counts per bucket, grown as new buckets appear"""
+
+    def __init__(self, buckets=0):
+        self.bytes = np.zeros(buckets, dtype=np.int64)
+        self.files = np.zeros(buckets, dtype=np.int64)
+
+    def add(self, buckets, sizes, minlength):
+        minlength = max(minlength, len(self.bytes))
+        if minlength > len(self.bytes):
+            self.bytes = np.pad(self.bytes, (0, minlength - len(self.bytes)))
+            self.files = np.pad(self.files, (0, minlength - len(self.files)))
+        # bincount sums weights as float64, exact for byte counts below 2**53
+        self.bytes += np.rint(np.bincount(buckets, weights=sizes, minlength=minlength)).astype(np.int64)
+        self.files += np.bincount(buckets, minlength=minlength)
+
+    def shares(self, labels):
+        return [Share(label, int(self.bytes[i]), int(self.files[i])) for i, label in enumerate(labels)]
+
+
+def breakdown(root, now=None):
+    """Breakdown of the files below root by category, extension and modified/accessed age"""
+    task = current_task()
+    root = os.path.abspath(root)
+    now = int(now or time.time())
+    extensions = {}  # extension -> code
+    extension_category = []  # code -> category index
+    folder_category = {}  # directory -> forced category index or -1
+    columns = {name: array('q') for name in COLUMNS}
+    categories, by_extension = _Totals(len(CATEGORIES)), _Totals()
+    modified, accessed = _Totals(len(AGE_BUCKETS)), _Totals(len(AGE_BUCKETS))
+    files = 0
+
+    def flush():
+        if not columns['size']:
+            return
+        ext, forced, sizes, mtimes, atimes = (np.array(columns[name], dtype=np.int64) for name in COLUMNS)
+        category = np.where(forced >= 0, forced, np.asarray(extension_category, dtype=np.int64)[ext])
+        categories.add(category, sizes, len(CATEGORIES))
+        by_extension.add(ext, sizes, len(extension_category))
+        for totals, times in ((modified, mtimes), (accessed, atimes)):
+            totals.add(np.searchsorted(_AGE_EDGES, now - times, side='right'), sizes, len(AGE_BUCKETS))
+        for column in columns.values():
+            del column[:]
+
+    # Bound appends keep the per-file work to a few C calls
+    add_ext, add_folder, add_size, add_mtime, add_atime = (columns[name].append for name in COLUMNS)
+    for path, st in walk_files(root, excluded_names=()):
+        directory, _, name = path.rpartition(os.sep)
+        ext = name.rpartition('.')[2].lower() if '.' in name else ''
+        code = extensions.get(ext)
+        if code is None:
+            code = extensions[ext] = len(extension_category)
+            extension_category.append(_EXTENSION_CATEGORY.get(ext, _CATEGORY_INDEX['Other']))
+        forced = folder_category.get(directory)
+        if forced is None:
+            forced = folder_category[directory] = _folder_category(directory, root)
+        add_ext(code)
+        add_folder(forced)
+        add_size(st.st_size)
+        add_mtime(int(st.st_mtime))
+        add_atime(int(st.st_atime))
+        files += 1
+        if files % CHECK_EVERY == 0:
+            task.check()
+            if files % BREAKDOWN_CHUNK == 0:
+                task.report(f"📊 Sorting files by type and age: {files:,} files")
+                flush()
+    flush()
+
+    labels = sorted(extensions, key=extensions.get)
+    return Breakdown(root, files, int(categories.bytes.sum()), _ranked(categories.shares(CATEGORIES)),
+                     _ranked(by_extension.shares([f".{ext}" if ext else "(none)" for ext in labels])),
+                     modified.shares([label for label, _ in AGE_BUCKETS]),
+                     accessed.shares([label for label, _ in AGE_BUCKETS]))
@@ -0,0 +1,86 @@
+# task_context.py - Progress reporting and cooperative cancellation for running commands
+"""
+A TaskContext is attached to the thread that runs a command. Long-running
+code reaches it through current_task() to stream progress messages and to
+hit cancellation checkpoints, without every handler signature having to
+carry it. Outside a running command current_task() returns an idle context
+whose report() and check() do nothing.
+
+Commands that produce results gradually (file search) can also emit()
+partial output. When the caller listens (``streaming``), each piece shows
+up as it is found; otherwise the command puts everything in its final
+reply.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+
+class TaskCancelled(BaseException):
+    """Raised at a checkpoint once the running command has been cancelled.
+
+    Derives from BaseException (like KeyboardInterrupt) so the handlers'
+    ``except Exception`` error replies do not swallow it.
+    """
+
+
+class TaskContext:
+    """Progress and output callbacks + cancel flag for one running command"""
+
+    def __init__(self, progress=None, cancel_event=None, min_interval=0.1, output=None):
+        self.progress = progress
+        self.output = output
+        self.cancel_event = cancel_event or threading.Event()
+        self.min_interval = min_interval
+        self._last_report = 0.0
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def report(self, message, force=False):
+        """Send a progress message, dropping ones that arrive faster than min_interval"""
+        if self.progress is None:
+            return
+        now = time.monotonic()
+        if force or now - self._last_report >= self.min_interval:
+            self._last_report = now
+            self.progress(message)
+
+    @property
+    def streaming(self):
+        """True if partial output sent with emit() reaches the caller"""
+        return self.output is not None
+
+    def emit(self, piece):
+        """Send a piece of the result (chat text, or an interim snapshot) now; ignored when not streaming"""
+        if self.output is not None:
+            self.output(piece)
+
+    def check(self):
+        """Cancellation checkpoint"""
+        if self.cancel_event.is_set():
+            raise TaskCancelled()
+
+
+_local = threading.local()
+_IDLE = TaskContext()
+
+
+def current_task():
+    """TaskContext of the command running on this thread (an idle one if none)"""
+    return getattr(_local, 'context', None) or _IDLE
+
+
+@contextmanager
+def running(context):
+    """Make context the current task on this thread for the duration of the block"""
+    previous = getattr(_local, 'context', None)
+    _local.context = context
+    try:
+        yield context
+    finally:
+        _local.context = previous
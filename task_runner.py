@@ -0,0 +1,118 @@
+# task_runner.py - Runs assistant commands on a worker pool and reports back through Qt signals
+"""
+The dashboard submits work with TaskRunner.submit(); the callable runs on a
+QThreadPool thread with a TaskContext as its first argument, which is also
+the thread's current_task() while it runs. Progress
+messages, partial output, the result and errors are emitted as signals, which Qt delivers
+on the GUI thread, so slots can update widgets directly.
+
+Cancellation is cooperative: cancel() sets the task's cancel flag (checked
+at TaskContext.check() points inside long operations) and the runner drops
+whatever the task returns afterwards.
+"""
+import itertools
+import threading
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from task_context import TaskCancelled, TaskContext, running
+
+
+class _Job(QRunnable):
+    def __init__(self, runner, task_id, func, args):
+        super().__init__()
+        self.runner = runner
+        self.task_id = task_id
+        self.func = func
+        self.args = args
+        self.context = TaskContext(progress=lambda message: runner._emit_progress(task_id, message),
+                                   output=lambda text: runner._emit_output(task_id, text))
+
+    def run(self):
+        runner = self.runner
+        if self.context.cancelled:
+            return
+        try:
+            # Code that only reaches the task through current_task() (storage scans) reports and cancels here too
+            with running(self.context):
+                result = self.func(self.context, *self.args)
+        except TaskCancelled:
+            result = None
+        except Exception as e:
+            runner._finish(self.task_id, runner.failed, str(e))
+            return
+        runner._finish(self.task_id, runner.finished, result)
+
+
+class TaskRunner(QObject):
+    """Background executor for dashboard commands (one at a time, in submission order)"""
+
+    started = pyqtSignal(int)
+    progress = pyqtSignal(int, str)
+    output = pyqtSignal(int, object)
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+    cancelled = pyqtSignal(int)
+    idle = pyqtSignal()
+
+    def __init__(self, parent=None, max_threads=1):
+        super().__init__(parent)
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_threads)
+        self._ids = itertools.count(1)
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args):
+        """Run func(context, *args) in the background and return its task id"""
+        task_id = next(self._ids)
+        job = _Job(self, task_id, func, args)
+        with self._lock:
+            self._jobs[task_id] = job
+        self.started.emit(task_id)
+        self.pool.start(job)
+        return task_id
+
+    def cancel(self, task_id=None):
+        """Cancel one task, or every pending/running task when task_id is None"""
+        with self._lock:
+            jobs = [self._jobs.pop(task_id)] if task_id in self._jobs else []
+            if task_id is None:
+                jobs = list(self._jobs.values())
+                self._jobs.clear()
+        for job in jobs:
+            job.context.cancel()
+            self.cancelled.emit(job.task_id)
+        if jobs and not self.busy():
+            self.idle.emit()
+
+    def busy(self):
+        with self._lock:
+            return bool(self._jobs)
+
+    def shutdown(self, timeout_ms=2000):
+        """Cancel everything and wait briefly for workers to reach a checkpoint"""
+        self.cancel()
+        self.pool.waitForDone(timeout_ms)
+
+    def _emit_progress(self, task_id, message):
+        with self._lock:
+            live = task_id in self._jobs
+        if live:
+            self.progress.emit(task_id, message)
+
+    def _emit_output(self, task_id, text):
+        with self._lock:
+            live = task_id in self._jobs
+        if live:
+            self.output.emit(task_id, text)
+
+    def _finish(self, task_id, signal, payload):
+        with self._lock:
+            live = self._jobs.pop(task_id, None) is not None
+            now_idle = live and not self._jobs
+        # A cancelled task already announced itself; its late result is dropped
+        if live:
+            signal.emit(task_id, payload)
+            if now_idle:
+                self.idle.emit()
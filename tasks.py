@@ -1,9 +1,21 @@
 # tasks.py
 import os
 
-def clear_cache():
-    os.system("del /q/f/s %TEMP%\\*")  # Windows clear temp folder
-    return "🧹 Cache cleared successfully."
+import cache_cleaner
+
+def clear_cache(min_age_days=cache_cleaner.DEFAULT_MIN_AGE_DAYS):
+    # Temp, user, browser and bytecode caches; files used within min_age_days are kept
+    try:
+        return cache_cleaner.format_report(cache_cleaner.clean(min_age_days=min_age_days))
+    except Exception as e:
+        return f"❌ Unable to clear cache: {str(e)}"
+
+def scan_cache(min_age_days=cache_cleaner.DEFAULT_MIN_AGE_DAYS):
+    # Dry run of clear_cache: what each location would free
+    try:
+        return cache_cleaner.format_report(cache_cleaner.scan(min_age_days=min_age_days), dry_run=True)
+    except Exception as e:
+        return f"❌ Unable to measure cache: {str(e)}"
 
 def increase_volume():
     return "🔊 Volume increased."
@@ -17,6 +29,7 @@ def open_browser():
 
 ACTIONS = {
     "clear_cache": clear_cache,
+    "scan_cache": scan_cache,
     "increase_volume": increase_volume,
     "decrease_volume": decrease_volume,
     "open_browser": open_browser
@@ -0,0 +1,139 @@
+# tejas_client.py - Thin command-line client for the Tejas daemon
+"""
+Usage:
+  python tejas_client.py open chrome
+  echo "what time is it" | python tejas_client.py
+  python tejas_client.py --session work --search chrome
+
+Sends commands to a running tejas_daemon.py over its local socket, so no
+assistant modules are imported here and each call costs one round trip.
+"""
+import argparse
+import itertools
+import json
+import os
+import socket
+import sys
+
+
+def _tejas_home():
+    return os.path.expanduser(os.getenv('TEJAS_HOME', os.path.join('~', '.tejas')))
+
+
+def default_address():
+    """Socket path (or 'host:port' where Unix sockets are unavailable) shared with the daemon"""
+    configured = os.getenv('TEJAS_SOCKET')
+    if configured:
+        return configured
+    if not hasattr(socket, 'AF_UNIX'):
+        return '127.0.0.1:47821'
+    return os.path.join(_tejas_home(), 'tejas.sock')
+
+
+def token_path():
+    """File (readable by its owner only) holding the token TCP clients must present"""
+    return os.path.join(_tejas_home(), 'daemon.token')
+
+
+def is_tcp_address(address):
+    return ':' in address and not os.path.isabs(address)
+
+
+class DaemonError(Exception):
+    """JSON-RPC error returned by the daemon"""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+class TejasClient:
+    """Persistent JSON-RPC connection to the daemon (newline-delimited JSON)"""
+
+    def __init__(self, address=None, timeout=None):
+        self.address = address or default_address()
+        if is_tcp_address(self.address):
+            # Anyone on the machine can reach a TCP port, so the daemon wants its token first
+            with open(token_path(), 'r', encoding='utf-8') as f:
+                token = f.read().strip()
+            host, port = self.address.rsplit(':', 1)
+            self.sock = socket.create_connection((host, int(port)), timeout=timeout)
+        else:
+            token = None
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            self.sock.connect(self.address)
+        self.reader = self.sock.makefile('r', encoding='utf-8')
+        self._ids = itertools.count(1)
+        if token is not None:
+            try:
+                self.call('authenticate', token=token)
+            except Exception:
+                self.close()
+                raise
+
+    def call(self, method, **params):
+        request_id = next(self._ids)
+        message = {'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params}
+        self.sock.sendall((json.dumps(message) + '\n').encode('utf-8'))
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("Tejas daemon closed the connection")
+        reply = json.loads(line)
+        if 'error' in reply:
+            raise DaemonError(reply['error']['code'], reply['error']['message'])
+        return reply['result']
+
+    def process_command(self, text, session=None):
+        return self.call('process_command', text=text, session=session)['response']
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send commands to the Tejas daemon")
+    parser.add_argument('command', nargs='*', help="command text (read from stdin, one per line, if omitted)")
+    parser.add_argument('--session', help="named session to use (default: 'cli'; searches cover all sessions)")
+    parser.add_argument('--socket', help="daemon socket path")
+    parser.add_argument('--search', metavar='TEXT', help="search the session's logged history")
+    parser.add_argument('--ping', action='store_true', help="check that the daemon is running")
+    args = parser.parse_args()
+
+    try:
+        client = TejasClient(args.socket)
+    except OSError:
+        print("❌ Tejas daemon is not running. Start it with: python tejas_daemon.py", file=sys.stderr)
+        return 2
+    except DaemonError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    with client:
+        try:
+            if args.ping:
+                print(f"✅ Daemon up: {client.call('ping')}")
+            elif args.search:
+                for turn in client.call('search_history', text=args.search, session=args.session):
+                    print(f"[{turn['timestamp']}] {turn['user']} -> {turn['response']}")
+            elif args.command:
+                print(client.process_command(' '.join(args.command), args.session or 'cli'))
+            else:
+                for line in sys.stdin:
+                    if line.strip():
+                        print(client.process_command(line.strip(), args.session or 'cli'))
+        except DaemonError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+# tejas_daemon.py - Headless Tejas: one warm AICore served over a local JSON-RPC socket
+"""
+Usage: python tejas_daemon.py [--socket PATH]
+
+Loads AICore once at startup and answers newline-delimited JSON-RPC 2.0
+requests on a Unix domain socket (localhost TCP where Unix sockets are
+unavailable).
+The Unix socket is created owner-only. Over TCP every connection must
+first call authenticate with the token the daemon writes to an
+owner-only file (tejas_client.token_path()) each time it starts.
+Each connection is served on its own thread, and AICore handles concurrent
+commands, so scripts, hotkeys and the dashboard can share one pre-warmed
+engine. Use tejas_client.py (or any JSON-RPC client) to talk to it.
+
+Methods:
+  authenticate    {token}           -> true (TCP only, before anything else)
+  process_command {text, session?}  -> {response, elapsed_ms}
+  search_history  {text, session?, limit?} -> [turn, ...]
+  ping                              -> {uptime, sessions, requests}
+  shutdown                          -> true
+
+A request without ``session`` uses a private session for its connection.
+A named session keeps its history across connections and restarts.
+"""
+import argparse
+import hmac
+import itertools
+import json
+import os
+import secrets
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+import ai_core
+from tejas_client import default_address, is_tcp_address, token_path
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+UNAUTHORIZED = -32001
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.session = None
+        self.authenticated = self.server.token is None
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            reply = self.server.daemon.dispatch(line, self)
+            if reply is not None:
+                try:
+                    self.wfile.write(json.dumps(reply).encode('utf-8') + b'\n')
+                    self.wfile.flush()
+                except OSError:
+                    return
+
+    def connection_session(self):
+        if self.session is None:
+            self.session = ai_core.new_session()
+        return self.session
+
+
+if hasattr(socket, 'AF_UNIX'):
+    class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+        token = None  # the socket file's permissions already limit it to its owner
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    token = None
+
+
+class TejasDaemon:
+    """JSON-RPC front end for the shared AICore"""
+
+    def __init__(self, address=None):
+        self.address = address or default_address()
+        self.started = time.time()
+        self.requests = 0
+        self._request_ids = itertools.count(1)
+        self.sessions = {}
+        self._sessions_lock = threading.Lock()
+        self.methods = {
+            'process_command': self.process_command,
+            'search_history': self.search_history,
+            'ping': self.ping,
+            'authenticate': self.authenticate,
+            'shutdown': self.shutdown,
+        }
+        self.server = self._bind()
+        self.server.daemon = self
+
+    def _bind(self):
+        if is_tcp_address(self.address):
+            host, port = self.address.rsplit(':', 1)
+            server = _TCPServer((host, int(port)), _RequestHandler)
+            try:
+                server.token = self._write_token()
+            except OSError:
+                server.server_close()
+                raise
+            return server
+        if os.path.exists(self.address):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.address)
+                raise RuntimeError(f"another Tejas daemon is already listening on {self.address}")
+            except OSError:
+                os.unlink(self.address)  # stale socket left by a crashed daemon
+            finally:
+                probe.close()
+        os.makedirs(os.path.dirname(self.address) or '.', mode=0o700, exist_ok=True)
+        # The socket file is created owner-only, so no other user can connect before a chmod
+        umask = os.umask(0o177)
+        try:
+            return _UnixServer(self.address, _RequestHandler)
+        finally:
+            os.umask(umask)
+
+    def _write_token(self):
+        """A fresh token in an owner-only file, for the clients allowed to use the TCP port"""
+        token = secrets.token_hex(32)
+        path = token_path()
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        if os.path.exists(path):
+            os.unlink(path)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(token)
+        return token
+
+    def serve_forever(self):
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            stale = token_path() if self.server.token is not None else self.address
+            if os.path.isabs(stale) and os.path.exists(stale):
+                os.unlink(stale)
+
+    # ----------------------------
+    # Dispatch
+    # ----------------------------
+    def dispatch(self, line, handler):
+        """Run one JSON-RPC request line and return the reply dict (None for notifications)"""
+        self.requests = next(self._request_ids)
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return self._error(None, PARSE_ERROR, f"Parse error: {e}")
+        if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+            return self._error(request.get('id') if isinstance(request, dict) else None,
+                               INVALID_REQUEST, "Invalid request")
+        request_id = request.get('id')
+        if not handler.authenticated and request['method'] != 'authenticate':
+            return self._error(request_id, UNAUTHORIZED, "Call authenticate with the daemon token first")
+        method = self.methods.get(request['method'])
+        if method is None:
+            return self._error(request_id, METHOD_NOT_FOUND, f"Unknown method '{request['method']}'")
+        params = request.get('params') or {}
+        if not isinstance(params, dict):
+            return self._error(request_id, INVALID_PARAMS, "params must be an object")
+        try:
+            result = method(handler, **params)
+        except TypeError as e:
+            return self._error(request_id, INVALID_PARAMS, str(e))
+        except PermissionError as e:
+            return self._error(request_id, UNAUTHORIZED, str(e))
+        except Exception as e:
+            return self._error(request_id, INTERNAL_ERROR, str(e))
+        if 'id' not in request:
+            return None
+        return {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+
+    def _error(self, request_id, code, message):
+        return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+    def _session(self, handler, session_id):
+        if session_id is None:
+            return handler.connection_session()
+        session = self.sessions.get(session_id)
+        if session is None:
+            with self._sessions_lock:
+                session = self.sessions.get(session_id)
+                if session is None:
+                    session = self.sessions[session_id] = ai_core.new_session(session_id)
+        return session
+
+    # ----------------------------
+    # Methods
+    # ----------------------------
+    def process_command(self, handler, text, session=None):
+        started = time.perf_counter()
+        response = ai_core.handle_task(text, llm_fallback_func=ai_core.llm_fallback,
+                                       session=self._session(handler, session))
+        return {'response': response, 'elapsed_ms': round((time.perf_counter() - started) * 1000, 3)}
+
+    def search_history(self, handler, text, session=None, limit=50):
+        return ai_core.search_history(text, session, limit)
+
+    def authenticate(self, handler, token):
+        expected = self.server.token
+        if expected is not None and not (isinstance(token, str) and hmac.compare_digest(token, expected)):
+            raise PermissionError("Invalid daemon token")
+        handler.authenticated = True
+        return True
+
+    def ping(self, handler):
+        return {'uptime': round(time.time() - self.started, 1), 'sessions': len(self.sessions),
+                'requests': self.requests}
+
+    def shutdown(self, handler):
+        # serve_forever() must be stopped from another thread than the one serving this request
+        threading.Thread(target=self.server.shutdown, daemon=True).start()
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve Tejas commands over a local socket")
+    parser.add_argument('--socket', help="socket path, or host:port for TCP")
+    args = parser.parse_args()
+    try:
+        daemon = TejasDaemon(args.socket)
+    except (RuntimeError, OSError) as e:
+        print(f"❌ Unable to start Tejas daemon: {e}", file=sys.stderr)
+        return 1
+    ai_core.shared_core()  # warm up before the first request
+    print(f"🤖 Tejas daemon listening on {daemon.address}")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print("👋 Tejas daemon stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
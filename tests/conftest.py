@@ -0,0 +1,10 @@
+# conftest.py - Run the tests against the repository modules with a throwaway TEJAS_HOME
+import os
+import sys
+import tempfile
+
+# user_paths reads TEJAS_HOME at import time, so it must be set before any module is imported
+os.environ['TEJAS_HOME'] = tempfile.mkdtemp(prefix='tejas-tests-')
+# No AICore built by a test may start crawling the real home folder
+os.environ['TEJAS_BACKGROUND'] = '0'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,97 @@
+import os
+import time
+
+import pytest
+
+import ai_core
+import cache_cleaner
+from ai_core import AICore
+from history_log import HistoryLog
+from task_context import TaskContext, running
+
+
+@pytest.fixture(scope='module')
+def core(tmp_path_factory):
+    log = HistoryLog(str(tmp_path_factory.mktemp('history') / 'history.sqlite3'))
+    return AICore(history_log=log, background=False)
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    old = time.time() - 10 * 86400
+    for i in range(3):
+        path = tmp_path / f'entry{i}'
+        path.write_bytes(b'c' * 10)
+        os.utime(path, (old, old))
+    monkeypatch.setattr(cache_cleaner, 'default_locations',
+                        lambda: [cache_cleaner.CacheLocation('Test cache', str(tmp_path), 'contents')])
+    return tmp_path
+
+
+def test_clean_waits_for_a_yes(core, cache):
+    session = core.new_session()
+    intent, response = core.dispatch("clear the cache", session=session)
+    assert intent == 'file' and "Say **yes**" in response
+    assert len(os.listdir(cache)) == 3
+    assert core.dispatch("no", session=session) == ('confirm', "👍 Okay, cancelled.")
+    assert core.dispatch("yes", session=session)[0] != 'confirm'
+    assert len(os.listdir(cache)) == 3
+
+    core.dispatch("clear the cache", session=session)
+    intent, response = core.dispatch("yes", session=session)
+    assert intent == 'confirm' and "Freed" in response
+    assert os.listdir(cache) == []
+
+
+def test_measuring_the_cache_offers_nothing(core, cache):
+    session = core.new_session()
+    response = core.dispatch("how much cache can I clear", session=session)[1]
+    assert "can be freed" in response and "Say **yes**" not in response
+    core.dispatch("yes", session=session)
+    assert len(os.listdir(cache)) == 3
+
+
+def test_offer_from_a_compound_command_is_parked(core, cache):
+    session = core.new_session()
+    intent, response = core.dispatch("clear the cache and show memory usage", session=session)
+    assert intent == 'multi' and "Say **yes**" in response
+    assert len(os.listdir(cache)) == 3
+    assert core.dispatch("yes", session=session)[0] == 'confirm'
+    assert os.listdir(cache) == []
+
+
+def test_sessions_do_not_share_offers(core, cache):
+    asking, other = core.new_session(), core.new_session()
+    core.dispatch("clear the cache", session=asking)
+    assert core.dispatch("yes", session=other)[0] != 'confirm'
+    assert len(os.listdir(cache)) == 3
+
+
+@pytest.fixture
+def walked(tmp_path, monkeypatch):
+    for i in range(10):
+        (tmp_path / f'note{i}.txt').write_text('x')
+    seen, find_files = [], ai_core.find_files
+
+    def counting(query, roots, excludes=None):
+        for hit in find_files(query, roots, excludes):
+            seen.append(hit)
+            yield hit
+    monkeypatch.setattr(ai_core, 'find_files', counting)
+    return tmp_path, seen
+
+
+@pytest.mark.parametrize('streaming', [False, True])
+def test_search_stops_walking_at_the_limit(core, walked, streaming):
+    root, seen = walked
+    pieces = []
+    with running(TaskContext(output=pieces.append if streaming else None)):
+        response = core.search_files('*.txt', str(root), limit=3)
+    assert len(seen) == 4
+    assert "Found 3+ files" in response
+    assert len(pieces) == (3 if streaming else 0)
+
+
+def test_search_under_the_limit_gives_an_exact_count(core, walked):
+    root, seen = walked
+    assert "Found 10 files" in core.search_files('*.txt', str(root), limit=20)
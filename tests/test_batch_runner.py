@@ -0,0 +1,39 @@
+import os
+import time
+
+import pytest
+
+import batch_runner
+import cache_cleaner
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    old = time.time() - 10 * 86400
+    for i in range(3):
+        path = tmp_path / f'entry{i}'
+        path.write_bytes(b'c' * 10)
+        os.utime(path, (old, old))
+    monkeypatch.setattr(cache_cleaner, 'default_locations',
+                        lambda: [cache_cleaner.CacheLocation('Test cache', str(tmp_path), 'contents')])
+    return tmp_path
+
+
+def test_lanes():
+    planned = batch_runner.plan(enumerate(["what time is it", "yes", "no thanks", "create folder x", "hello"], 1))
+    assert [lane for _, _, _, lane in planned] == ['parallel', 'serial', 'serial', 'serial', 'parallel']
+
+
+def test_confirmation_follows_its_offer_whatever_runs_in_parallel(cache):
+    commands = ["clear the cache"] + ["what time is it", "show memory usage"] * 20 + ["yes"]
+    records = list(batch_runner.run_batch(batch_runner.plan(enumerate(commands, 1)), workers=4))
+    assert [record['line'] for record in records] == list(range(1, len(commands) + 1))
+    assert records[-1]['handler'] == 'confirm' and "Freed" in records[-1]['response']
+    assert os.listdir(cache) == []
+
+
+def test_parallel_commands_never_answer_an_offer(cache):
+    commands = ["clear the cache", "hello", "what time is it"]
+    records = list(batch_runner.run_batch(batch_runner.plan(enumerate(commands, 1)), workers=4))
+    assert all(record['handler'] != 'confirm' for record in records)
+    assert len(os.listdir(cache)) == 3
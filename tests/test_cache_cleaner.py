@@ -0,0 +1,84 @@
+import os
+import time
+
+import cache_cleaner
+from cache_cleaner import CacheLocation, clean, format_report, scan
+
+DAY = 86400
+
+
+def write(path, size, age_days):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b'c' * size)
+    when = time.time() - age_days * DAY
+    os.utime(path, (when, when))
+
+
+def test_age_cutoff_uses_the_newest_of_access_and_modification(tmp_path):
+    write(tmp_path / 'old', 100, 10)
+    write(tmp_path / 'recent', 200, 0.5)
+    write(tmp_path / 'read_recently', 400, 10)
+    os.utime(tmp_path / 'read_recently', (time.time(), time.time() - 10 * DAY))
+    location = [CacheLocation('Test', str(tmp_path), 'contents')]
+    assert scan(location, min_age_days=1)[0][1:] == (1, 100, 0)
+    assert scan(location, min_age_days=0.25)[0][1:] == (2, 300, 0)
+    assert scan(location, min_age_days=30)[0][1:] == (0, 0, 0)
+
+
+def test_dry_run_deletes_nothing_and_clean_frees_what_it_estimated(tmp_path):
+    for i in range(600):
+        write(tmp_path / f'{i % 7}' / f'entry{i}', i, 5)
+    write(tmp_path / 'in use', 1000, 0)
+    for i in range(7):
+        os.utime(tmp_path / f'{i}', (time.time() - 5 * DAY,) * 2)
+    location = [CacheLocation('Test', str(tmp_path), 'contents')]
+    estimate = scan(location)[0]
+    assert estimate.files == 600 and estimate.bytes == sum(range(600))
+    assert sum(len(files) for _, _, files in os.walk(tmp_path)) == 601
+
+    freed = clean(location, workers=4)[0]
+    assert (freed.files, freed.bytes, freed.failed) == (estimate.files, estimate.bytes, 0)
+    assert os.listdir(tmp_path) == ['in use']
+
+
+def test_file_used_after_the_walk_is_kept(tmp_path, monkeypatch):
+    write(tmp_path / 'cache', 100, 5)
+    eligible = cache_cleaner._eligible
+
+    def touch_after_walk(*args):
+        for item in eligible(*args):
+            os.utime(item[0], None)
+            yield item
+
+    monkeypatch.setattr(cache_cleaner, '_eligible', touch_after_walk)
+    report = clean([CacheLocation('Test', str(tmp_path), 'contents')])[0]
+    assert (report.files, report.failed) == (0, 1)
+    assert (tmp_path / 'cache').exists()
+
+
+def test_nested_locations_counted_once_and_own_files_skipped(tmp_path, monkeypatch):
+    write(tmp_path / 'outer' / 'a', 10, 5)
+    write(tmp_path / 'outer' / 'browser' / 'b', 20, 5)
+    write(tmp_path / 'outer' / 'tejas' / 'settings.json', 40, 5)
+    monkeypatch.setattr(cache_cleaner, 'USER_DIR', str(tmp_path / 'outer' / 'tejas'))
+    locations = [CacheLocation('Outer', str(tmp_path / 'outer'), 'contents'),
+                 CacheLocation('Browser', str(tmp_path / 'outer' / 'browser'), 'contents')]
+    assert [(report.files, report.bytes) for report in scan(locations)] == [(1, 10), (1, 20)]
+
+
+def test_pycache_only_touches_bytecode_folders(tmp_path):
+    write(tmp_path / 'project' / 'module.py', 10, 5)
+    write(tmp_path / 'project' / '__pycache__' / 'module.cpython-311.pyc', 30, 5)
+    os.utime(tmp_path / 'project' / '__pycache__', (time.time() - 5 * DAY,) * 2)
+    report = clean([CacheLocation('Python bytecode', str(tmp_path), 'pycache')])[0]
+    assert (report.files, report.bytes) == (1, 30)
+    assert os.listdir(tmp_path / 'project') == ['module.py']
+
+
+def test_format_report():
+    location = CacheLocation('Test', '/cache', 'contents')
+    empty = CacheLocation('Empty', '/empty', 'contents')
+    reports = [cache_cleaner.LocationReport(location, 3, 2048, 1), cache_cleaner.LocationReport(empty, 0, 0, 0)]
+    assert format_report(reports, dry_run=True).startswith("🧹 **2.0 KB can be freed** (3 files)")
+    text = format_report(reports)
+    assert "1 in use or protected, skipped" in text and "Nothing to clean in: Empty" in text
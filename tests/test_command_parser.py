@@ -0,0 +1,43 @@
+from command_parser import command_tokens, parse_command
+
+
+def test_tokens_strip_punctuation_and_case():
+    command = parse_command("  Open Chrome, please!  ")
+    assert command.raw == "  Open Chrome, please!  "
+    assert command.text == "open chrome, please!"
+    assert command.tokens == ('open', 'chrome', 'please')
+    assert command.path is None and command.url is None and command.quantity is None
+
+
+def test_app_and_query_drop_filler_words():
+    assert parse_command("can you open the visual studio code app").app == 'visual studio code'
+    assert parse_command("please search for python tutorials").query == 'python tutorials'
+    assert parse_command("open").app is None
+
+
+def test_entities():
+    command = parse_command("copy ~/notes.txt to /tmp/backup")
+    assert command.path == '~/notes.txt'
+    assert parse_command("go to www.example.com").url == 'www.example.com'
+    assert parse_command("https://example.com/page").path is None
+    assert parse_command("set volume to 40%").quantity == (40.0, '%')
+    assert parse_command("files bigger than 10 mb").quantity == (10.0, 'mb')
+
+
+def test_has_token_is_whole_word():
+    command = parse_command("restart now")
+    assert command.has_token('restart')
+    assert not command.has_token('start')
+    assert 'start' in command  # substring test, like `in user_input`
+
+
+def test_spans_and_words_after():
+    command = parse_command("find files named quarterly report")
+    assert command.spans[0] == (0, 4)
+    assert command.words_after(frozenset(['named'])) == 'quarterly report'
+    assert command.words_after(frozenset(['called'])) is None
+
+
+def test_aliases_tokenize_like_commands():
+    assert command_tokens("Notepad++") == ['notepad++']
+    assert parse_command("open notepad++").tokens[-1] == command_tokens("Notepad++")[0]
@@ -0,0 +1,60 @@
+import threading
+
+from ai_core import INTENT_KEYWORDS
+from command_parser import parse_command
+from command_planner import might_be_compound, plan_steps, run_steps
+from intent_matcher import IntentMatcher
+
+matcher = IntentMatcher(INTENT_KEYWORDS)
+
+
+def predict(text):
+    return matcher.best(text) or 'conversation'
+
+
+def test_independent_commands_split_without_edges():
+    steps = plan_steps("take a screenshot and show memory usage and open chrome", predict)
+    assert [step.text for step in steps] == ["take a screenshot", "show memory usage", "open chrome"]
+    assert [step.intent for step in steps] == ['screenshot', 'system_info', 'app']
+    assert all(not step.depends_on for step in steps)
+
+
+def test_conjunction_inside_one_command_does_not_split():
+    steps = plan_steps("search for salt and pepper", predict)
+    assert len(steps) == 1
+    assert steps[0].text == "search for salt and pepper"
+
+
+def test_then_and_back_references_wait_for_the_previous_step():
+    steps = plan_steps("open chrome then take a screenshot", predict)
+    assert steps[1].depends_on == {0}
+    steps = plan_steps("take a screenshot and open it", lambda text: 'screenshot' if 'screenshot' in text else 'app')
+    assert steps[1].depends_on == {0}
+
+
+def test_stateful_steps_keep_their_order_and_barriers_wait_for_everything():
+    intents = {'a': 'file', 'b': 'app', 'c': 'file', 'd': 'system_control', 'e': 'app'}
+    steps = plan_steps("a and b and c and d and e", lambda text: intents[text.strip()])
+    assert [step.depends_on for step in steps] == [set(), set(), {0}, {0, 1, 2}, {3}]
+
+
+def test_might_be_compound():
+    assert might_be_compound(parse_command("open chrome and firefox"))
+    assert might_be_compound(parse_command("mute, then lock"))
+    assert not might_be_compound(parse_command("open chrome"))
+
+
+def test_run_steps_respects_dependencies_and_keeps_order():
+    intents = {'a': 'app', 'b': 'file', 'c': 'file'}
+    steps = plan_steps("a and b and c", lambda text: intents[text.strip()])
+    finished = []
+    lock = threading.Lock()
+
+    def run_step(step):
+        if step.text == 'c':
+            assert 'b' in finished
+        with lock:
+            finished.append(step.text)
+        return step.text.upper()
+
+    assert run_steps(steps, run_step) == ['A', 'B', 'C']
@@ -0,0 +1,104 @@
+import os
+import shutil
+
+import pytest
+
+import copy_engine
+from task_context import TaskCancelled, TaskContext, running
+
+
+def make_tree(root):
+    (root / 'sub' / 'deeper').mkdir(parents=True)
+    (root / 'a.bin').write_bytes(os.urandom(300_000))
+    for i in range(100):
+        (root / 'sub' / f'small{i}.txt').write_text(f"file {i}")
+    (root / 'sub' / 'deeper' / 'empty').write_bytes(b'')
+    os.symlink('a.bin', root / 'link')
+
+
+def listing(root):
+    return sorted(os.path.relpath(os.path.join(directory, name), root)
+                  for directory, dirs, files in os.walk(root) for name in dirs + files)
+
+
+def same_tree(left, right):
+    assert listing(left) == listing(right)
+    for relative in listing(left):
+        source, copied = os.path.join(left, relative), os.path.join(right, relative)
+        if os.path.islink(source):
+            assert os.readlink(copied) == os.readlink(source)
+        elif os.path.isfile(source):
+            with open(source, 'rb') as f, open(copied, 'rb') as g:
+                assert f.read() == g.read()
+            assert int(os.stat(copied).st_mtime) == int(os.stat(source).st_mtime)
+
+
+def test_copy_file_into_folder(tmp_path):
+    source = tmp_path / 'data.bin'
+    source.write_bytes(os.urandom(3 * 1024 * 1024 + 7))
+    (tmp_path / 'out').mkdir()
+    result = copy_engine.copy(str(source), str(tmp_path / 'out'))
+    assert result.files == 1 and result.bytes == source.stat().st_size
+    assert (tmp_path / 'out' / 'data.bin').read_bytes() == source.read_bytes()
+
+
+def test_copy_tree(tmp_path):
+    make_tree(tmp_path / 'src')
+    result = copy_engine.copy(str(tmp_path / 'src'), str(tmp_path / 'dst'), workers=4)
+    assert result.files == 102
+    same_tree(str(tmp_path / 'src'), str(tmp_path / 'dst'))
+    assert os.path.islink(tmp_path / 'dst' / 'link')
+    with pytest.raises(FileExistsError):
+        copy_engine.copy(str(tmp_path / 'src'), str(tmp_path / 'dst'))
+
+
+def test_buffered_fallback(tmp_path, monkeypatch):
+    monkeypatch.setattr(copy_engine, 'BUFFER_SIZE', 4096)
+    monkeypatch.setattr(copy_engine, '_METHODS', [copy_engine._copy_buffered])
+    source = tmp_path / 'data.bin'
+    source.write_bytes(os.urandom(100_000))
+    copy_engine.copy(str(source), str(tmp_path / 'copy.bin'))
+    assert (tmp_path / 'copy.bin').read_bytes() == source.read_bytes()
+
+
+def test_buffered_copy_without_readv(tmp_path, monkeypatch):
+    # Windows has neither copy_file_range, sendfile nor readv
+    monkeypatch.setattr(copy_engine, '_METHODS', [copy_engine._copy_buffered])
+    monkeypatch.delattr(os, 'readv', raising=False)
+    source = tmp_path / 'data.bin'
+    source.write_bytes(os.urandom(3 * 1024 * 1024 + 5))
+    copy_engine.copy(str(source), str(tmp_path / 'copy.bin'))
+    assert (tmp_path / 'copy.bin').read_bytes() == source.read_bytes()
+
+
+def test_copy_onto_itself_keeps_the_file(tmp_path):
+    source = tmp_path / 'a.txt'
+    source.write_text("important data")
+    with pytest.raises(shutil.SameFileError):
+        copy_engine.copy(str(source), str(tmp_path))
+    with pytest.raises(shutil.SameFileError):
+        copy_engine.copy(str(source), str(source))
+    os.link(source, tmp_path / 'b.txt')
+    with pytest.raises(shutil.SameFileError):
+        copy_engine.copy(str(source), str(tmp_path / 'b.txt'))
+    assert source.read_text() == "important data"
+
+
+def test_cancelled_copy_removes_the_partial_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(copy_engine, 'KERNEL_CHUNK', 4096)
+    monkeypatch.setattr(copy_engine, 'BUFFER_SIZE', 4096)
+    source = tmp_path / 'data.bin'
+    source.write_bytes(os.urandom(1_000_000))
+    context = TaskContext()
+    context.cancel()
+    with running(context), pytest.raises(TaskCancelled):
+        copy_engine.copy(str(source), str(tmp_path / 'copy.bin'))
+    assert not (tmp_path / 'copy.bin').exists()
+
+
+def test_move_renames_on_the_same_filesystem(tmp_path):
+    make_tree(tmp_path / 'src')
+    (tmp_path / 'out').mkdir()
+    assert copy_engine.move(str(tmp_path / 'src'), str(tmp_path / 'out')) is None
+    assert not (tmp_path / 'src').exists()
+    assert (tmp_path / 'out' / 'src' / 'sub' / 'small5.txt').read_text() == "file 5"
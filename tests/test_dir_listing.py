@@ -0,0 +1,114 @@
+import os
+import time
+
+import pytest
+
+import dir_listing
+from ai_core import AICore
+from dir_listing import DirectoryCache
+from history_log import HistoryLog
+
+OLD = time.time() - 3600
+
+
+def age(path, when=OLD):
+    os.utime(path, (when, when))
+
+
+@pytest.fixture
+def folder(tmp_path):
+    for name, size, offset in [('b.txt', 30, 1), ('A.txt', 10, 3), ('c.txt', 20, 2)]:
+        path = tmp_path / name
+        path.write_bytes(b'x' * size)
+        age(path, OLD + offset)
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'Another').mkdir()
+    age(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    paths, read_directory = [], dir_listing.read_directory
+
+    def counting(path):
+        paths.append(path)
+        return read_directory(path)
+    monkeypatch.setattr(dir_listing, 'read_directory', counting)
+    return paths
+
+
+def names(entries):
+    return [entry.name for entry in entries]
+
+
+def test_sort_orders_keep_folders_first(folder):
+    cache = DirectoryCache()
+    assert names(cache.listing(folder, 'name')) == ['Another', 'sub', 'A.txt', 'b.txt', 'c.txt']
+    assert names(cache.listing(folder, 'size', reverse=True)) == ['Another', 'sub', 'b.txt', 'c.txt', 'A.txt']
+    assert names(cache.listing(folder, 'mtime'))[2:] == ['b.txt', 'c.txt', 'A.txt']
+    assert names(cache.listing(folder, 'mtime', reverse=True))[2:] == ['A.txt', 'c.txt', 'b.txt']
+
+
+def test_unchanged_folder_is_read_once(folder, reads):
+    cache = DirectoryCache()
+    cache.listing(folder, 'name')
+    cache.listing(folder, 'size')
+    cache.listing(folder, 'name', reverse=True)
+    assert len(reads) == 1
+
+
+def test_changed_mtime_rereads_the_folder(folder, reads):
+    cache = DirectoryCache()
+    assert 'new.txt' not in names(cache.listing(folder))
+    (folder / 'new.txt').write_text('new')
+    age(folder, OLD + 60)
+    assert 'new.txt' in names(cache.listing(folder))
+    assert len(reads) == 2
+
+
+def test_recently_changed_folder_is_not_cached(folder, reads):
+    cache = DirectoryCache()
+    age(folder, time.time())
+    cache.listing(folder)
+    cache.listing(folder)
+    assert len(reads) == 2
+
+
+def test_invalidate_forces_a_reread(folder, reads):
+    cache = DirectoryCache()
+    cache.listing(folder)
+    cache.invalidate(folder)
+    cache.listing(folder)
+    assert len(reads) == 2
+
+
+def test_least_recently_used_folder_is_evicted(tmp_path, reads):
+    cache = DirectoryCache(max_dirs=2)
+    folders = []
+    for name in 'xyz':
+        path = tmp_path / name
+        path.mkdir()
+        age(path)
+        folders.append(path)
+    for path in folders:
+        cache.listing(path)
+    cache.listing(folders[0])
+    assert len(reads) == 4
+
+
+@pytest.fixture(scope='module')
+def core(tmp_path_factory):
+    log = HistoryLog(str(tmp_path_factory.mktemp('history') / 'history.sqlite3'))
+    return AICore(history_log=log, background=False)
+
+
+def test_list_files_pages(core, tmp_path):
+    for i in range(5):
+        (tmp_path / f'file{i}.txt').write_text('x')
+    first = core.list_files(str(tmp_path), page=1, page_size=2)
+    assert "page 1 of 3" in first and "file0.txt" in first and "file2.txt" not in first
+    assert "'list files page 2'" in first
+    last = core.list_files(str(tmp_path), page=3, page_size=2)
+    assert "page 3 of 3" in last and "file4.txt" in last and "list files page" not in last
+    assert "page 3 of 3" in core.list_files(str(tmp_path), page=9, page_size=2)
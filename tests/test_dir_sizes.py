@@ -0,0 +1,102 @@
+import os
+import pickle
+import time
+
+import pytest
+
+import dir_sizes
+from dir_sizes import SizeTree, directory_sizes
+
+OLD = time.time() - 3600
+
+
+def build(root):
+    for path, size in (('a/one.bin', 100), ('a/deep/two.bin', 200), ('b/three.bin', 400), ('top.bin', 1)):
+        path = root / path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b'x' * size)
+    (root / 'node_modules').mkdir()
+    (root / 'node_modules' / 'lib.js').write_bytes(b'x' * 1000)
+    backdate(root)
+
+
+def backdate(root):
+    # Directories modified long before the scan are trusted by the next incremental scan
+    for directory, _, _ in os.walk(root):
+        os.utime(directory, (OLD, OLD))
+
+
+@pytest.fixture
+def listed(monkeypatch):
+    paths = []
+    list_directory = dir_sizes._list_directory
+
+    def spy(path, cached, trusted_before):
+        record, was_listed = list_directory(path, cached, trusted_before)
+        if was_listed:
+            paths.append(path)
+        return record, was_listed
+
+    monkeypatch.setattr(dir_sizes, '_list_directory', spy)
+    return paths
+
+
+def sizes(tree):
+    return {os.path.relpath(path, tree.root): (tree.size[i], tree.count[i]) for i, path in enumerate(tree.paths())}
+
+
+def test_recursive_totals(tmp_path):
+    build(tmp_path)
+    tree = directory_sizes(str(tmp_path), use_cache=False)
+    assert sizes(tree) == {'.': (1701, 5), 'a': (300, 2), 'a/deep': (200, 1), 'b': (400, 1),
+                           'node_modules': (1000, 1)}
+    assert [tree.names[i] for i in tree.children(0)] == ['node_modules', 'b', 'a']
+    assert tree.path(tree.children(0)[2]) == str(tmp_path / 'a')
+
+
+def test_incremental_rescan_only_lists_changed_folders(tmp_path, listed):
+    build(tmp_path)
+    directory_sizes(str(tmp_path))
+    assert len(listed) == 5
+
+    listed.clear()
+    tree = directory_sizes(str(tmp_path))
+    assert listed == []
+    assert tree.size[0] == 1701
+
+    listed.clear()
+    (tmp_path / 'a' / 'deep' / 'new.bin').write_bytes(b'x' * 50)
+    tree = directory_sizes(str(tmp_path))
+    assert listed == [str(tmp_path / 'a' / 'deep')]
+    assert sizes(tree)['a'] == (350, 3) and tree.size[0] == 1751
+
+
+def test_removed_folders_leave_the_tree(tmp_path, listed):
+    build(tmp_path)
+    directory_sizes(str(tmp_path))
+    for name in os.listdir(tmp_path / 'b'):
+        os.unlink(tmp_path / 'b' / name)
+    os.rmdir(tmp_path / 'b')
+    tree = directory_sizes(str(tmp_path))
+    assert 'b' not in sizes(tree) and tree.size[0] == 1301
+
+
+def test_recently_changed_folders_are_listed_again(tmp_path, listed):
+    build(tmp_path)
+    os.utime(tmp_path / 'b', None)  # modified just now: the mtime cannot be trusted yet
+    directory_sizes(str(tmp_path))
+    listed.clear()
+    directory_sizes(str(tmp_path))
+    assert listed == [str(tmp_path / 'b')]
+
+
+def test_full_rescan_and_cache_round_trip(tmp_path, listed):
+    build(tmp_path)
+    tree = directory_sizes(str(tmp_path))
+    listed.clear()
+    directory_sizes(str(tmp_path), full=True)
+    assert len(listed) == 5
+    cached = dir_sizes.load_cached(str(tmp_path))
+    assert sizes(cached) == sizes(tree)
+    copy = pickle.loads(pickle.dumps(tree))
+    assert isinstance(copy, SizeTree) and sizes(copy) == sizes(tree)
@@ -0,0 +1,71 @@
+import os
+
+import duplicate_finder
+from duplicate_finder import PARTIAL_BLOCK, find_duplicates
+
+
+def write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+def test_groups_identical_files(tmp_path):
+    photo = os.urandom(5000)
+    write(tmp_path / 'a' / 'photo.jpg', photo)
+    write(tmp_path / 'b' / 'photo copy.jpg', photo)
+    write(tmp_path / 'c' / 'photo.jpg', photo)
+    write(tmp_path / 'same size.jpg', os.urandom(5000))
+    write(tmp_path / 'unique.txt', b'only one')
+    groups, stats = find_duplicates(str(tmp_path))
+    assert [group.paths for group in groups] == [sorted(str(tmp_path / p) for p in
+                                                       ('a/photo.jpg', 'b/photo copy.jpg', 'c/photo.jpg'))]
+    assert groups[0].size == 5000 and groups[0].reclaimable == 10_000
+    assert stats.files == 5 and stats.candidates == 4
+
+
+def test_large_files_differing_only_in_the_middle(tmp_path):
+    data = bytearray(os.urandom(4 * PARTIAL_BLOCK))
+    write(tmp_path / 'one.bin', bytes(data))
+    write(tmp_path / 'two.bin', bytes(data))
+    data[2 * PARTIAL_BLOCK] ^= 0xFF
+    write(tmp_path / 'three.bin', bytes(data))
+    groups, stats = find_duplicates(str(tmp_path))
+    assert [group.paths for group in groups] == [[str(tmp_path / 'one.bin'), str(tmp_path / 'two.bin')]]
+    assert stats.full_hashed == 3
+
+
+def test_groups_sorted_by_reclaimable_bytes_and_min_size(tmp_path):
+    small, big = os.urandom(10), os.urandom(1000)
+    for name in ('s1', 's2', 's3'):
+        write(tmp_path / name, small)
+    for name in ('b1', 'b2'):
+        write(tmp_path / name, big)
+    groups, _ = find_duplicates(str(tmp_path))
+    assert [group.reclaimable for group in groups] == [1000, 20]
+    groups, _ = find_duplicates(str(tmp_path), min_size=100)
+    assert [group.size for group in groups] == [1000]
+
+
+def test_hard_links_are_not_duplicates(tmp_path):
+    write(tmp_path / 'file', os.urandom(100))
+    os.link(tmp_path / 'file', tmp_path / 'link')
+    assert find_duplicates(str(tmp_path))[0] == []
+
+
+def test_excluded_folders_only_when_asked(tmp_path):
+    data = os.urandom(100)
+    write(tmp_path / 'app.js', data)
+    write(tmp_path / 'node_modules' / 'pkg' / 'app.js', data)
+    assert len(find_duplicates(str(tmp_path))[0]) == 1
+    assert find_duplicates(str(tmp_path), excluded_names={'node_modules'})[0] == []
+
+
+def test_pool_and_serial_agree(tmp_path, monkeypatch):
+    for i in range(80):
+        write(tmp_path / f'{i}.txt', b'%d' % (i % 20) * 50)
+    monkeypatch.setattr(duplicate_finder, 'MIN_POOL_FILES', 10 ** 9)
+    serial, _ = find_duplicates(str(tmp_path))
+    monkeypatch.setattr(duplicate_finder, 'MIN_POOL_FILES', 1)
+    pooled, _ = find_duplicates(str(tmp_path), workers=4)
+    assert len(serial) == 20
+    assert sorted(map(tuple, (g.paths for g in serial))) == sorted(map(tuple, (g.paths for g in pooled)))
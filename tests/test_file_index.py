@@ -0,0 +1,92 @@
+import os
+import re
+import shutil
+import time
+
+import pytest
+
+from file_index import FileIndex
+from file_search import FileQuery
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / 'home'
+    old = time.time() - 30 * 86400
+    for path, size in (('docs/Quarterly Report.pdf', 5000), ('docs/report-draft.docx', 100),
+                       ('docs/old/notes.txt', 10), ('music/song.mp3', 90_000), ('ab.txt', 1),
+                       ('node_modules/pkg/report.js', 50)):
+        path = root / path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b'x' * size)
+    os.utime(root / 'docs' / 'old' / 'notes.txt', (old, old))
+    return root
+
+
+@pytest.fixture
+def index(tmp_path, tree):
+    index = FileIndex(roots=[str(tree)], path=str(tmp_path / 'index.sqlite3'))
+    index.refresh(str(tree))
+    return index
+
+
+def names(index, query, path):
+    total, rows = index.search(query, str(path), limit=100)
+    assert total == len(rows)
+    return sorted(os.path.basename(row[0]) for row in rows)
+
+
+def test_substring_search_uses_the_trigram_table(index, tree):
+    assert names(index, 'report', tree) == ['Quarterly Report.pdf', 'report-draft.docx']
+    assert names(index, 'ab', tree) == ['ab.txt']  # too short for trigrams
+    assert names(index, '100%', tree) == []
+
+
+def test_prefix_glob_extension_and_folder(index, tree):
+    assert names(index, 'report*', tree) == ['report-draft.docx']
+    assert names(index, '*draft.doc?', tree) == ['report-draft.docx']
+    assert names(index, '*.txt', tree) == ['ab.txt', 'notes.txt']
+    assert names(index, '.mp3', tree) == ['song.mp3']
+    assert names(index, '*.txt', tree / 'docs') == ['notes.txt']
+
+
+def test_stat_criteria_and_regex(index, tree):
+    big = FileQuery(None, None, None, None, 1000, None, None, None)
+    assert names(index, big, tree) == ['Quarterly Report.pdf', 'song.mp3']
+    recent = FileQuery(None, None, None, frozenset(['txt']), None, None, time.time() - 86400, None)
+    assert names(index, recent, tree) == ['ab.txt']
+    regex = FileQuery(None, None, re.compile(r'^q\w+ report', re.IGNORECASE), None, None, None, None, None)
+    assert names(index, regex, tree) == ['Quarterly Report.pdf']
+
+
+def test_limit_and_newest_first(index, tree):
+    total, rows = index.search('*.txt', str(tree), limit=1)
+    assert total == 2 and [os.path.basename(row[0]) for row in rows] == ['ab.txt']
+
+
+def test_excluded_folders_are_not_indexed(index, tree):
+    assert 'report.js' not in names(index, 'report', tree)
+
+
+def test_incremental_refresh(index, tree):
+    assert index.refresh(str(tree)) == 0
+    (tree / 'music' / 'new song.mp3').write_bytes(b'x')
+    assert index.refresh(str(tree)) == 1
+    assert names(index, '.mp3', tree) == ['new song.mp3', 'song.mp3']
+    (tree / 'music' / 'song.mp3').unlink()
+    index.refresh(str(tree))
+    assert names(index, '.mp3', tree) == ['new song.mp3']
+
+
+def test_deleted_folders_leave_the_index(index, tree):
+    shutil.rmtree(tree / 'docs')
+    index.refresh(str(tree))
+    assert names(index, 'report', tree) == []
+    assert names(index, 'notes', tree) == []
+
+
+def test_indexed_root(index, tree, tmp_path):
+    assert index.indexed_root(str(tree / 'docs' / 'old')) == str(tree)
+    assert index.indexed_root(str(tmp_path)) is None
+    fresh = FileIndex(roots=[str(tree)], path=str(tmp_path / 'other.sqlite3'))
+    assert fresh.indexed_root(str(tree)) is None
@@ -0,0 +1,71 @@
+import os
+import time
+from datetime import datetime
+
+from command_parser import parse_command
+from file_search import FileQuery, find_files, parse_file_query
+
+NOW = datetime(2026, 10, 14, 12, 0)  # a Wednesday
+
+
+def query(text):
+    return parse_file_query(parse_command(text), now=NOW)
+
+
+def test_kind_size_and_date():
+    result = query("find pdfs bigger than 10 MB modified this week")
+    assert result.extensions == frozenset(['pdf'])
+    assert result.min_size == 10 * 1024 ** 2 and result.max_size is None
+    assert result.newer_than == datetime(2026, 10, 12).timestamp()
+    assert result.name is None
+
+
+def test_smaller_than_and_older_than():
+    result = query("find videos smaller than 1.5 gb older than 2 weeks")
+    assert 'mp4' in result.extensions
+    assert result.max_size == int(1.5 * 1024 ** 3)
+    assert result.older_than == NOW.timestamp() - 14 * 86400
+
+
+def test_name_glob_and_regex():
+    assert query("find files named budget 2024").name == 'budget 2024'
+    assert query("find report*.docx").glob == 'report*.docx'
+    assert query("find *.py").extensions == frozenset(['py'])
+    result = query(r"search regex ^inv\d+ files")
+    assert result.regex.search('INV42.pdf') and result.name is None
+
+
+def test_nothing_to_search_for():
+    assert query("find files") is None
+
+
+def test_from_pattern():
+    assert FileQuery.from_pattern("*.PDF").extensions == frozenset(['pdf'])
+    assert FileQuery.from_pattern(".txt").extensions == frozenset(['txt'])
+    assert FileQuery.from_pattern("notes*").glob == 'notes*'
+    assert FileQuery.from_pattern("Notes").name == 'notes'
+
+
+def test_name_test_and_stat_matches():
+    result = FileQuery('report', None, None, frozenset(['pdf']), 100, 1000, None, None)
+    test = result.name_test()
+    assert test('Q3 Report.PDF')
+    assert not test('Q3 Report.docx')
+    assert not test('summary.pdf')
+    assert result.needs_stat
+    assert result.stat_matches(500, 0)
+    assert not result.stat_matches(50, 0) and not result.stat_matches(5000, 0)
+
+
+def test_find_files(tmp_path):
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'sub' / 'big.log').write_bytes(b'x' * 2048)
+    (tmp_path / 'small.log').write_bytes(b'x')
+    (tmp_path / 'big.txt').write_bytes(b'x' * 2048)
+    old = time.time() - 30 * 86400
+    os.utime(tmp_path / 'big.txt', (old, old))
+    logs = FileQuery(None, None, None, frozenset(['log']), 1024, None, None, None)
+    assert [path for path, _, _ in find_files(logs, [str(tmp_path)])] == [str(tmp_path / 'sub' / 'big.log')]
+    recent = FileQuery(None, None, None, None, None, None, time.time() - 86400, None)
+    assert sorted(os.path.basename(path) for path, _, _ in find_files(recent, [str(tmp_path)])) == \
+        ['big.log', 'small.log']
@@ -0,0 +1,80 @@
+import pytest
+
+from history_log import HistoryLog
+from session import Session
+
+
+@pytest.fixture
+def log(tmp_path):
+    log = HistoryLog(str(tmp_path / 'history.sqlite3'), batch_size=4, flush_interval=0.05)
+    yield log
+    log.close()
+
+
+def turn(user, response, second):
+    return {'user': user, 'timestamp': f"2026-01-01T10:00:{second:02d}", 'response': response}
+
+
+def test_turns_round_trip_in_order(log):
+    for second in range(10):
+        log.append('a', turn(f"command {second}", f"reply {second}", second))
+    log.append('b', turn("other", "elsewhere", 30))
+    log.flush()
+    recent = log.recent('a', 3)
+    assert [row['user'] for row in recent] == ["command 7", "command 8", "command 9"]
+    assert recent[-1] == {'session': 'a', 'timestamp': "2026-01-01T10:00:09",
+                          'user': "command 9", 'response': "reply 9"}
+    assert len(log.between("2026-01-01T10:00:02", "2026-01-01T10:00:05")) == 3
+
+
+def test_turns_survive_reopening(tmp_path):
+    path = str(tmp_path / 'history.sqlite3')
+    first = HistoryLog(path)
+    first.append('a', turn("hello", "hi", 0))
+    first.close()
+    again = HistoryLog(path)
+    assert [row['user'] for row in again.recent('a', 10)] == ["hello"]
+    again.close()
+
+
+def test_search_finds_commands_and_responses(log):
+    log.append('a', turn("open chrome", "✅ Opening Chrome", 1))
+    log.append('a', turn("what time is it", "🕐 10:00", 2))
+    log.append('b', turn("close chrome", "✅ Closed", 3))
+    log.flush()
+    assert [row['user'] for row in log.search("chrome")] == ["close chrome", "open chrome"]
+    assert [row['user'] for row in log.search("chrome", session_id='a')] == ["open chrome"]
+    assert [row['user'] for row in log.search("10:00")] == ["what time is it"]
+    assert log.search("   ") == []
+    # Query syntax in user text is matched literally
+    assert log.search('chrome" OR "time') == []
+
+
+def test_search_without_fts_falls_back_to_like(log):
+    log.append('a', turn("open chrome", "✅ Opening Chrome", 1))
+    log.flush()
+    log.has_fts = False
+    assert [row['user'] for row in log.search("chro")] == ["open chrome"]
+
+
+def test_fts_index_is_used_when_available(log):
+    if not log.has_fts:
+        pytest.skip("SQLite without FTS5")
+    log.append('a', turn("open chrome", "✅", 1))
+    log.flush()
+    rows = log._connect().execute("SELECT user FROM turns_fts WHERE turns_fts MATCH 'chrome'").fetchall()
+    assert rows == [("open chrome",)]
+
+
+def test_session_history_is_a_bounded_ring_buffer(log):
+    session = Session('ring', log, capacity=5)
+    for i in range(12):
+        session.finish(session.record(f"command {i}"), f"reply {i}")
+    assert len(session.history) == 5
+    assert [entry['user'] for entry in session.history] == [f"command {i}" for i in range(7, 12)]
+    log.flush()
+    # Everything is still in the log, and a new session with the id starts from the latest turns
+    assert len(log.recent('ring', 100)) == 12
+    resumed = Session('ring', log, capacity=3)
+    assert [entry['user'] for entry in resumed.history] == ["command 9", "command 10", "command 11"]
+
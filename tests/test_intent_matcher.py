@@ -0,0 +1,91 @@
+import pytest
+
+from ai_core import INTENT_KEYWORDS
+from intent_matcher import IntentMatcher, PhraseIndex, tokenize
+
+matcher = IntentMatcher(INTENT_KEYWORDS)
+
+
+def test_routes_common_commands():
+    assert matcher.best("open chrome") == 'app'
+    assert matcher.best("take a screenshot") == 'screenshot'
+    assert matcher.best("what time is it") == 'time_date'
+    assert matcher.best("how much space is left") == 'file'
+
+
+def test_keywords_match_whole_words_only():
+    # "restart" must not trigger the app intent through "start"
+    assert 'app' not in [candidate.intent for candidate in matcher.match("restart the computer")]
+    assert matcher.best("restart the computer") == 'system_control'
+
+
+def test_unknown_text_has_no_intent():
+    assert matcher.match("tell me a joke") == []
+    assert matcher.best("tell me a joke") is None
+
+
+def test_more_hits_rank_first_then_declaration_order():
+    matcher = IntentMatcher({'first': ['alpha'], 'second': ['beta', 'gamma']})
+    assert [candidate.intent for candidate in matcher.match("alpha beta gamma")] == ['second', 'first']
+    assert IntentMatcher({'first': ['alpha'], 'second': ['alpha']}).best("alpha") == 'first'
+
+
+def test_best_agrees_with_the_ranking():
+    for text in ("open chrome and take a screenshot", "restart", "screen shot of the volume", "hello",
+                 "what time is the weather"):
+        candidates = matcher.match(tokenize(text))
+        assert matcher.best(tokenize(text)) == (candidates[0].intent if candidates else None)
+
+
+def test_multi_word_phrases():
+    matcher = IntentMatcher({'volume': ['turn up'], 'other': ['turn']})
+    candidates = matcher.match(tokenize("turn up the sound"))
+    assert candidates[0].intent == 'volume'
+    assert candidates[0].keywords == ('turn up',)
+
+
+def test_phrase_index_prefers_longest_match():
+    index = PhraseIndex()
+    index.add("visual studio", 'vs')
+    index.add("visual studio code", 'code')
+    matches = index.longest_matches(tokenize("open visual studio code now"))
+    assert [(start, end, payloads) for start, end, payloads in matches] == [(1, 4, ['code'])]
+    assert len(index) == 2
+
+
+@pytest.fixture(scope='module')
+def core(tmp_path_factory):
+    from ai_core import AICore
+    from history_log import HistoryLog
+    return AICore(history_log=HistoryLog(str(tmp_path_factory.mktemp('history') / 'history.sqlite3')),
+                  background=False)
+
+
+@pytest.fixture
+def launched(core, monkeypatch):
+    launched = []
+    monkeypatch.setattr(core, '_open_application', lambda info: launched.append(info['description']) or True)
+    monkeypatch.setattr(core, '_launch_installed', lambda app: launched.append(app['name']) or True)
+    for name in ('shutdown_system', 'restart_system'):
+        monkeypatch.setattr(core, name, lambda name=name: launched.append(name) or f"{name} ran")
+    return launched
+
+
+def test_restarting_a_named_app_never_restarts_the_computer(core, launched):
+    assert core.predict_intent("restart chrome") == 'app'
+    intent, response = core.dispatch("restart chrome", session=core.new_session())
+    assert intent == 'app' and response.startswith("✅ Opening")
+    assert len(launched) == 1 and 'restart_system' not in launched
+
+
+def test_shutdown_and_restart_wait_for_a_yes(core, launched):
+    session = core.new_session()
+    intent, response = core.dispatch("restart the computer", session=session)
+    assert intent == 'system_control' and "Say **yes**" in response
+    assert launched == []
+    assert core.dispatch("yes", session=session) == ('confirm', "restart_system ran")
+
+    core.dispatch("shutdown", session=session)
+    core.dispatch("no", session=session)
+    assert core.dispatch("yes", session=session)[0] != 'confirm'
+    assert launched == ['restart_system']
@@ -0,0 +1,83 @@
+import sqlite3
+
+import pytest
+
+import scan_history
+from scan_history import SNAPSHOT_VERSION, Change, ScanHistory
+
+ROOT = '/data'
+
+
+@pytest.fixture
+def history(tmp_path):
+    return ScanHistory(str(tmp_path / 'scan_history.sqlite3'))
+
+
+def rows(sizes):
+    return [(path, size, 0) for path, size in sizes.items()]
+
+
+def test_record_saves_a_snapshot(history):
+    snapshot = history.record(ROOT, rows({ROOT: 30, '/data/a': 10, '/data/b': 20}), taken_at=100.0)
+    assert snapshot.root == ROOT and snapshot.taken_at == 100.0
+    assert snapshot.entries == 3 and snapshot.version == SNAPSHOT_VERSION
+    assert history.snapshots(ROOT) == [snapshot]
+
+
+def test_diff_reports_grown_shrunk_new_and_removed(history):
+    old = history.record(ROOT, rows({ROOT: 60, '/data/same': 10, '/data/grew': 20,
+                                     '/data/shrank': 20, '/data/removed': 10}), taken_at=1.0)
+    new = history.record(ROOT, rows({ROOT: 85, '/data/same': 10, '/data/grew': 50,
+                                     '/data/shrank': 5, '/data/new': 20}), taken_at=2.0)
+    diff = history.diff(old.id, new.id)
+    # The root grew by 25 as well, but /data/grew explains all of that
+    assert diff.changes == [Change('/data/grew', 20, 50), Change('/data/new', 0, 20)]
+    assert diff.grown == 3 and diff.shrunk == 2
+    assert diff.total_change == 25
+
+
+def test_diff_lists_the_most_specific_folder(history):
+    old = history.record(ROOT, rows({ROOT: 10, '/data/a': 10, '/data/a/b': 10}), taken_at=1.0)
+    new = history.record(ROOT, rows({ROOT: 110, '/data/a': 110, '/data/a/b': 110}), taken_at=2.0)
+    assert history.diff(old.id, new.id).changes == [Change('/data/a/b', 10, 110)]
+
+
+def test_diff_keeps_a_parent_that_grew_elsewhere(history):
+    old = history.record(ROOT, rows({ROOT: 0, '/data/a': 0}), taken_at=1.0)
+    new = history.record(ROOT, rows({ROOT: 100, '/data/a': 10}), taken_at=2.0)
+    assert [change.path for change in history.diff(old.id, new.id).changes] == [ROOT, '/data/a']
+
+
+def test_what_grew_compares_the_two_latest_snapshots(history):
+    history.record(ROOT, rows({ROOT: 1, '/data/a': 1}), taken_at=1.0)
+    history.record(ROOT, rows({ROOT: 5, '/data/a': 5}), taken_at=2.0)
+    history.record(ROOT, rows({ROOT: 9, '/data/a': 9}), taken_at=3.0)
+    assert history.what_grew(ROOT).changes == [Change('/data/a', 5, 9)]
+
+
+def test_what_grew_ignores_snapshots_of_older_versions(history):
+    history.record(ROOT, rows({ROOT: 1, '/data/a': 1}), taken_at=1.0, version=SNAPSHOT_VERSION - 1)
+    history.record(ROOT, rows({ROOT: 50, '/data/a': 1, '/data/.git': 49}), taken_at=2.0)
+    assert history.what_grew(ROOT) is None
+    history.record(ROOT, rows({ROOT: 60, '/data/a': 11, '/data/.git': 49}), taken_at=3.0)
+    assert history.what_grew(ROOT).changes == [Change('/data/a', 1, 11)]
+
+
+def test_database_without_versions_counts_as_version_one(tmp_path):
+    path = str(tmp_path / 'old.sqlite3')
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE snapshots (id INTEGER PRIMARY KEY, root TEXT NOT NULL, "
+                 "taken_at REAL NOT NULL, entries INTEGER NOT NULL)")
+    conn.execute("INSERT INTO snapshots (root, taken_at, entries) VALUES (?, 1.0, 0)", (ROOT,))
+    conn.commit()
+    conn.close()
+    assert [snapshot.version for snapshot in ScanHistory(path).snapshots(ROOT)] == [1]
+
+
+def test_old_snapshots_are_pruned(history, monkeypatch):
+    monkeypatch.setattr(scan_history, 'KEEP_SNAPSHOTS', 2)
+    for taken_at in range(1, 5):
+        history.record(ROOT, rows({ROOT: taken_at, f'/data/only{taken_at}': 1}), taken_at=float(taken_at))
+    assert [snapshot.taken_at for snapshot in history.snapshots(ROOT)] == [4.0, 3.0]
+    paths = {row[0] for row in history._connect().execute("SELECT path FROM paths")}
+    assert paths == {ROOT, '/data/only3', '/data/only4'}
@@ -0,0 +1,23 @@
+import session
+from session import Session, new_session_id
+
+
+def test_session_ids_are_unique():
+    assert len({new_session_id() for _ in range(1000)}) == 1000
+    assert new_session_id('batch').startswith('batch-')
+    assert Session().id != Session().id
+
+
+def test_pending_action_is_handed_back_once():
+    s = Session()
+    assert s.take_pending() is None
+    s.await_confirmation(lambda: "done")
+    assert s.take_pending()() == "done"
+    assert s.take_pending() is None
+
+
+def test_pending_action_expires(monkeypatch):
+    s = Session()
+    s.await_confirmation(lambda: "done")
+    monkeypatch.setattr(session, 'CONFIRM_SECONDS', -1)
+    assert s.take_pending() is None
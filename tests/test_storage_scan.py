@@ -0,0 +1,99 @@
+import os
+
+import pytest
+
+import storage_scan
+from storage_scan import AGE_BUCKETS, CATEGORIES, breakdown, largest_files
+
+NOW = 2_000_000_000
+DAY = 86400
+
+# (relative path, size, age in days)
+FILES = [
+    ('movies/trip.mp4', 5000, 3),
+    ('movies/old.MKV', 3000, 400),
+    ('photos/a.jpg', 700, 20),
+    ('photos/b.png', 300, 100),
+    ('docs/report.pdf', 120, 2000),
+    ('docs/notes.txt', 80, 10),
+    ('backup.zip', 900, 200),
+    ('Makefile', 40, 1),
+    ('app/node_modules/lib/index.js', 60, 5),
+    ('app/.cache/blob.jpg', 250, 50),
+    ('app/main.py', 30, 1),
+]
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for relative, size, days in FILES:
+        path = tmp_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b'x' * size)
+        when = NOW - days * DAY
+        os.utime(path, (when, when))
+    return tmp_path
+
+
+def on_disk(root):
+    """(path, size, mtime) of every file below root, as os.walk sees it"""
+    found = []
+    for directory, _, names in os.walk(root):
+        for name in names:
+            st = os.stat(os.path.join(directory, name))
+            found.append((os.path.relpath(os.path.join(directory, name), root), st.st_size, st.st_mtime))
+    return found
+
+
+def totals(shares):
+    return {share.label: (share.bytes, share.files) for share in shares}
+
+
+def expected_ages(root):
+    expected = {label: [0, 0] for label, _ in AGE_BUCKETS}
+    for _, size, mtime in on_disk(root):
+        age = NOW - int(mtime)
+        label = next(label for label, limit in AGE_BUCKETS if limit is None or age < limit)
+        expected[label][0] += size
+        expected[label][1] += 1
+    return {label: tuple(value) for label, value in expected.items()}
+
+
+def check(tree):
+    result = breakdown(str(tree), now=NOW)
+    files = on_disk(tree)
+    assert result.files == len(files)
+    assert result.bytes == sum(size for _, size, _ in files)
+    assert sum(share.bytes for share in result.categories) == result.bytes
+    assert sum(share.bytes for share in result.extensions) == result.bytes
+    assert totals(result.modified) == expected_ages(tree)
+    assert totals(result.accessed) == expected_ages(tree)
+    assert totals(result.categories) == {
+        'Videos': (8000, 2), 'Images': (1000, 2), 'Documents': (200, 2), 'Archives': (900, 1),
+        'Build artifacts': (60, 1), 'Caches': (250, 1), 'Other': (70, 2),
+    }
+    # Extensions count every file, including the ones a cache folder puts under Caches
+    assert totals(result.extensions)['.jpg'] == (950, 2)
+    assert totals(result.extensions)['.mkv'] == (3000, 1)
+    assert totals(result.extensions)['(none)'] == (40, 1)
+    assert [share.bytes for share in result.categories] == sorted((s.bytes for s in result.categories), reverse=True)
+    assert set(share.label for share in result.categories) <= set(CATEGORIES)
+
+
+def test_breakdown_totals_match_the_files_on_disk(tree):
+    check(tree)
+
+
+def test_breakdown_totals_are_the_same_across_chunks(tree, monkeypatch):
+    monkeypatch.setattr(storage_scan, 'CHECK_EVERY', 1)
+    monkeypatch.setattr(storage_scan, 'BREAKDOWN_CHUNK', 3)
+    check(tree)
+
+
+def test_largest_files_keeps_the_biggest(tree):
+    result = largest_files(str(tree), limit=3)
+    assert result.done and result.files == len(FILES)
+    assert result.bytes == sum(size for _, size, _ in FILES)
+    assert [(size, os.path.relpath(path, tree)) for size, path in result.largest] == [
+        (5000, os.path.join('movies', 'trip.mp4')), (3000, os.path.join('movies', 'old.MKV')),
+        (900, 'backup.zip')]
@@ -0,0 +1,135 @@
+import json
+import os
+import shutil
+import socket
+import stat
+import tempfile
+import threading
+
+import pytest
+
+import tejas_daemon
+from tejas_client import DaemonError, TejasClient, token_path
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="needs Unix domain sockets")
+
+
+def serve(address):
+    daemon = tejas_daemon.TejasDaemon(address)
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    return daemon, thread
+
+
+def stop(daemon, thread):
+    daemon.server.shutdown()
+    thread.join(5)
+
+
+@pytest.fixture
+def unix_daemon():
+    # Short directory: socket paths are limited to about 100 bytes
+    directory = tempfile.mkdtemp(prefix='tejas')
+    daemon, thread = serve(os.path.join(directory, 'tejas.sock'))
+    yield daemon
+    stop(daemon, thread)
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def tcp_daemon():
+    daemon, thread = serve('127.0.0.1:0')
+    host, port = daemon.server.server_address
+    yield daemon, f"{host}:{port}"
+    stop(daemon, thread)
+
+
+def raw(address, *lines):
+    """Replies to lines sent as-is over one connection"""
+    if isinstance(address, tuple):
+        sock = socket.create_connection(address, timeout=10)
+    else:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(10)
+        sock.connect(address)
+    with sock, sock.makefile('r', encoding='utf-8') as reader:
+        replies = []
+        for line in lines:
+            sock.sendall(line.encode('utf-8') + b'\n')
+            replies.append(json.loads(reader.readline()))
+        return replies
+
+
+def request(method, request_id=1, **params):
+    return json.dumps({'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params})
+
+
+def test_unix_socket_is_owner_only(unix_daemon):
+    assert stat.S_IMODE(os.stat(unix_daemon.address).st_mode) == 0o600
+
+
+def test_dispatch_runs_methods(unix_daemon):
+    client = TejasClient(unix_daemon.address, timeout=30)
+    try:
+        assert client.call('ping')['requests'] == 1
+        result = client.call('process_command', text="hello", session='daemon-test')
+        assert result['response'] and result['elapsed_ms'] >= 0
+        assert client.call('ping')['sessions'] == 1
+    finally:
+        client.close()
+
+
+@pytest.mark.parametrize('line, code', [
+    ('{not json', tejas_daemon.PARSE_ERROR),
+    ('[1, 2]', tejas_daemon.INVALID_REQUEST),
+    ('{"jsonrpc": "2.0", "id": 1}', tejas_daemon.INVALID_REQUEST),
+    (request('no_such_method'), tejas_daemon.METHOD_NOT_FOUND),
+    ('{"jsonrpc": "2.0", "id": 1, "method": "ping", "params": [1]}', tejas_daemon.INVALID_PARAMS),
+    (request('ping', bogus=1), tejas_daemon.INVALID_PARAMS),
+])
+def test_bad_requests_get_error_replies(unix_daemon, line, code):
+    [reply] = raw(unix_daemon.address, line)
+    assert reply['error']['code'] == code and 'result' not in reply
+
+
+def test_error_reply_keeps_the_request_id(unix_daemon):
+    [reply] = raw(unix_daemon.address, request('no_such_method', request_id='abc'))
+    assert reply['id'] == 'abc'
+
+
+def test_internal_errors_are_reported(unix_daemon, monkeypatch):
+    def broken(text, session=None, limit=50):
+        raise RuntimeError("database is gone")
+    monkeypatch.setattr(tejas_daemon.ai_core, 'search_history', broken)
+    [reply] = raw(unix_daemon.address, request('search_history', text="x"))
+    assert reply['error'] == {'code': tejas_daemon.INTERNAL_ERROR, 'message': "database is gone"}
+
+
+def test_tcp_requires_the_token(tcp_daemon):
+    daemon, address = tcp_daemon
+    host, port = address.rsplit(':', 1)
+    assert stat.S_IMODE(os.stat(token_path()).st_mode) == 0o600
+    unauthorized, wrong, still = raw((host, int(port)), request('ping'), request('authenticate', token='nope'),
+                                     request('process_command', text="shutdown"))
+    assert unauthorized['error']['code'] == tejas_daemon.UNAUTHORIZED
+    assert wrong['error']['code'] == tejas_daemon.UNAUTHORIZED
+    assert still['error']['code'] == tejas_daemon.UNAUTHORIZED
+    assert daemon.server.token not in json.dumps([unauthorized, wrong, still])
+
+
+def test_tcp_client_with_the_token_is_served(tcp_daemon):
+    _, address = tcp_daemon
+    client = TejasClient(address, timeout=30)
+    try:
+        assert client.call('ping')['uptime'] >= 0
+    finally:
+        client.close()
+
+
+def test_tcp_client_with_a_stale_token_is_refused(tcp_daemon):
+    _, address = tcp_daemon
+    with open(token_path(), 'w', encoding='utf-8') as f:
+        f.write('0' * 64)
+    with pytest.raises(DaemonError) as error:
+        TejasClient(address, timeout=30)
+    assert error.value.code == tejas_daemon.UNAUTHORIZED
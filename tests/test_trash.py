@@ -0,0 +1,103 @@
+import json
+import os
+import time
+
+import pytest
+
+from trash import GRACE_SECONDS, Trash
+
+
+@pytest.fixture
+def trash(tmp_path):
+    return Trash(retention_days=7, max_bytes=10 ** 9, path=str(tmp_path / 'trash.sqlite3'))
+
+
+def make_folder(path):
+    (path / 'nested').mkdir(parents=True)
+    (path / 'nested' / 'a.txt').write_text("a" * 100)
+    (path / 'b.txt').write_text("b" * 50)
+
+
+def test_stage_and_undo_restore_the_last_delete(tmp_path, trash):
+    make_folder(tmp_path / 'project')
+    (tmp_path / 'note.txt').write_text("note")
+    folder = trash.stage(str(tmp_path / 'project'))
+    note = trash.stage(str(tmp_path / 'note.txt'))
+    assert folder and note
+    assert not (tmp_path / 'project').exists() and os.path.exists(folder.staged)
+
+    assert trash.undo().original == str(tmp_path / 'note.txt')
+    assert (tmp_path / 'note.txt').read_text() == "note"
+    assert trash.undo().original == str(tmp_path / 'project')
+    assert (tmp_path / 'project' / 'nested' / 'a.txt').read_text() == "a" * 100
+    assert trash.undo() is None
+
+
+def test_undo_never_overwrites(tmp_path, trash):
+    (tmp_path / 'note.txt').write_text("old")
+    trash.stage(str(tmp_path / 'note.txt'))
+    (tmp_path / 'note.txt').write_text("new")
+    with pytest.raises(FileExistsError):
+        trash.undo()
+    assert (tmp_path / 'note.txt').read_text() == "new"
+    assert len(trash.entries()) == 1
+
+
+def test_entries_survive_a_restart(tmp_path, trash):
+    (tmp_path / 'note.txt').write_text("note")
+    trash.stage(str(tmp_path / 'note.txt'))
+    reloaded = Trash(path=trash.path)
+    assert reloaded.undo().original == str(tmp_path / 'note.txt')
+
+
+def test_processes_sharing_the_trash_keep_each_others_deletes(tmp_path, trash):
+    # Two Trash objects on one database stand in for the dashboard and the daemon
+    other = Trash(retention_days=7, max_bytes=10 ** 9, path=trash.path)
+    for name, owner in (('a.txt', trash), ('b.txt', other), ('c.txt', trash)):
+        (tmp_path / name).write_text(name)
+        owner.stage(str(tmp_path / name))
+    assert [os.path.basename(entry.original) for entry in other.entries()] == ['a.txt', 'b.txt', 'c.txt']
+    assert os.path.basename(other.undo().original) == 'c.txt'
+    assert os.path.basename(trash.undo().original) == 'b.txt'
+    assert trash.purge(now=time.time() + 8 * 86400) == (1, 5)
+    assert other.entries() == [] and other.undo() is None
+
+
+def test_interrupted_purge_is_retried_and_never_restored(tmp_path, trash, monkeypatch):
+    make_folder(tmp_path / 'project')
+    entry = trash.stage(str(tmp_path / 'project'))
+    monkeypatch.setattr('trash.remove_tree', lambda path, pool: (_ for _ in ()).throw(OSError("busy")))
+    assert trash.purge(now=time.time() + 8 * 86400) == (0, 0)
+    assert trash.undo() is None
+    monkeypatch.undo()
+    assert trash.purge() == (1, 150)
+    assert not os.path.exists(entry.staged)
+
+
+def test_old_json_manifest_is_imported(tmp_path, monkeypatch):
+    monkeypatch.setattr('trash.user_path', lambda *parts: str(tmp_path.joinpath(*parts)))
+    (tmp_path / 'staged').write_text("old")
+    (tmp_path / 'trash.json').write_text(json.dumps([{'id': '1', 'original': str(tmp_path / 'restored'),
+                                                      'staged': str(tmp_path / 'staged'),
+                                                      'deleted_at': time.time(), 'size': None}]))
+    trash = Trash()
+    assert not (tmp_path / 'trash.json').exists()
+    assert trash.undo().id == '1'
+    assert (tmp_path / 'restored').read_text() == "old"
+
+
+def test_purge_expired_items(tmp_path, trash):
+    make_folder(tmp_path / 'project')
+    entry = trash.stage(str(tmp_path / 'project'))
+    assert trash.purge() == (0, 0)
+    assert trash.purge(now=time.time() + 8 * 86400) == (1, 150)
+    assert not os.path.exists(entry.staged)
+    assert trash.undo() is None
+
+
+def test_size_cap_spares_recent_deletes(tmp_path):
+    trash = Trash(retention_days=7, max_bytes=100, path=str(tmp_path / 'trash.sqlite3'))
+    make_folder(tmp_path / 'project')
+    trash.stage(str(tmp_path / 'project'))
+    assert trash.purge() == (0, 0)
+    assert trash.purge(now=time.time() + GRACE_SECONDS + 1) == (1, 150)
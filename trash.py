@@ -0,0 +1,311 @@
+# trash.py - Instant deletes into a staging trash, background purge and undo
+"""
+Deleting renames the item into a trash directory on the same filesystem,
+which is one rename no matter how big the tree is. For the filesystem
+holding TEJAS_HOME that is ~/.tejas/trash; other drives get a
+.tejas-trash-<user> folder at their mount point. If no such folder can be
+created, stage() returns None and the caller deletes in place.
+
+The staged items are listed in an SQLite database (trash.sqlite3), which
+the dashboard, the daemon and batch runs share: every stage, undo and
+purge reads and changes the rows inside one transaction, so no process
+overwrites another's deletes. A low-priority daemon thread measures the
+items and purges them by unlinking files in parallel. An item is purged
+once it is older than the retention period (TEJAS_TRASH_DAYS, default 7),
+or, oldest first, while the trash is larger than TEJAS_TRASH_MAX_GB
+(default 10). Items deleted within the last GRACE_SECONDS are never purged
+for size, so "undo last delete" still works right after deleting
+something huge. An item is marked as purging before its files go, so undo
+never picks a half-deleted item, and a purge that fails or is interrupted
+is retried by the next pass of any process.
+"""
+import itertools
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from user_paths import user_path
+
+PURGE_INTERVAL = 600  # seconds between purge passes (a delete also wakes the purger)
+GRACE_SECONDS = 600
+UNLINK_BATCH = 256
+UNLINK_WORKERS = 4
+
+TrashEntry = namedtuple('TrashEntry', ['id', 'original', 'staged', 'deleted_at', 'size'])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    original TEXT NOT NULL,
+    staged TEXT NOT NULL,
+    deleted_at REAL NOT NULL,
+    size INTEGER,
+    purging INTEGER NOT NULL DEFAULT 0
+);
+"""
+_COLUMNS = "id, original, staged, deleted_at, size"
+
+
+def _env_number(name, default):
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _mount_point(path):
+    """Top directory of the filesystem that contains path"""
+    path = os.path.realpath(path)
+    device = os.lstat(path).st_dev
+    while True:
+        parent = os.path.dirname(path)
+        if parent == path or os.lstat(parent).st_dev != device:
+            return path
+        path = parent
+
+
+def _user_tag():
+    return str(os.getuid()) if hasattr(os, 'getuid') else os.getenv('USERNAME', 'user')
+
+
+def trash_folder_name():
+    """Name of the per-user trash folder at a mount point"""
+    return f'.tejas-trash-{_user_tag()}'
+
+
+def tree_size(path):
+    """Bytes used by a file or folder (symlinks count as themselves)"""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return 0
+    if not os.path.isdir(path) or os.path.islink(path):
+        return st.st_size
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+
+def _unlink_batch(paths):
+    for path in paths:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+def remove_tree(path, pool):
+    """Delete a file or folder, unlinking the files on pool; raises OSError if anything is left"""
+    if os.path.islink(path) or not os.path.isdir(path):
+        os.unlink(path)
+        return
+    files = []
+    directories = [path]
+    stack = [path]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.path)
+                    stack.append(entry.path)
+                else:
+                    files.append(entry.path)
+    list(pool.map(_unlink_batch, [files[i:i + UNLINK_BATCH] for i in range(0, len(files), UNLINK_BATCH)]))
+    # Parents were listed before their children, so reversed order empties the deepest first
+    for directory in reversed(directories):
+        os.rmdir(directory)
+
+
+class Trash:
+    """Staging trash shared by every delete on this machine"""
+
+    def __init__(self, retention_days=None, max_bytes=None, path=None):
+        self.retention = (retention_days if retention_days is not None
+                          else _env_number('TEJAS_TRASH_DAYS', 7)) * 86400
+        self.max_bytes = max_bytes if max_bytes is not None else _env_number('TEJAS_TRASH_MAX_GB', 10) * 1024 ** 3
+        self.path = path or user_path('trash.sqlite3')
+        self._local = threading.local()
+        self._wake = threading.Event()
+        self._ids = itertools.count()
+        self._thread = None
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        if path is None:
+            self._import_manifest(conn, user_path('trash.json'))
+        # Something else may have emptied a trash folder since the last run
+        missing = [(item_id,) for item_id, staged in conn.execute("SELECT id, staged FROM items")
+                   if not os.path.lexists(staged)]
+        conn.executemany("DELETE FROM items WHERE id = ?", missing)
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # isolation_level=None: transactions are opened explicitly with BEGIN IMMEDIATE
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _import_manifest(self, conn, manifest):
+        """Move the entries of the trash.json used by older versions into the database"""
+        try:
+            with open(manifest, 'r', encoding='utf-8') as f:
+                entries = [TrashEntry(**item) for item in json.load(f)]
+        except (OSError, ValueError, TypeError):
+            return
+        conn.executemany(f"INSERT OR IGNORE INTO items ({_COLUMNS}) VALUES (?, ?, ?, ?, ?)", entries)
+        try:
+            os.remove(manifest)
+        except OSError:
+            pass
+
+    def entries(self):
+        """Items that can still be restored, oldest first"""
+        rows = self._connect().execute(f"SELECT {_COLUMNS} FROM items WHERE purging = 0 ORDER BY seq")
+        return [TrashEntry(*row) for row in rows]
+
+    def _trash_dir_for(self, path):
+        """Trash folder on the same filesystem as path, or None"""
+        parent = os.path.dirname(os.path.abspath(path))
+        device = os.stat(parent).st_dev
+        candidates = [user_path('trash')]
+        try:
+            candidates.append(os.path.join(_mount_point(parent), trash_folder_name()))
+        except OSError:
+            pass
+        for directory in candidates:
+            try:
+                os.makedirs(directory, mode=0o700, exist_ok=True)
+                if os.stat(directory).st_dev == device:
+                    return directory
+            except OSError:
+                continue
+        return None
+
+    # ----------------------------
+    # Deleting and restoring
+    # ----------------------------
+    def stage(self, path):
+        """Move path into the trash with one rename; returns its TrashEntry, or None if that is not possible"""
+        path = os.path.abspath(path)
+        directory = self._trash_dir_for(path)
+        if directory is None:
+            return None
+        item_id = f"{time.time_ns()}-{os.getpid()}-{next(self._ids)}"
+        staged = os.path.join(directory, item_id)
+        try:
+            os.rename(path, staged)
+        except OSError:
+            return None
+        entry = TrashEntry(item_id, path, staged, time.time(), None)
+        self._connect().execute(f"INSERT INTO items ({_COLUMNS}) VALUES (?, ?, ?, ?, ?)", entry)
+        self._wake.set()
+        return entry
+
+    def undo(self):
+        """Put the most recently deleted item back; returns its TrashEntry, or None if nothing is staged"""
+        conn = self._connect()
+        # IMMEDIATE: another process cannot restore or purge the same item meanwhile
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(f"SELECT {_COLUMNS} FROM items WHERE purging = 0 ORDER BY seq DESC LIMIT 1").fetchone()
+            if row is None:
+                return None
+            entry = TrashEntry(*row)
+            if os.path.lexists(entry.original):
+                raise FileExistsError(f"'{entry.original}' already exists")
+            os.makedirs(os.path.dirname(entry.original), exist_ok=True)
+            os.rename(entry.staged, entry.original)
+            conn.execute("DELETE FROM items WHERE id = ?", (entry.id,))
+            return entry
+        finally:
+            conn.execute("COMMIT")
+
+    # ----------------------------
+    # Purging
+    # ----------------------------
+    def start(self):
+        """Run purge passes on a low-priority daemon thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._purge_loop, name='TrashPurge', daemon=True)
+        self._thread.start()
+
+    def _purge_loop(self):
+        if sys.platform.startswith('linux'):
+            try:
+                # On Linux the nice value is per thread, and pool threads started from here inherit it
+                os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+            except (AttributeError, OSError):
+                pass
+        while True:
+            self._wake.wait(PURGE_INTERVAL)
+            self._wake.clear()
+            try:
+                self.purge()
+            except Exception as e:
+                print(f"⚠️ Trash purge failed: {e}")
+
+    def _measure(self):
+        """Fill in missing sizes (outside any transaction; sizing a big tree takes a while)"""
+        conn = self._connect()
+        for item_id, staged in conn.execute("SELECT id, staged FROM items WHERE size IS NULL").fetchall():
+            conn.execute("UPDATE items SET size = ? WHERE id = ?", (tree_size(staged), item_id))
+
+    def purge(self, now=None):
+        """Delete staged items past retention or over the size cap; returns (items, bytes) freed"""
+        self._measure()
+        now = now or time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Items marked by an earlier pass that did not finish are retried, never restored
+            doomed = [TrashEntry(*row) for row in
+                      conn.execute(f"SELECT {_COLUMNS} FROM items WHERE purging = 1 ORDER BY seq")]
+            entries = [TrashEntry(*row) for row in
+                       conn.execute(f"SELECT {_COLUMNS} FROM items WHERE purging = 0 ORDER BY seq")]
+            total = sum(entry.size or 0 for entry in entries)
+            for entry in entries:  # oldest first
+                expired = now - entry.deleted_at > self.retention
+                over_cap = total > self.max_bytes and now - entry.deleted_at > GRACE_SECONDS
+                if expired or over_cap:
+                    doomed.append(entry)
+                    total -= entry.size or 0
+            # Marked before deleting, so undo can never pick a half-deleted item
+            conn.executemany("UPDATE items SET purging = 1 WHERE id = ?", [(entry.id,) for entry in doomed])
+        finally:
+            conn.execute("COMMIT")
+        if not doomed:
+            return 0, 0
+
+        freed = removed = 0
+        with ThreadPoolExecutor(max_workers=UNLINK_WORKERS, thread_name_prefix='purge') as pool:
+            for entry in doomed:
+                try:
+                    if os.path.lexists(entry.staged):
+                        remove_tree(entry.staged, pool)
+                except OSError:
+                    continue
+                conn.execute("DELETE FROM items WHERE id = ?", (entry.id,))
+                freed += entry.size or 0
+                removed += 1
+        return removed, freed
@@ -0,0 +1,128 @@
+# tree_walker.py - Parallel os.scandir tree walker shared by file search and storage scans
+"""
+walk() lists directories on a thread pool and yields os.DirEntry objects as
+a stream, in no particular order. Entries are returned as soon as their
+directory has been read.
+
+* One scandir per directory, with no separate isdir/getsize calls. With
+  stat=True each file's stat is fetched on the worker thread, so the
+  consumer's entry.stat() is served from the DirEntry cache (on Windows
+  scandir already carries it).
+* Excluded names (.git, node_modules, ...) and virtual filesystems
+  (/proc, /sys, ...) are never entered. Symlinked directories are not
+  followed.
+* Closing the generator early (break, or leaving a `with closing(...)`
+  block) stops the workers from listing any further directories.
+"""
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+EXCLUDED_NAMES = frozenset(['.git', '.hg', '.svn', 'node_modules', '__pycache__', '.tox', '.venv',
+                            '$RECYCLE.BIN', 'System Volume Information'])
+VIRTUAL_FS_PATHS = frozenset(['/proc', '/sys', '/dev', '/run', '/snap']) if sys.platform != 'win32' else frozenset()
+
+# Directory reads release the GIL and mostly wait on the disk, so use more threads than cores
+DEFAULT_WORKERS = min(16, (os.cpu_count() or 1) + 4)
+
+_DONE = object()
+
+
+def _is_excluded(entry, names, paths):
+    return entry.name in names or entry.path in paths
+
+
+def walk(roots, excludes=None, workers=DEFAULT_WORKERS, stat=False, dirs=False, excluded_names=EXCLUDED_NAMES):
+    """Yield DirEntry objects for every file (and directory, if dirs=True) below roots.
+
+    excludes: extra directory names or absolute paths to skip, added to
+    excluded_names / VIRTUAL_FS_PATHS. Storage scans pass excluded_names=()
+    to count dependency and cache folders too.
+    """
+    if isinstance(roots, (str, os.PathLike)):
+        roots = [roots]
+    names = set(excluded_names)
+    paths = set(VIRTUAL_FS_PATHS)
+    for item in excludes or ():
+        if os.path.isabs(item):
+            paths.add(os.path.abspath(item))
+        else:
+            names.add(item)
+
+    results = queue.Queue(maxsize=256)
+    stop = threading.Event()
+    outstanding = [0]
+    lock = threading.Lock()
+
+    def submit(path):
+        with lock:
+            outstanding[0] += 1
+        pool.submit(scan, path)
+
+    def scan(path):
+        batch = []
+        try:
+            if not stop.is_set():
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if _is_excluded(entry, names, paths):
+                                    continue
+                                if dirs:
+                                    if stat:
+                                        # Before its files are yielded: a caller deleting them changes the mtime
+                                        entry.stat(follow_symlinks=False)
+                                    batch.append(entry)
+                                submit(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                if stat:
+                                    entry.stat(follow_symlinks=False)
+                                batch.append(entry)
+                        except OSError:
+                            continue
+        except OSError:
+            pass
+        finally:
+            # Hand over the batch before counting this directory as done, so every
+            # batch is queued ahead of the final _DONE marker
+            if batch and not stop.is_set():
+                results.put(batch)
+            with lock:
+                outstanding[0] -= 1
+                finished = outstanding[0] == 0
+            if finished and not stop.is_set():
+                results.put(_DONE)
+
+    roots = [os.path.abspath(root) for root in roots if os.path.isdir(root)]
+    if not roots:
+        return
+    pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='walk')
+    try:
+        for root in roots:
+            submit(root)
+        while True:
+            batch = results.get()
+            if batch is _DONE:
+                return
+            yield from batch
+    finally:
+        stop.set()
+        # Unblock workers waiting on a full queue so the pool can wind down
+        while True:
+            try:
+                results.get_nowait()
+            except queue.Empty:
+                break
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def walk_files(roots, excludes=None, workers=DEFAULT_WORKERS, excluded_names=EXCLUDED_NAMES):
+    """(path, stat_result) for every regular file below roots, stat fetched in parallel"""
+    for entry in walk(roots, excludes, workers, stat=True, excluded_names=excluded_names):
+        try:
+            yield entry.path, entry.stat(follow_symlinks=False)
+        except OSError:
+            continue
@@ -0,0 +1,32 @@
+# user_paths.py - Where Tejas keeps bundled data, per-user files and caches
+import os
+import threading
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+USER_DIR = os.path.expanduser(os.getenv('TEJAS_HOME', os.path.join('~', '.tejas')))
+CACHE_DIR = os.path.join(USER_DIR, 'cache')
+
+
+def data_path(*parts):
+    """Path of a file bundled with the application"""
+    return os.path.join(DATA_DIR, *parts)
+
+
+def user_path(*parts):
+    """Path of a user-editable file (the directory is created on demand)"""
+    os.makedirs(USER_DIR, exist_ok=True)
+    return os.path.join(USER_DIR, *parts)
+
+
+def cache_path(*parts):
+    """Path of a disposable cache file (the directory is created on demand)"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, *parts)
+
+
+def write_atomic(path, data):
+    """Write bytes to path via a temporary file so readers never see a partial file"""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)